@@ -1,44 +1,105 @@
 #!/usr/bin/env python3
 
-import pathlib
-
-from provisioner_shared.components.runtime.cli.arg_reader import PreRunArgs
-from provisioner_shared.components.runtime.cli.entrypoint import EntryPoint
-from provisioner_shared.components.runtime.cli.version import append_version_cmd_to_cli
-from provisioner_shared.components.runtime.command.config.cli import CONFIG_USER_PATH, append_config_cmd_to_cli
-from provisioner_shared.components.runtime.command.plugins.cli import append_plugins_cmd_to_cli
-from provisioner_shared.components.runtime.config.domain.config import ProvisionerConfig
-from provisioner_shared.components.runtime.config.manager.config_manager import ConfigManager
-from provisioner_shared.components.runtime.infra.context import Context
-from provisioner_shared.components.runtime.shared.collaborators import CoreCollaborators
+from provisioner_shared.components.runtime.utils.startup_profiler import StartupProfiler
+
+# Enabled by PROVISIONER_PROFILE_STARTUP=1 or --profile-startup, must precede any other import to measure it
+profiler = StartupProfiler.instance()
+profiler.enable_if_requested_fn()
+
+with profiler.phase_fn("command snapshot"):
+    import os
+    import sys
+
+    from provisioner_shared.components.runtime.cli.command_snapshot import CommandTreeSnapshot, is_snapshot_request
+    from provisioner_shared.components.runtime.config.user_config import CONFIG_USER_PATH
+
+    PROG_NAME = os.path.basename(sys.argv[0])
+    # Shell completion and --help are answered from the command tree snapshot, skipping plugins and config loading
+    command_snapshot = CommandTreeSnapshot.create(user_config_path=CONFIG_USER_PATH)
+    is_command_snapshot_request = is_snapshot_request(PROG_NAME, sys.argv[1:])
+    if is_command_snapshot_request and command_snapshot.try_run_fn(PROG_NAME, sys.argv[1:]):
+        sys.exit(0)
+
+with profiler.phase_fn("runtime imports"):
+    import pathlib
+
+    from provisioner_shared.components.runtime.cli.arg_reader import PreRunArgs
+    from provisioner_shared.components.runtime.cli.entrypoint import EntryPoint
+    from provisioner_shared.components.runtime.cli.version import append_version_cmd_to_cli
+    from provisioner_shared.components.runtime.command.config.cli import append_config_cmd_to_cli
+    from provisioner_shared.components.runtime.command.plugins.cli import append_plugins_cmd_to_cli
+    from provisioner_shared.components.runtime.config.domain.config import ProvisionerConfig
+    from provisioner_shared.components.runtime.config.manager.config_manager import ConfigManager
+    from provisioner_shared.components.runtime.infra.context import Context
+    from provisioner_shared.components.runtime.shared.collaborators import CoreCollaborators
+    from provisioner_shared.components.runtime.utils.plugin_discovery import (
+        get_plugin_internal_config_path,
+        read_plugin_commands,
+    )
 
 RUNTIME_ROOT_PATH = str(pathlib.Path(__file__).parent)
 CONFIG_INTERNAL_PATH = f"{RUNTIME_ROOT_PATH}/resources/config.yaml"
 
-pre_click_ctx = Context.create_empty()
-pre_run_args: PreRunArgs = PreRunArgs().handle_pre_click_args(ctx=pre_click_ctx)
-cols = CoreCollaborators(pre_click_ctx)
+with profiler.phase_fn("pre run args"):
+    pre_click_ctx = Context.create_empty()
+    pre_run_args: PreRunArgs = PreRunArgs().handle_pre_click_args(ctx=pre_click_ctx)
+
+with profiler.phase_fn("core collaborators"):
+    cols = CoreCollaborators(pre_click_ctx)
 
-root_menu = EntryPoint.create_cli_menu()
-ConfigManager.instance().load(CONFIG_INTERNAL_PATH, CONFIG_USER_PATH, ProvisionerConfig)
+with profiler.phase_fn("create cli menu"):
+    root_menu = EntryPoint.create_cli_menu()
 
-append_version_cmd_to_cli(root_menu, root_package=RUNTIME_ROOT_PATH)
-append_config_cmd_to_cli(root_menu, collaborators=cols)
-append_plugins_cmd_to_cli(root_menu, collaborators=cols)
+with profiler.phase_fn("config manager load"):
+    # Share the collaborators graph with the config manager instead of a dedicated context and YAML utilities
+    ConfigManager.initialize(ctx=pre_click_ctx, yaml_util=cols.yaml_util())
+    ConfigManager.instance().load(CONFIG_INTERNAL_PATH, CONFIG_USER_PATH, ProvisionerConfig)
+
+with profiler.phase_fn("runtime commands"):
+    append_version_cmd_to_cli(root_menu, root_package=RUNTIME_ROOT_PATH)
+    append_config_cmd_to_cli(root_menu, collaborators=cols)
+    append_plugins_cmd_to_cli(root_menu, collaborators=cols)
 
 
 def load_plugin(plugin_module):
-    plugin_module.load_config()
-    plugin_module.append_to_cli(root_menu)
+    package_name = plugin_module.__name__.split(".")[0]
+    with profiler.phase_fn(f"plugin {package_name}: load_config"):
+        plugin_module.load_config()
+    with profiler.phase_fn(f"plugin {package_name}: append_to_cli"):
+        plugin_module.append_to_cli(root_menu)
+
+
+def defer_plugin(package_name: str, loader) -> bool:
+    # Plugins declaring their commands on the manifest are imported only when one of their commands is invoked
+    commands = read_plugin_commands(package_name)
+    if not commands:
+        return False
+    root_menu.add_lazy_commands(commands, loader)
+    return True
+
+
+def prefetch_plugin(package_name: str) -> None:
+    # Runs on the plugins loading thread pool, parses the plugin config ahead of its load_config call
+    config_path = get_plugin_internal_config_path(package_name)
+    if config_path:
+        ConfigManager.instance().preparse_config(config_path)
+
 
+with profiler.phase_fn("plugins"):
+    cols.package_loader().load_modules_with_auto_version_check_fn(
+        filter_keyword="provisioner",
+        import_path="main",
+        exclusions=["provisioner-runtime", "provisioner-shared"],
+        callback=lambda module: load_plugin(plugin_module=module),
+        debug=pre_run_args.debug_pre_init,
+        defer=defer_plugin,
+        max_workers=pre_run_args.plugins_load_workers,
+        prefetch=prefetch_plugin,
+    )
 
-cols.package_loader().load_modules_with_auto_version_check_fn(
-    filter_keyword="provisioner",
-    import_path="main",
-    exclusions=["provisioner-runtime", "provisioner-shared"],
-    callback=lambda module: load_plugin(plugin_module=module),
-    debug=pre_run_args.debug_pre_init,
-)
+if is_command_snapshot_request and command_snapshot.is_stale_fn():
+    with profiler.phase_fn("command snapshot store"):
+        command_snapshot.store_fn(root_menu)
 
 
 # ==============
@@ -27,6 +27,9 @@ debug_pre_init = os.getenv(key=ENV_VAR_ENABLE_PRE_INIT_DEBUG, default=False)
 if not debug_pre_init:
     logger.remove()
 
+ctx = Context.create_empty()
+cols = CoreCollaborators(ctx)
+ConfigManager.initialize(ctx=ctx, yaml_util=cols.yaml_util())
 ConfigManager.instance().load(CONFIG_INTERNAL_PATH, CONFIG_USER_PATH, ProvisionerConfig)
 
 root_menu = EntryPoint.create_cli_menu()
@@ -51,7 +54,6 @@ def main():
 
     logger.debug(f"Loading plugin: {plugin_name}")
 
-    cols = CoreCollaborators(Context.create_empty())
     cols.package_loader().import_modules_fn(
         packages=[f"plugins.{plugin_name}.{plugin_name}"],
         import_path="main",
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import re
 from functools import wraps
 from typing import Any, Callable, Optional
 
@@ -13,11 +14,16 @@ from provisioner_shared.components.remote.remote_opts import (
     RemoteOptsFromConfig,
     RemoteOptsFromConnFlags,
     RemoteOptsFromScanFlags,
+    RemoteStrategy,
     RemoteVerbosity,
 )
 from provisioner_shared.components.runtime.cli.click_callbacks import mutually_exclusive_callback
 from provisioner_shared.components.runtime.cli.menu_format import GroupedOption, get_nested_value, normalize_cli_item
 from provisioner_shared.components.runtime.infra.remote_context import RemoteContext
+from provisioner_shared.components.runtime.runner.ansible.ansible_runner import (
+    ANSIBLE_DEFAULT_FORKS,
+    ANSIBLE_MAX_AUTO_FORKS,
+)
 
 REMOTE_GENERAL_OPTS_GROUP_NAME = "General"
 REMOTE_CON_FLAGS_GROUP_NAME = "Flags"
@@ -36,6 +42,18 @@ REMOTE_OPT_IP_DISCOVERY_RANGE = "ip-discovery-range"
 REMOTE_OPT_IP_DISCOVERY_DNS_SERVER = "dns-server"
 REMOTE_OPT_VERBOSITY = "verbosity"
 REMOTE_OPT_REMOTE_DRY_RUN = "remote-dry-run"
+REMOTE_OPT_FORKS = "forks"
+REMOTE_OPT_STRATEGY = "strategy"
+REMOTE_OPT_SERIAL = "serial"
+REMOTE_OPT_REFRESH_FACTS = "refresh-facts"
+
+REMOTE_SERIAL_PATTERN = re.compile(r"^[1-9][0-9]*%?$")
+
+
+def _serial_callback(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[str]:
+    if value is not None and not REMOTE_SERIAL_PATTERN.match(value):
+        raise click.BadParameter("expected a number of hosts (e.g. 10) or a percentage of hosts (e.g. 25%)")
+    return value
 
 
 # Define modifiers globally
@@ -155,6 +173,45 @@ def cli_remote_opts(remote_config: Optional[RemoteConfig] = None) -> Callable:
             cls=GroupedOption,
             group=REMOTE_EXECUTION_OPTS_GROUP_NAME,
         )
+        @click.option(
+            f"--{REMOTE_OPT_FORKS}",
+            type=click.IntRange(min=1),
+            help=(
+                "Maximum number of hosts to run on in parallel  [default: "
+                f"{ANSIBLE_DEFAULT_FORKS}, number of selected hosts (up to {ANSIBLE_MAX_AUTO_FORKS}) "
+                f"when more than {ANSIBLE_DEFAULT_FORKS} hosts are selected]"
+            ),
+            envvar="PROV_REMOTE_FORKS",
+            cls=GroupedOption,
+            group=REMOTE_EXECUTION_OPTS_GROUP_NAME,
+        )
+        @click.option(
+            f"--{REMOTE_OPT_STRATEGY}",
+            type=click.Choice([v.value for v in RemoteStrategy], case_sensitive=False),
+            help="Ansible strategy, 'free' lets every host proceed without waiting for slower hosts  [default: linear]",
+            envvar="PROV_REMOTE_STRATEGY",
+            cls=GroupedOption,
+            group=REMOTE_EXECUTION_OPTS_GROUP_NAME,
+        )
+        @click.option(
+            f"--{REMOTE_OPT_SERIAL}",
+            type=str,
+            help="Roll out in batches, a number (e.g. 10) or a percentage (e.g. 25%) of the selected hosts",
+            envvar="PROV_REMOTE_SERIAL",
+            cls=GroupedOption,
+            group=REMOTE_EXECUTION_OPTS_GROUP_NAME,
+            callback=_serial_callback,
+        )
+        @click.option(
+            f"--{REMOTE_OPT_REFRESH_FACTS}",
+            default=False,
+            is_flag=True,
+            show_default=True,
+            help="Gather facts from remote machines again instead of using the cached ones",
+            envvar="PROV_REMOTE_REFRESH_FACTS",
+            cls=GroupedOption,
+            group=REMOTE_EXECUTION_OPTS_GROUP_NAME,
+        )
         @wraps(func)
         @click.pass_context  # Decorator to pass context to the function
         def wrapper(ctx, *args: Any, **kwargs: Any) -> Any:
@@ -162,10 +219,19 @@ def cli_remote_opts(remote_config: Optional[RemoteConfig] = None) -> Callable:
             remote_verbosity = RemoteVerbosity.from_str(verbosity)
 
             dry_run = kwargs.pop(normalize_cli_item(REMOTE_OPT_REMOTE_DRY_RUN), False)
+            forks = kwargs.pop(normalize_cli_item(REMOTE_OPT_FORKS), None)
+            cli_flag_strategy = kwargs.pop(normalize_cli_item(REMOTE_OPT_STRATEGY), None)
+            strategy = RemoteStrategy.from_str(cli_flag_strategy).value if cli_flag_strategy else None
+            serial = kwargs.pop(normalize_cli_item(REMOTE_OPT_SERIAL), None)
+            refresh_facts = kwargs.pop(normalize_cli_item(REMOTE_OPT_REFRESH_FACTS), False)
             remote_context = RemoteContext.create(
                 dry_run=dry_run,
                 verbose=remote_verbosity == RemoteVerbosity.Verbose,
                 silent=remote_verbosity == RemoteVerbosity.Silent,
+                forks=forks,
+                strategy=strategy,
+                serial=serial,
+                refresh_facts=refresh_facts,
             )
 
             # Fail if environment is not supplied
@@ -222,6 +288,18 @@ def cli_remote_opts(remote_config: Optional[RemoteConfig] = None) -> Callable:
                 if verbosity and not remote_opts._remote_context._silent:
                     remote_opts._remote_context._silent = remote_verbosity == RemoteVerbosity.Silent
 
+                if forks and remote_opts._remote_context._forks != forks:
+                    remote_opts._remote_context._forks = forks
+
+                if strategy and remote_opts._remote_context._strategy != strategy:
+                    remote_opts._remote_context._strategy = strategy
+
+                if serial and remote_opts._remote_context._serial != serial:
+                    remote_opts._remote_context._serial = serial
+
+                if refresh_facts and not remote_opts._remote_context._refresh_facts:
+                    remote_opts._remote_context._refresh_facts = refresh_facts
+
                 if environment and remote_opts._environment != environment:
                     remote_opts._environment = environment
 
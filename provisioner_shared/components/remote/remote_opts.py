@@ -34,6 +34,23 @@ class RemoteVerbosity(Enum):
             raise NotImplementedError(f"RemoteVerbosity enum does not support label '{label}'")
 
 
+class RemoteStrategy(Enum):
+    # Every task completes on all hosts before the next task starts
+    Linear = "linear"
+    # Every host runs through the play as fast as it can, unaffected by slower hosts
+    Free = "free"
+
+    @staticmethod
+    def from_str(label):
+        lower = label.lower()
+        if lower == "linear":
+            return RemoteStrategy.Linear
+        elif lower == "free":
+            return RemoteStrategy.Free
+        else:
+            raise NotImplementedError(f"RemoteStrategy enum does not support label '{label}'")
+
+
 REMOTE_CLICK_CTX_NAME = "cli_remote_opts"
 
 
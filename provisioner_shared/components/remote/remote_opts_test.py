@@ -5,6 +5,7 @@ import unittest
 import click
 
 from provisioner_shared.components.remote.cli_remote_opts import cli_remote_opts
+from provisioner_shared.components.remote.remote_opts import RemoteStrategy
 from provisioner_shared.components.remote.remote_opts_fakes import *
 from provisioner_shared.components.runtime.cli.cli_modifiers import cli_modifiers
 from provisioner_shared.components.runtime.cli.entrypoint import EntryPoint
@@ -82,3 +83,42 @@ class RemoteOptsTestShould(unittest.TestCase):
                 click.echo(ctx.get_help())
 
         TestCliRunner.run(dummy)
+
+    def test_set_execution_controls_from_cli_arguments(self) -> None:
+        remote_cfg = TestDataRemoteOpts.create_fake_remote_cfg()
+        root_menu = EntryPoint.create_cli_menu()
+
+        @root_menu.command()
+        @cli_remote_opts(remote_config=remote_cfg)
+        @cli_modifiers
+        @click.pass_context
+        def dummy(ctx: click.Context) -> None:
+            """Dummy click command"""
+            remote_context = RemoteOpts.from_click_ctx(ctx).get_remote_context()
+            self.assertEqual(remote_context.get_forks(), 20)
+            self.assertEqual(remote_context.get_strategy(), "free")
+            self.assertEqual(remote_context.get_serial(), "25%")
+            self.assertTrue(remote_context.is_refresh_facts())
+
+        TestCliRunner.run(dummy, args=["--forks", "20", "--strategy", "Free", "--serial", "25%", "--refresh-facts"])
+
+    def test_fail_on_invalid_serial_cli_argument(self) -> None:
+        root_menu = EntryPoint.create_cli_menu()
+
+        @root_menu.command()
+        @cli_remote_opts(remote_config=TestDataRemoteOpts.create_fake_remote_cfg())
+        @click.pass_context
+        def dummy(ctx: click.Context) -> None:
+            """Dummy click command"""
+
+        result = TestCliRunner.run_throws_not_managed(dummy, args=["--serial", "0"])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Invalid value for '--serial'", result.output)
+
+    def test_resolve_strategy_only_from_exact_labels(self) -> None:
+        self.assertEqual(RemoteStrategy.from_str("Free"), RemoteStrategy.Free)
+        self.assertEqual(RemoteStrategy.from_str("linear"), RemoteStrategy.Linear)
+        for label in ["ear", "", "fre"]:
+            with self.subTest(label=label):
+                with self.assertRaises(NotImplementedError):
+                    RemoteStrategy.from_str(label)
@@ -1,3 +1,4 @@
+import os
 import re
 import sys
 from typing import Optional
@@ -7,6 +8,9 @@ from loguru import logger
 from provisioner_shared.components.runtime.cli.modifiers import PackageManager
 from provisioner_shared.components.runtime.infra.context import Context
 
+# Opt-in concurrent plugins loading, number of threads importing plugins and pre-parsing their configuration
+ENV_PLUGINS_LOAD_WORKERS = "PROVISIONER_PLUGINS_LOAD_WORKERS"
+
 
 class PreRunArgs:
 
@@ -19,6 +23,7 @@ class PreRunArgs:
         """
         self.debug_pre_init: bool = False
         self.maybe_pkg_mgr: Optional[PackageManager] = None
+        self.plugins_load_workers: Optional[int] = None
 
     def handle_pre_click_args(self, ctx: Context) -> "PreRunArgs":
         self._parse_pre_run_args()
@@ -36,6 +41,18 @@ class PreRunArgs:
         maybe_pkg_mgr_str = _get_cli_argument_value("--package-manager")
         if maybe_pkg_mgr_str:
             self.maybe_pkg_mgr = PackageManager.from_str(maybe_pkg_mgr_str)
+        self.plugins_load_workers = _get_env_int_value(ENV_PLUGINS_LOAD_WORKERS)
+
+
+def _get_env_int_value(env_var_name: str) -> Optional[int]:
+    value = os.environ.get(env_var_name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring non numeric environment variable value. name: {env_var_name}, value: {value}")
+    return None
 
 
 def _get_cli_argument_value(arg_name: str) -> str | None:
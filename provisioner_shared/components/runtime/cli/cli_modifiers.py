@@ -18,6 +18,8 @@ MODIFIERS_OPT_DRY_RUN = "dry-run"
 MODIFIERS_OPT_NON_INTERACTIVE = "non-interactive"
 MODIFIERS_OPT_OS_ARCH = "os-arch"
 MODIFIERS_OPT_PKG_MGR = "package-manager"
+MODIFIERS_OPT_TIMINGS = "timings"
+MODIFIERS_OPT_IGNORE_LEDGER = "ignore-ledger"
 
 
 # Define modifiers globally
@@ -71,6 +73,22 @@ def cli_modifiers(func: Callable) -> Callable:
         cls=GroupedOption,
         group=MODIFIERS_GROUP_NAME,
     )
+    @click.option(
+        f"--{MODIFIERS_OPT_TIMINGS}",
+        is_flag=True,
+        envvar="PROV_MODIFIERS_TIMINGS",
+        help="Print the slowest Ansible tasks once a playbook run completes",
+        cls=GroupedOption,
+        group=MODIFIERS_GROUP_NAME,
+    )
+    @click.option(
+        f"--{MODIFIERS_OPT_IGNORE_LEDGER}",
+        is_flag=True,
+        envvar="PROV_MODIFIERS_IGNORE_LEDGER",
+        help="Run on all selected hosts, including hosts that are already converged",
+        cls=GroupedOption,
+        group=MODIFIERS_GROUP_NAME,
+    )
     @wraps(func)
     @click.pass_context  # Decorator to pass context to the function
     def wrapper(ctx, *args: Any, **kwargs: Any) -> Any:
@@ -80,6 +98,8 @@ def cli_modifiers(func: Callable) -> Callable:
         non_interactive = kwargs.pop(normalize_cli_item(MODIFIERS_OPT_NON_INTERACTIVE), False)
         os_arch = kwargs.pop(normalize_cli_item(MODIFIERS_OPT_OS_ARCH), None)
         pkg_mgr = kwargs.pop(normalize_cli_item(MODIFIERS_OPT_PKG_MGR), None)
+        timings = kwargs.pop(normalize_cli_item(MODIFIERS_OPT_TIMINGS), False)
+        ignore_ledger = kwargs.pop(normalize_cli_item(MODIFIERS_OPT_IGNORE_LEDGER), False)
 
         # Add a state tracker to the context object
         if ctx.obj is None:
@@ -94,6 +114,8 @@ def cli_modifiers(func: Callable) -> Callable:
                 non_interactive=non_interactive,
                 os_arch=os_arch,
                 pkg_mgr=PackageManager.from_str(pkg_mgr),
+                timings=timings,
+                ignore_ledger=ignore_ledger,
             )
             logger.debug("Initialized CliModifiers for the first time.")
         else:
@@ -116,6 +138,14 @@ def cli_modifiers(func: Callable) -> Callable:
                 modifiers.non_interactive = True
                 click.echo("Non interactive: enabled")
 
+            if timings and not modifiers.timings:
+                modifiers.timings = True
+                click.echo("Timings: enabled")
+
+            if ignore_ledger and not modifiers.ignore_ledger:
+                modifiers.ignore_ledger = True
+                click.echo("Ignore ledger: enabled")
+
             if os_arch and modifiers.os_arch != os_arch:
                 modifiers.os_arch = os_arch
                 click.echo(f"OS_Arch updated to: {os_arch}")
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sys
+from typing import Any, List, Optional
+
+import click
+
+from provisioner_shared.components.runtime.cli.menu_format import (
+    CustomCommand,
+    CustomGroup,
+    GroupedOption,
+    LazyGroup,
+)
+from provisioner_shared.components.runtime.utils.plugin_discovery import PluginDiscoveryCache
+
+COMMAND_SNAPSHOT_CACHE_PATH = os.path.expanduser("~/.config/provisioner/cache/command_tree.json")
+COMMAND_SNAPSHOT_VERSION = 1
+ENV_DISABLE_COMMAND_SNAPSHOT = "PROVISIONER_DISABLE_COMMAND_SNAPSHOT"
+HELP_ARGS = ("--help", "-h")
+
+COMMAND_CLASSES = {
+    "custom_group": CustomGroup,
+    "group": click.Group,
+    "custom_command": CustomCommand,
+    "command": click.Command,
+}
+
+
+def is_snapshot_request(prog_name: str, argv: List[str]) -> bool:
+    """
+    A request the command tree snapshot might answer: shell completion or a --help invocation.
+    A help token might also be an option value (i.e. '--username -h'), the snapshot run tells them apart.
+    """
+    if os.environ.get(ENV_DISABLE_COMMAND_SNAPSHOT):
+        return False
+    if os.environ.get(_get_complete_var(prog_name)):
+        return True
+    return any(arg in HELP_ARGS for arg in argv)
+
+
+def _get_complete_var(prog_name: str) -> str:
+    # Same environment variable name Click derives for shell completion
+    return f"_{prog_name}_COMPLETE".replace("-", "_").upper()
+
+
+class CommandTreeSnapshot:
+    """
+    A serialized copy of the CLI command tree: command names, help texts, options and their groups.
+
+    The snapshot is restored into a tree of no-op commands sharing the real commands formatting,
+    which lets shell completion and --help be answered without importing plugins or loading config.
+    The snapshot is keyed on the plugin discovery fingerprint and the user config modification time,
+    so it is rebuilt whenever plugins are installed, removed or configured.
+    """
+
+    _cache_path: str
+    _discovery_cache: PluginDiscoveryCache
+    _user_config_path: Optional[str]
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        discovery_cache: Optional[PluginDiscoveryCache] = None,
+        user_config_path: Optional[str] = None,
+    ) -> None:
+        self._cache_path = cache_path if cache_path else COMMAND_SNAPSHOT_CACHE_PATH
+        self._discovery_cache = discovery_cache if discovery_cache else PluginDiscoveryCache()
+        self._user_config_path = user_config_path
+
+    @staticmethod
+    def create(
+        cache_path: Optional[str] = None,
+        discovery_cache: Optional[PluginDiscoveryCache] = None,
+        user_config_path: Optional[str] = None,
+    ) -> "CommandTreeSnapshot":
+        # No logging, the snapshot is used before the logger is configured
+        return CommandTreeSnapshot(cache_path, discovery_cache, user_config_path)
+
+    def _compute_fingerprint(self) -> dict:
+        user_config_mtime = None
+        if self._user_config_path:
+            try:
+                user_config_mtime = os.stat(self._user_config_path).st_mtime_ns
+            except OSError:
+                pass
+        return {
+            "version": COMMAND_SNAPSHOT_VERSION,
+            "discovery": self._discovery_cache.get_fingerprint_fn(),
+            "user_config_mtime": user_config_mtime,
+        }
+
+    def _load(self) -> Optional[dict]:
+        """
+        Return the serialized command tree, None if the snapshot is missing or stale.
+        """
+        try:
+            with open(self._cache_path, "r") as f:
+                cached = json.load(f)
+        except Exception:
+            return None
+        if cached.get("fingerprint") != self._compute_fingerprint():
+            return None
+        return cached.get("tree")
+
+    def _is_stale(self) -> bool:
+        return self._load() is None
+
+    def _store(self, root_menu: click.Group) -> None:
+        """
+        Serialize the full command tree, resolving lazy plugin commands if there are any.
+        """
+        if isinstance(root_menu, LazyGroup):
+            root_menu.resolve_lazy_commands()
+        ctx = click.Context(root_menu, info_name=root_menu.name)
+        content = {"fingerprint": self._compute_fingerprint(), "tree": self._serialize_command(ctx, root_menu)}
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            tmp_path = f"{self._cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(content, f)
+            os.replace(tmp_path, self._cache_path)
+        except Exception as ex:
+            sys.stderr.write(f"Failed to write command tree snapshot. path: {self._cache_path}, ex: {ex}\n")
+
+    def _serialize_command(self, ctx: click.Context, command: click.Command) -> dict:
+        result = {
+            "name": command.name,
+            "cls": self._get_command_class_name(command),
+            "help": command.help,
+            "short_help": command.short_help,
+            "epilog": command.epilog,
+            "hidden": command.hidden,
+            "no_args_is_help": command.no_args_is_help,
+            "params": [self._serialize_param(param) for param in command.params],
+        }
+        if isinstance(command, click.Group):
+            result["invoke_without_command"] = command.invoke_without_command
+            result["commands"] = []
+            for name in command.list_commands(ctx):
+                sub_command = command.get_command(ctx, name)
+                if sub_command is None:
+                    continue
+                sub_ctx = click.Context(sub_command, info_name=name, parent=ctx)
+                result["commands"].append(self._serialize_command(sub_ctx, sub_command))
+        return result
+
+    def _get_command_class_name(self, command: click.Command) -> str:
+        if isinstance(command, CustomGroup):
+            return "custom_group"
+        if isinstance(command, click.Group):
+            return "group"
+        if isinstance(command, CustomCommand):
+            return "custom_command"
+        return "command"
+
+    def _serialize_param(self, param: click.Parameter) -> dict:
+        result = {
+            "kind": "argument" if isinstance(param, click.Argument) else "option",
+            "name": param.name,
+            "opts": param.opts,
+            "secondary_opts": param.secondary_opts,
+            "type": self._serialize_type(param.type),
+            "required": param.required,
+            "nargs": param.nargs,
+            "multiple": param.multiple,
+            "metavar": param.metavar,
+            "default": _json_safe(param.default),
+        }
+        if isinstance(param, click.Option):
+            result.update(
+                {
+                    "is_flag": param.is_flag,
+                    "count": param.count,
+                    "help": param.help,
+                    "hidden": param.hidden,
+                    "show_default": param.show_default if isinstance(param.show_default, (bool, str)) else None,
+                    "group": getattr(param, "group", None),
+                }
+            )
+        return result
+
+    def _serialize_type(self, param_type: click.ParamType) -> dict:
+        if isinstance(param_type, click.Choice):
+            return {"name": "choice", "choices": list(param_type.choices), "case_sensitive": param_type.case_sensitive}
+        if isinstance(param_type, click.Path):
+            return {"name": "path"}
+        if isinstance(param_type, click.File):
+            return {"name": "file"}
+        if param_type in (click.INT, click.FLOAT, click.BOOL):
+            return {"name": param_type.name}
+        return {"name": "string"}
+
+    def _deserialize_type(self, type_dict: dict) -> click.ParamType:
+        name = type_dict.get("name")
+        if name == "choice":
+            return click.Choice(type_dict.get("choices", []), case_sensitive=type_dict.get("case_sensitive", True))
+        if name == "path":
+            return click.Path()
+        if name == "file":
+            return click.File()
+        return {"integer": click.INT, "float": click.FLOAT, "boolean": click.BOOL}.get(name, click.STRING)
+
+    def _restore(self, tree: dict) -> click.Command:
+        """
+        Rebuild a no-op command tree from its serialized form.
+        """
+        params = [self._deserialize_param(param) for param in tree.get("params", [])]
+        cls = COMMAND_CLASSES.get(tree.get("cls"), click.Command)
+        kwargs = {
+            "name": tree.get("name"),
+            "params": params,
+            "help": tree.get("help"),
+            "short_help": tree.get("short_help"),
+            "epilog": tree.get("epilog"),
+            "hidden": tree.get("hidden", False),
+            "no_args_is_help": tree.get("no_args_is_help", False),
+            "callback": _noop_callback,
+        }
+        if issubclass(cls, click.Group):
+            commands = [self._restore(sub_tree) for sub_tree in tree.get("commands", [])]
+            return cls(
+                commands={command.name: command for command in commands},
+                invoke_without_command=tree.get("invoke_without_command", False),
+                **kwargs,
+            )
+        return cls(**kwargs)
+
+    def _deserialize_param(self, param_dict: dict) -> click.Parameter:
+        decls = list(param_dict.get("opts", []))
+        if param_dict.get("secondary_opts"):
+            # Boolean switch i.e. --shout/--no-shout
+            decls[0] = f"{decls[0]}/{param_dict['secondary_opts'][0]}"
+        kwargs = {
+            "type": self._deserialize_type(param_dict.get("type", {})),
+            "required": param_dict.get("required", False),
+            "nargs": param_dict.get("nargs", 1),
+            "metavar": param_dict.get("metavar"),
+            "default": param_dict.get("default"),
+        }
+        if param_dict.get("kind") == "argument":
+            return click.Argument([param_dict.get("name")], **kwargs)
+
+        if param_dict.get("is_flag"):
+            # Flags derive their type and arity
+            kwargs.pop("type")
+            kwargs.pop("nargs")
+        return GroupedOption(
+            [param_dict.get("name")] + decls,
+            is_flag=param_dict.get("is_flag") or None,
+            multiple=param_dict.get("multiple", False),
+            count=param_dict.get("count", False),
+            help=param_dict.get("help"),
+            hidden=param_dict.get("hidden", False),
+            show_default=param_dict.get("show_default"),
+            group=param_dict.get("group"),
+            **kwargs,
+        )
+
+    def _try_run(self, prog_name: str, argv: List[str]) -> bool:
+        """
+        Answer shell completion or --help from the snapshot.
+        Returns False when the snapshot cannot answer and the full CLI bootstrap is required.
+        """
+        tree = self._load()
+        if tree is None:
+            return False
+        try:
+            root_menu = self._restore(tree)
+        except Exception:
+            return False
+
+        if os.environ.get(_get_complete_var(prog_name)):
+            # Click handles completion and exits the process
+            root_menu.main(args=argv, prog_name=prog_name)
+            return True
+
+        try:
+            result = root_menu.main(args=argv, prog_name=prog_name, standalone_mode=False)
+        except click.ClickException:
+            # i.e. a command missing from the snapshot, let the real CLI answer
+            return False
+        # Help is answered by Click before any callback runs, a command callback means the help
+        # token was consumed as an option value and the real command has to run
+        return result is not _SNAPSHOT_COMMAND_INVOKED
+
+    load_fn = _load
+    is_stale_fn = _is_stale
+    store_fn = _store
+    restore_fn = _restore
+    try_run_fn = _try_run
+
+
+# Returned by the restored commands callback, marks a command invocation the snapshot cannot answer
+_SNAPSHOT_COMMAND_INVOKED = object()
+
+
+def _noop_callback(*args: Any, **kwargs: Any) -> Any:
+    return _SNAPSHOT_COMMAND_INVOKED
+
+
+def _json_safe(value: Any) -> Any:
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return None
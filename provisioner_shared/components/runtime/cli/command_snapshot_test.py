@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from provisioner_shared.components.runtime.cli.cli_modifiers import cli_modifiers
+from provisioner_shared.components.runtime.cli.command_snapshot import CommandTreeSnapshot, is_snapshot_request
+from provisioner_shared.components.runtime.cli.entrypoint import EntryPoint
+from provisioner_shared.components.runtime.cli.menu_format import CustomGroup
+from provisioner_shared.components.runtime.utils.plugin_discovery import PluginDiscoveryCache
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/cli/command_snapshot_test.py
+#
+class CommandTreeSnapshotTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.user_config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.user_config_path, "w") as f:
+            f.write("plugins: {}\n")
+        discovery_cache = mock.Mock(spec=PluginDiscoveryCache)
+        discovery_cache.get_fingerprint_fn.return_value = {"site_dirs": {}}
+        self.snapshot = CommandTreeSnapshot.create(
+            cache_path=os.path.join(self.temp_dir.name, "cache", "command_tree.json"),
+            discovery_cache=discovery_cache,
+            user_config_path=self.user_config_path,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_cli_menu(self):
+        root_menu = EntryPoint.create_cli_menu()
+        loader = mock.MagicMock()
+
+        def append_to_cli():
+            loader()
+
+            @root_menu.group(invoke_without_command=True, no_args_is_help=True, cls=CustomGroup)
+            @cli_modifiers
+            def dummy():
+                """Dummy plugin commands"""
+
+            @dummy.command()
+            @click.option("--environment", type=click.Choice(["Local", "Remote"]), help="Target environment")
+            @click.option("--username", help="Remote user name")
+            @click.argument("name", required=False)
+            def run(environment: str, username: str, name: str):
+                """Run a dummy command"""
+
+        root_menu.add_lazy_commands({"dummy": "Dummy plugin commands"}, append_to_cli)
+        return root_menu, loader
+
+    def _invoke_help(self, root_menu: click.Command, args):
+        return CliRunner().invoke(root_menu, args, prog_name="provisioner").output
+
+    def test_restored_tree_renders_same_help(self):
+        root_menu, _ = self._create_cli_menu()
+        self.snapshot.store_fn(root_menu)
+        restored = self.snapshot.restore_fn(self.snapshot.load_fn())
+        for args in [["--help"], ["dummy", "--help"], ["dummy", "run", "--help"]]:
+            with self.subTest(args=args):
+                self.assertEqual(self._invoke_help(restored, args), self._invoke_help(root_menu, args))
+
+    def test_store_resolves_lazy_commands(self):
+        root_menu, loader = self._create_cli_menu()
+        self.snapshot.store_fn(root_menu)
+        loader.assert_called_once()
+        self.assertIn("dummy", [command["name"] for command in self.snapshot.load_fn()["commands"]])
+
+    def test_snapshot_is_stale_when_user_config_changes(self):
+        root_menu, _ = self._create_cli_menu()
+        self.snapshot.store_fn(root_menu)
+        self.assertFalse(self.snapshot.is_stale_fn())
+        stat = os.stat(self.user_config_path)
+        os.utime(self.user_config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertTrue(self.snapshot.is_stale_fn())
+
+    def test_try_run_falls_back_without_snapshot_or_on_unknown_command(self):
+        self.assertFalse(self.snapshot.try_run_fn("provisioner", ["--help"]))
+        root_menu, _ = self._create_cli_menu()
+        self.snapshot.store_fn(root_menu)
+        self.assertFalse(self.snapshot.try_run_fn("provisioner", ["unknown", "--help"]))
+
+    def test_try_run_answers_help_from_snapshot(self):
+        root_menu, _ = self._create_cli_menu()
+        self.snapshot.store_fn(root_menu)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertTrue(self.snapshot.try_run_fn("provisioner", ["dummy", "run", "-h"]))
+        self.assertIn("provisioner dummy run [OPTIONS]", output.getvalue())
+
+    def test_try_run_falls_back_when_help_token_is_an_option_value(self):
+        root_menu, _ = self._create_cli_menu()
+        self.snapshot.store_fn(root_menu)
+        self.assertFalse(self.snapshot.try_run_fn("provisioner", ["dummy", "run", "--username", "-h"]))
+
+    def test_shell_completion_from_snapshot(self):
+        root_menu, _ = self._create_cli_menu()
+        self.snapshot.store_fn(root_menu)
+        restored = self.snapshot.restore_fn(self.snapshot.load_fn())
+        result = CliRunner().invoke(
+            restored,
+            prog_name="provisioner",
+            env={
+                "_PROVISIONER_COMPLETE": "bash_complete",
+                "COMP_WORDS": "provisioner dummy run --environment ",
+                "COMP_CWORD": "4",
+            },
+        )
+        self.assertEqual(result.output.split(), ["plain,Local", "plain,Remote"])
+
+    def test_identify_snapshot_requests(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertTrue(is_snapshot_request("provisioner", ["dummy", "--help"]))
+            self.assertFalse(is_snapshot_request("provisioner", ["dummy", "run"]))
+        with mock.patch.dict(os.environ, {"_PROVISIONER_COMPLETE": "bash_complete"}, clear=True):
+            self.assertTrue(is_snapshot_request("provisioner", []))
+        with mock.patch.dict(os.environ, {"PROVISIONER_DISABLE_COMMAND_SNAPSHOT": "1"}, clear=True):
+            self.assertFalse(is_snapshot_request("provisioner", ["--help"]))
@@ -3,13 +3,13 @@
 import click
 
 from provisioner_shared.components.runtime.cli.cli_modifiers import cli_modifiers
-from provisioner_shared.components.runtime.cli.menu_format import CustomGroup
+from provisioner_shared.components.runtime.cli.menu_format import LazyGroup
 
 
 class EntryPoint:
     @staticmethod
-    def create_cli_menu() -> click.Group:
-        @click.group(invoke_without_command=True, no_args_is_help=True, cls=CustomGroup)
+    def create_cli_menu() -> LazyGroup:
+        @click.group(invoke_without_command=True, no_args_is_help=True, cls=LazyGroup)
         @cli_modifiers
         @click.pass_context
         def root_menu(ctx: click.Context):
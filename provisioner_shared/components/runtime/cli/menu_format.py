@@ -1,4 +1,7 @@
+from typing import Callable, Dict, List, Optional
+
 import click
+from loguru import logger
 
 DEFAULT_CONTEXT_SETTINGS = {"max_content_width": 200}
 
@@ -130,6 +133,12 @@ class CustomGroup(click.Group):
             group="Modifiers",
         )
 
+    def get_command_short_help(self, ctx: click.Context, cmd_name: str) -> Optional[str]:
+        command = self.get_command(ctx, cmd_name)
+        if command is None:
+            return None
+        return command.get_short_help_str()
+
     def format_help(self, ctx, formatter):
         # Add empty line at the top
         formatter.write_paragraph()
@@ -150,11 +159,11 @@ class CustomGroup(click.Group):
         formatter.write_text(click.style("AVAILABLE COMMANDS", fg="cyan"))
         commands = []
         for cmd in self.list_commands(ctx):
-            command = self.get_command(ctx, cmd)
-            if command is None:
+            short_help = self.get_command_short_help(ctx, cmd)
+            if short_help is None:
                 continue
             cmd_name = click.style(cmd, fg="green" if cmd not in ["plugins", "config", "version"] else "yellow")
-            commands.append((cmd_name, command.get_short_help_str()))
+            commands.append((cmd_name, short_help))
 
         if commands:
             formatter.write_dl(commands)
@@ -229,3 +238,66 @@ class CustomGroup(click.Group):
 
         # Add help instruction
         formatter.write_text(f'Use "{ctx.command_path} [command] --help" for more information about a command.')
+
+
+class LazyGroup(CustomGroup):
+    """
+    A group that knows its plugins command names (and short help) ahead of time,
+    the plugin module is imported and attached to the group only when one of its
+    commands is resolved by Click.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Command name -> (short help, loaders), plugins might declare the same root command name
+        self._lazy_commands: Dict[str, tuple[str, List[Callable[[], None]]]] = {}
+
+    def add_lazy_commands(self, commands: Dict[str, str], loader: Callable[[], None]) -> None:
+        """
+        Register command names which are resolved by calling the loader.
+        The loader is expected to attach the commands to this group (i.e. plugin append_to_cli).
+        A name registered by several loaders is resolved by calling all of them in registration order,
+        same as eager loading would.
+        """
+        for name, short_help in commands.items():
+            logger.debug(f"Registering lazy command. name: {name}")
+            _, loaders = self._lazy_commands.get(name, ("", []))
+            # Last loader attaches the command, its short help is the one shown
+            self._lazy_commands[name] = (short_help or "", loaders + [loader])
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self._lazy_commands.keys()))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        # Resolved even when already attached, another pending loader might declare the same name
+        if cmd_name in self._lazy_commands:
+            for loader in list(self._lazy_commands[cmd_name][1]):
+                self._resolve_lazy_loader(loader)
+        return super().get_command(ctx, cmd_name)
+
+    def get_command_short_help(self, ctx: click.Context, cmd_name: str) -> Optional[str]:
+        # Answer from the registered short help without importing the plugin
+        if cmd_name in self._lazy_commands and cmd_name not in self.commands:
+            return self._lazy_commands[cmd_name][0]
+        return super().get_command_short_help(ctx, cmd_name)
+
+    def resolve_lazy_commands(self) -> None:
+        """Load every pending lazy command, required by flows that need all plugins (i.e. config view)"""
+        loaders = []
+        for _, name_loaders in self._lazy_commands.values():
+            for loader in name_loaders:
+                if loader not in loaders:
+                    loaders.append(loader)
+        for loader in loaders:
+            self._resolve_lazy_loader(loader)
+
+    def _resolve_lazy_loader(self, loader: Callable[[], None]) -> None:
+        # Multiple commands might share the same loader, drop it from all of them prior to loading
+        # so a failing loader won't get called again for every command
+        for name, (short_help, loaders) in list(self._lazy_commands.items()):
+            remaining = [ldr for ldr in loaders if ldr is not loader]
+            if not remaining:
+                del self._lazy_commands[name]
+            elif len(remaining) != len(loaders):
+                self._lazy_commands[name] = (short_help, remaining)
+        loader()
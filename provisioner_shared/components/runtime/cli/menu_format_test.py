@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+import click
+
+from provisioner_shared.components.runtime.cli.entrypoint import EntryPoint
+from provisioner_shared.test_lib.test_cli_runner import TestCliRunner
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/cli/menu_format_test.py
+#
+class LazyGroupTestShould(unittest.TestCase):
+    def _create_lazy_menu(self):
+        root_menu = EntryPoint.create_cli_menu()
+
+        def loader():
+            @root_menu.command()
+            def dummy():
+                """Dummy plugin command"""
+                click.echo("dummy plugin command ran")
+
+        loader_mock = mock.MagicMock(side_effect=loader)
+        root_menu.add_lazy_commands({"dummy": "Dummy plugin command"}, loader_mock)
+        return root_menu, loader_mock
+
+    def test_help_lists_lazy_commands_without_loading_them(self):
+        root_menu, loader_mock = self._create_lazy_menu()
+        output = TestCliRunner.run(root_menu, ["--help"])
+        self.assertIn("dummy", output)
+        self.assertIn("Dummy plugin command", output)
+        loader_mock.assert_not_called()
+
+    def test_lazy_command_loaded_once_upon_invocation(self):
+        root_menu, loader_mock = self._create_lazy_menu()
+        output = TestCliRunner.run(root_menu, ["dummy"])
+        self.assertIn("dummy plugin command ran", output)
+        TestCliRunner.run(root_menu, ["dummy"])
+        loader_mock.assert_called_once()
+
+    def test_resolve_lazy_commands_loads_all_pending(self):
+        root_menu, loader_mock = self._create_lazy_menu()
+        root_menu.resolve_lazy_commands()
+        loader_mock.assert_called_once()
+        self.assertIn("dummy", root_menu.commands)
+
+    def test_resolve_all_plugins_sharing_a_root_command_name(self):
+        root_menu = EntryPoint.create_cli_menu()
+
+        def create_loader(subcommand_name: str):
+            def loader():
+                # Plugins extend the root command when another plugin already attached it
+                tools = root_menu.commands.get("tools")
+                if tools is None:
+
+                    @root_menu.group()
+                    def tools():
+                        """Tools plugin commands"""
+
+                @tools.command(name=subcommand_name)
+                def subcommand():
+                    click.echo(f"{subcommand_name} plugin command ran")
+
+            return mock.MagicMock(side_effect=loader)
+
+        first_loader, second_loader = create_loader("first"), create_loader("second")
+        root_menu.add_lazy_commands({"tools": "Tools plugin commands"}, first_loader)
+        root_menu.add_lazy_commands({"tools": "Tools plugin commands"}, second_loader)
+
+        self.assertIn("first plugin command ran", TestCliRunner.run(root_menu, ["tools", "first"]))
+        self.assertIn("second plugin command ran", TestCliRunner.run(root_menu, ["tools", "second"]))
+        first_loader.assert_called_once()
+        second_loader.assert_called_once()
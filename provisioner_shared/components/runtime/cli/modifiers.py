@@ -50,6 +50,8 @@ class CliModifiers:
         non_interactive: bool,
         os_arch: str,
         pkg_mgr: PackageManager,
+        timings: bool = False,
+        ignore_ledger: bool = False,
     ) -> None:
         self.verbose = verbose
         self.dry_run = dry_run
@@ -57,6 +59,8 @@ class CliModifiers:
         self.non_interactive = non_interactive
         self.os_arch = os_arch
         self.pkg_mgr = pkg_mgr
+        self.timings = timings
+        self.ignore_ledger = ignore_ledger
 
     @staticmethod
     def from_click_ctx(ctx: click.Context) -> Optional["CliModifiers"]:
@@ -80,3 +84,9 @@ class CliModifiers:
 
     def get_package_manager(self) -> PackageManager:
         return self.pkg_mgr
+
+    def is_timings(self) -> bool:
+        return self.timings
+
+    def is_ignore_ledger(self) -> bool:
+        return self.ignore_ledger
@@ -9,13 +9,12 @@ import click
 from loguru import logger
 
 from provisioner_shared.components.runtime.cli.cli_modifiers import cli_modifiers
-from provisioner_shared.components.runtime.cli.menu_format import CustomGroup
+from provisioner_shared.components.runtime.cli.menu_format import CustomGroup, LazyGroup
 from provisioner_shared.components.runtime.colors import colors
 from provisioner_shared.components.runtime.config.manager.config_manager import ConfigManager
+from provisioner_shared.components.runtime.config.user_config import CONFIG_USER_PATH
 from provisioner_shared.components.runtime.shared.collaborators import CoreCollaborators
 
-CONFIG_USER_PATH = os.path.expanduser("~/.config/provisioner/config.yaml")
-
 
 def append_config_cmd_to_cli(root_menu: click.Group, collaborators: CoreCollaborators):
 
@@ -49,15 +48,23 @@ def append_config_cmd_to_cli(root_menu: click.Group, collaborators: CoreCollabor
     @cli_modifiers
     def flush(force: bool):
         """Flush internal configuration to a user config file"""
+        _resolve_plugins_config(root_menu)
         flush_config(force, collaborators)
 
     @config.command()
     @cli_modifiers
     def view():
         """Print configuration to stdout"""
+        _resolve_plugins_config(root_menu)
         view_config(collaborators)
 
 
+def _resolve_plugins_config(root_menu: click.Group) -> None:
+    # Lazily registered plugins load their configuration only upon import
+    if isinstance(root_menu, LazyGroup):
+        root_menu.resolve_lazy_commands()
+
+
 def clear_config(collaboratos: CoreCollaborators) -> None:
     if collaboratos.io_utils().file_exists_fn(CONFIG_USER_PATH):
         collaboratos.io_utils().delete_file_fn(CONFIG_USER_PATH)
@@ -82,6 +89,8 @@ def flush_config(force: Optional[bool], collaboratos: CoreCollaborators) -> None
     collaboratos.io_utils().write_file_safe_fn(
         content=cfg_yaml, file_name=os.path.basename(CONFIG_USER_PATH), dir_path=os.path.dirname(CONFIG_USER_PATH)
     )
+    # The user config was rewritten, drop parsed YAML files cached from its previous content
+    collaboratos.yaml_util().invalidate_parsed_cache_fn()
 
     collaboratos.printer().print_fn(
         f"Internal configuration flushed to user configuration file. path: {CONFIG_USER_PATH}"
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.command.config.cli import flush_config
+from provisioner_shared.test_lib.test_cli_runner import TestCliRunner
+from provisioner_shared.test_lib.test_env import TestEnv
+
+CONFIG_CLI_PATH = "provisioner_shared.components.runtime.command.config.cli"
+
+
+# To run as a single test target:
+#  ./run_tests.py provisioner_shared/components/runtime/command/config/cli_test.py
+#
+class ConfigCliTestShould(unittest.TestCase):
+    env = TestEnv.create()
+
+    @mock.patch(f"{CONFIG_CLI_PATH}.flush_config")
+    def test_cli_config_flush_cmd_without_force(self, flush_call: mock.MagicMock) -> None:
+        TestCliRunner.run(self.env.create_cli_app(), ["config", "flush"])
+        flush_call.assert_called_once()
+        self.assertFalse(flush_call.call_args.args[0])
+
+    @mock.patch(f"{CONFIG_CLI_PATH}.flush_config")
+    def test_cli_config_flush_cmd_with_force(self, flush_call: mock.MagicMock) -> None:
+        TestCliRunner.run(self.env.create_cli_app(), ["config", "flush", "--force"])
+        flush_call.assert_called_once()
+        self.assertTrue(flush_call.call_args.args[0])
+
+    @mock.patch(f"{CONFIG_CLI_PATH}._get_user_facing_config_yaml", return_value="plugins: {}\n")
+    def test_flush_invalidates_parsed_yaml_cache(self, _) -> None:
+        collaborators = mock.MagicMock()
+        collaborators.io_utils().file_exists_fn.return_value = False
+        flush_config(False, collaborators)
+        collaborators.io_utils().write_file_safe_fn.assert_called_once()
+        collaborators.yaml_util().invalidate_parsed_cache_fn.assert_called_once()
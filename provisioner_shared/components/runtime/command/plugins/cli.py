@@ -194,7 +194,8 @@ def uninstall_local_plugins_from_prompt(collaborators: CoreCollaborators) -> Non
 
 def show_plugin_compatibility(collaborators: CoreCollaborators, show_incompatible: bool = False) -> None:
     """Show plugin compatibility information with current runtime version"""
-    runtime_version = collaborators.package_loader().get_runtime_version_fn()
+    # Explicitly requested report, PyPI may be queried if the version cannot be resolved locally
+    runtime_version = collaborators.package_loader().get_runtime_version_fn(allow_network=True)
 
     if not runtime_version:
         collaborators.printer().print_fn("⚠️  Could not determine runtime version")
@@ -214,6 +215,14 @@ def show_plugin_compatibility(collaborators: CoreCollaborators, show_incompatibl
     compatible_count = 0
     incompatible_count = 0
 
+    # Resolve all plugins compatibility in a single batch from the persisted index
+    index = collaborators.package_loader().get_plugins_compatibility_index_fn(all_packages) or {}
+    runtime_version_tuple = None
+    try:
+        runtime_version_tuple = VersionCompatibility.parse_version(runtime_version)
+    except ValueError:
+        pass
+
     for package_name in all_packages:
         pkg_name_escaped = package_name.replace("-", "_")
         plgn_def = prov_cfg.plugins_definitions.get(pkg_name_escaped, None)
@@ -221,7 +230,11 @@ def show_plugin_compatibility(collaborators: CoreCollaborators, show_incompatibl
         if not plgn_def:
             continue
 
-        is_compatible = VersionCompatibility.is_plugin_compatible(package_name, runtime_version)
+        entry = index.get(package_name)
+        if entry is not None and runtime_version_tuple is not None:
+            is_compatible = VersionCompatibility.is_index_entry_compatible(entry, runtime_version_tuple)
+        else:
+            is_compatible = VersionCompatibility.is_plugin_compatible(package_name, runtime_version)
 
         if is_compatible:
             compatible_count += 1
@@ -240,23 +253,12 @@ def show_plugin_compatibility(collaborators: CoreCollaborators, show_incompatibl
         output += f"   Package: {package_name}\n"
         output += f"   Status: {colors.color_text('Compatible' if is_compatible else 'Incompatible', status_color)}\n"
 
-        # Try to get the compatibility range
-        try:
-            import importlib.util
-
-            normalized_name = package_name.replace("-", "_")
-            spec = importlib.util.find_spec(normalized_name)
-            if spec and spec.origin:
-                from pathlib import Path
-
-                plugin_path = Path(spec.origin).parent
-                version_range = VersionCompatibility.read_plugin_compatibility(str(plugin_path))
-                if version_range:
-                    output += f"   Required Runtime: {version_range}\n"
-                else:
-                    output += f"   Required Runtime: {colors.color_text('Not specified (assumes compatible)', colors.YELLOW)}\n"
-        except Exception:
+        if entry is None:
             output += f"   Required Runtime: {colors.color_text('Could not determine', colors.YELLOW)}\n"
+        elif entry.get("range"):
+            output += f"   Required Runtime: {entry.get('range')}\n"
+        else:
+            output += f"   Required Runtime: {colors.color_text('Not specified (assumes compatible)', colors.YELLOW)}\n"
 
         output += "\n"
 
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import unittest
+from unittest import mock
 
+from provisioner_shared.components.runtime.command.plugins.cli import show_plugin_compatibility
 from provisioner_shared.test_lib.assertions import Assertion
 from provisioner_shared.test_lib.test_cli_runner import TestCliRunner
 from provisioner_shared.test_lib.test_env import TestEnv
@@ -54,3 +56,9 @@ Maintainer..: Zachi Nachshon""",
                 ],
             ),
         )
+
+    def test_plugins_compatibility_allows_network_runtime_version_lookup(self) -> None:
+        collaborators = mock.MagicMock()
+        collaborators.package_loader().get_runtime_version_fn.return_value = None
+        show_plugin_compatibility(collaborators)
+        collaborators.package_loader().get_runtime_version_fn.assert_called_once_with(allow_network=True)
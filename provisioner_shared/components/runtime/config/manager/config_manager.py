@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 
+import os
+import threading
+from typing import Dict, Optional
 
 from loguru import logger
 
@@ -23,10 +26,13 @@ class ConfigManager:
     # This is the user config YAML file as json string which is located on ~/.config/provisioner/config.yaml
     _user_config_raw_dict: dict = None
 
-    def __init__(self, ctx: Context) -> None:
-        io = IOUtils.create(ctx)
-        yaml_util = YamlUtil.create(ctx, io)
+    def __init__(self, ctx: Context, yaml_util: Optional[YamlUtil] = None) -> None:
+        if yaml_util is None:
+            yaml_util = YamlUtil.create(ctx, IOUtils.create(ctx))
         self._config_reader = ConfigReader.create(yaml_util)
+        # Internal configuration files parsed ahead of time (i.e. on a plugins loading thread pool)
+        self._preparsed_raw_dicts: Dict[str, dict] = {}
+        self._preparsed_lock = threading.Lock()
 
     @staticmethod
     def nullify() -> None:
@@ -34,6 +40,19 @@ class ConfigManager:
             ConfigManager.instance()._user_config_raw_dict = None
             ConfigManager.instance().config = None
 
+    @staticmethod
+    def initialize(ctx: Context, yaml_util: YamlUtil) -> "ConfigManager":
+        """
+        Create the singleton on top of an existing collaborators graph (i.e. CoreCollaborators)
+        instead of a dedicated Context and YAML utilities, must be called prior to any instance() call.
+        """
+        if ConfigManager._instance is not None:
+            logger.debug("ConfigManager was already created, keeping the existing instance")
+            return ConfigManager._instance
+        logger.debug("Creating ConfigManager from shared collaborators...")
+        ConfigManager._instance = ConfigManager(ctx=ctx, yaml_util=yaml_util)
+        return ConfigManager._instance
+
     @staticmethod
     def instance() -> "ConfigManager":
         if ConfigManager._instance is None:
@@ -66,10 +85,34 @@ class ConfigManager:
         if self.config is None:
             raise FailedToMergeConfiguration("Failed to merge user and internal configuration.")
 
+    def preparse_config(self, path: str) -> None:
+        """
+        Parse a configuration file ahead of its load, safe to call from worker threads.
+        The parsed content is consumed once by the following load_plugin_config call of the same path.
+        """
+        raw_dict = self._config_reader.read_config_as_json_dict_safe_fn(path=path)
+        if raw_dict is None:
+            return
+        with self._preparsed_lock:
+            self._preparsed_raw_dicts[os.path.realpath(path)] = raw_dict
+
+    def _read_internal_config(self, path: str, cls: SerializationBase) -> SerializationBase:
+        with self._preparsed_lock:
+            raw_dict = self._preparsed_raw_dicts.pop(os.path.realpath(path), None)
+        if raw_dict is None:
+            return self._config_reader.read_config_safe_fn(path=path, cls=cls)
+
+        logger.debug(f"Using pre-parsed configuration. path: {path}")
+        try:
+            return cls(raw_dict)
+        except Exception as ex:
+            print(f"Failed reading config file. path {path}, ex: {ex}")
+        return None
+
     def load_plugin_config(self, plugin_name: str, internal_path: str, cls: SerializationBase) -> None:
         logger.debug(f"Loading internal plugin configuration. name: {plugin_name}")
         # Read plugin internal configuration
-        internal_plgn_cfg_obj = self._config_reader.read_config_safe_fn(path=internal_path, cls=cls)
+        internal_plgn_cfg_obj = self._read_internal_config(path=internal_path, cls=cls)
         if internal_plgn_cfg_obj is None:
             raise FailedToReadConfigurationFile(f"Failed to read internal plugin configuration. name: {plugin_name}")
 
@@ -107,6 +107,20 @@ class ConfigResolverTestShould(unittest.TestCase):
             }
         )
 
+    def test_initialize_shares_yaml_util(self) -> None:
+        original_instance = ConfigManager._instance
+        try:
+            ConfigManager._instance = None
+            yaml_util = mock.MagicMock()
+            yaml_util.read_file_fn.return_value = self.create_fake_config_obj()
+            manager = ConfigManager.initialize(ctx=mock.MagicMock(), yaml_util=yaml_util)
+            self.assertIs(ConfigManager.instance(), manager)
+            self.assertIs(ConfigManager.initialize(ctx=mock.MagicMock(), yaml_util=mock.MagicMock()), manager)
+            manager.load(internal_path=ARG_CONFIG_INTERNAL_PATH, user_path=None, cls=FakeBasicConfigObj)
+            yaml_util.read_file_fn.assert_called_once_with(file_path=ARG_CONFIG_INTERNAL_PATH, cls=FakeBasicConfigObj)
+        finally:
+            ConfigManager._instance = original_instance
+
     @mock.patch(
         f"{CONFIG_READER_PKG_PATH}.ConfigReader.read_config_safe_fn",
         side_effect=[create_fake_config_obj()],
@@ -184,6 +198,23 @@ class ConfigResolverTestShould(unittest.TestCase):
         self.assertEqual(output.dict_obj["plugins"][TEST_PLUGIN_NAME].dict_obj["string_value"], "fake_string")
         self.assertEqual(output.dict_obj["plugins"][TEST_PLUGIN_NAME].dict_obj["int_value"], 123)
 
+    @mock.patch(f"{CONFIG_READER_PKG_PATH}.ConfigReader.read_config_safe_fn")
+    @mock.patch(
+        f"{CONFIG_READER_PKG_PATH}.ConfigReader.read_config_as_json_dict_safe_fn",
+        return_value={"url": "http://plugin.com", "description": "awesome plugin", "int_value": 123},
+    )
+    def test_load_preparsed_plugin_config(self, read_dict_call: mock.MagicMock, read_cfg_call: mock.MagicMock) -> None:
+        ConfigManager.instance().config = self.create_plugins_fake_config_obj()
+        ConfigManager.instance()._user_config_raw_dict = None
+        ConfigManager.instance().preparse_config(ARG_PLUGIN_CONFIG_INTERNAL_PATH)
+        ConfigManager.instance().load_plugin_config(
+            plugin_name=TEST_PLUGIN_NAME, internal_path=ARG_PLUGIN_CONFIG_INTERNAL_PATH, cls=FakeBasicPluginConfigObj
+        )
+        output = ConfigManager.instance().get_config()
+        self.assertEqual(output.dict_obj["plugins"][TEST_PLUGIN_NAME].url, "http://plugin.com")
+        read_dict_call.assert_called_once_with(path=ARG_PLUGIN_CONFIG_INTERNAL_PATH)
+        read_cfg_call.assert_not_called()
+
     @mock.patch(
         f"{CONFIG_READER_PKG_PATH}.ConfigReader.read_config_safe_fn",
         side_effect=[create_plugins_fake_config_obj()],
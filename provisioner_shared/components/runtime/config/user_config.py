@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+
+import os
+
+# Kept free of heavy imports, used by the startup fast path prior to loading the CLI
+CONFIG_USER_PATH = os.path.expanduser("~/.config/provisioner/config.yaml")
@@ -15,6 +15,8 @@ class Context:
     _auto_prompt: bool = None
     _non_interactive: bool = None
     _pkg_mgr: PackageManager = None
+    _timings: bool = None
+    _ignore_ledger: bool = None
 
     @staticmethod
     def create_empty() -> "Context":
@@ -25,6 +27,8 @@ class Context:
         ctx._auto_prompt = False
         ctx._non_interactive = False
         ctx._pkg_mgr = PackageManager.PIP
+        ctx._timings = False
+        ctx._ignore_ledger = False
         return ctx
 
     @staticmethod
@@ -35,6 +39,8 @@ class Context:
         non_interactive: Optional[bool] = False,
         os_arch: Optional[OsArch] = None,
         pkg_mgr: Optional[PackageManager] = PackageManager.PIP,
+        timings: Optional[bool] = False,
+        ignore_ledger: Optional[bool] = False,
     ) -> "Context":
 
         try:
@@ -45,6 +51,8 @@ class Context:
             ctx._auto_prompt = auto_prompt
             ctx._non_interactive = non_interactive
             ctx._pkg_mgr = pkg_mgr
+            ctx._timings = timings
+            ctx._ignore_ledger = ignore_ledger
             return ctx
         except Exception as e:
             e_name = e.__class__.__name__
@@ -65,6 +73,12 @@ class Context:
     def get_package_manager(self) -> PackageManager:
         return self._pkg_mgr
 
+    def is_timings(self) -> bool:
+        return self._timings
+
+    def is_ignore_ledger(self) -> bool:
+        return self._ignore_ledger
+
 
 class CliContextManager:
 
@@ -80,4 +94,6 @@ class CliContextManager:
             non_interactive=modifiers.is_non_interactive(),
             os_arch=os_arch,
             pkg_mgr=modifiers.get_package_manager(),
+            timings=modifiers.is_timings(),
+            ignore_ledger=modifiers.is_ignore_ledger(),
         )
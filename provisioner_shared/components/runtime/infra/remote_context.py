@@ -7,6 +7,10 @@ class RemoteContext:
     _verbose: bool = None
     _dry_run: bool = None
     _silent: bool = None
+    _forks: Optional[int] = None
+    _strategy: Optional[str] = None
+    _serial: Optional[str] = None
+    _refresh_facts: bool = None
 
     @staticmethod
     def no_op() -> "RemoteContext":
@@ -17,12 +21,20 @@ class RemoteContext:
         dry_run: Optional[bool] = False,
         verbose: Optional[bool] = False,
         silent: Optional[bool] = False,
+        forks: Optional[int] = None,
+        strategy: Optional[str] = None,
+        serial: Optional[str] = None,
+        refresh_facts: Optional[bool] = False,
     ) -> "RemoteContext":
 
         ctx = RemoteContext()
         ctx._dry_run = dry_run
         ctx._verbose = verbose
         ctx._silent = silent
+        ctx._forks = forks
+        ctx._strategy = strategy
+        ctx._serial = serial
+        ctx._refresh_facts = refresh_facts
         return ctx
 
     def is_verbose(self) -> bool:
@@ -33,3 +45,15 @@ class RemoteContext:
 
     def is_silent(self) -> bool:
         return self._silent
+
+    def get_forks(self) -> Optional[int]:
+        return self._forks
+
+    def get_strategy(self) -> Optional[str]:
+        return self._strategy
+
+    def get_serial(self) -> Optional[str]:
+        return self._serial
+
+    def is_refresh_facts(self) -> bool:
+        return self._refresh_facts
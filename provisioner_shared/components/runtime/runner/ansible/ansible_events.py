@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+from loguru import logger
+
+ANSIBLE_OUTPUT_TAIL_MAX_EVENTS = 200
+
+ANSIBLE_TASK_START_EVENT = "playbook_on_task_start"
+ANSIBLE_HOST_RESULT_EVENTS = {
+    "runner_on_ok": "ok",
+    "runner_on_failed": "failed",
+    "runner_on_unreachable": "unreachable",
+    "runner_on_skipped": "skipped",
+}
+# Failed tasks with 'ignore_errors: true' do not fail the host
+ANSIBLE_IGNORED_FAILURE_STATUS = "ignored"
+
+
+class AnsibleHostTaskResult:
+    host: str
+    task: str
+    role: Optional[str]
+    status: str
+    changed: bool
+    duration_sec: Optional[float]
+
+    def __init__(
+        self,
+        host: str,
+        task: str,
+        role: Optional[str],
+        status: str,
+        changed: bool = False,
+        duration_sec: Optional[float] = None,
+    ) -> None:
+        self.host = host
+        self.task = task
+        self.role = role
+        self.status = status
+        self.changed = changed
+        self.duration_sec = duration_sec
+
+
+class AnsibleEventStream:
+    """
+    Consume ansible-runner job events as they are emitted by the running playbook.
+
+    Task progress and per host results are reported in real time without polling the output.
+    Only the extracted 'msg:' contents and a bounded tail of the output (for error reporting)
+    are kept in memory, the full output is kept only when verbose output was requested.
+    """
+
+    _verbose: bool
+    _extract_msg_fn: Callable[[str], str]
+    _print_fn: Callable[[str], None]
+    _messages: List[str]
+    _output_tail: Deque[str]
+    _full_output: List[str]
+    _host_results: List[AnsibleHostTaskResult]
+    _status: Optional[str]
+
+    def __init__(
+        self,
+        verbose: bool,
+        extract_msg_fn: Callable[[str], str],
+        print_fn: Callable[[str], None] = print,
+        tail_max_events: int = ANSIBLE_OUTPUT_TAIL_MAX_EVENTS,
+    ) -> None:
+        self._verbose = verbose
+        self._extract_msg_fn = extract_msg_fn
+        self._print_fn = print_fn
+        self._messages = []
+        self._output_tail = deque(maxlen=tail_max_events)
+        self._full_output = []
+        self._host_results = []
+        self._status = None
+
+    @staticmethod
+    def create(
+        verbose: bool, extract_msg_fn: Callable[[str], str], print_fn: Callable[[str], None] = print
+    ) -> "AnsibleEventStream":
+        return AnsibleEventStream(verbose, extract_msg_fn, print_fn)
+
+    def _on_event(self, event: dict) -> bool:
+        """
+        ansible-runner event_handler, returns False so job events are not persisted to the artifacts directory.
+        """
+        event_name = event.get("event")
+        event_data = event.get("event_data", {})
+        # Playbooks run in a pseudo terminal which outputs CRLF line endings
+        stdout = (event.get("stdout") or "").replace("\r\n", "\n")
+
+        if event_name == ANSIBLE_TASK_START_EVENT:
+            task_name = event_data.get("task")
+            if task_name and task_name != "debug":
+                self._print_fn(f"Running task: {task_name}")
+
+        elif event_name in ANSIBLE_HOST_RESULT_EVENTS:
+            result = event_data.get("res", {})
+            status = ANSIBLE_HOST_RESULT_EVENTS[event_name]
+            if status == "failed" and event_data.get("ignore_errors"):
+                status = ANSIBLE_IGNORED_FAILURE_STATUS
+            self._host_results.append(
+                AnsibleHostTaskResult(
+                    host=event_data.get("host"),
+                    task=event_data.get("task"),
+                    role=event_data.get("role"),
+                    status=status,
+                    changed=isinstance(result, dict) and result.get("changed", False),
+                    duration_sec=event_data.get("duration"),
+                )
+            )
+
+        if stdout:
+            self._output_tail.append(stdout)
+            if self._verbose:
+                self._full_output.append(stdout)
+            else:
+                message = self._extract_msg_fn(stdout)
+                if message:
+                    self._messages.append(message)
+        return False
+
+    def _on_status(self, status_data: dict, runner_config=None) -> None:
+        self._status = status_data.get("status")
+        logger.debug(f"Ansible run status changed. status: {self._status}")
+
+    def _get_output(self) -> str:
+        """
+        The full output when verbose, the extracted 'msg:' contents otherwise.
+        """
+        if self._verbose:
+            return "\n".join(self._full_output)
+        return "\n".join(self._messages)
+
+    def _get_output_tail(self) -> str:
+        return "\n".join(self._output_tail)
+
+    def _get_host_results(self) -> List[AnsibleHostTaskResult]:
+        return list(self._host_results)
+
+    def _get_status(self) -> Optional[str]:
+        return self._status
+
+    on_event_fn = _on_event
+    on_status_fn = _on_status
+    get_output_fn = _get_output
+    get_output_tail_fn = _get_output_tail
+    get_host_results_fn = _get_host_results
+    get_status_fn = _get_status
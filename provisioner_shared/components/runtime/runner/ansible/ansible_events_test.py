@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_events import AnsibleEventStream
+
+TASK_START_EVENT = {
+    "event": "playbook_on_task_start",
+    "stdout": "\r\nTASK [hello_world : Print hello] ***",
+    "event_data": {"task": "Print hello", "role": "hello_world"},
+}
+
+HOST_OK_EVENT = {
+    "event": "runner_on_ok",
+    "stdout": "ok: [node-1] => \r\n  msg: |-\r\n    Hello World\r\n",
+    "event_data": {
+        "task": "Print hello",
+        "role": "hello_world",
+        "host": "node-1",
+        "duration": 0.25,
+        "res": {"changed": True},
+    },
+}
+
+HOST_UNREACHABLE_EVENT = {
+    "event": "runner_on_unreachable",
+    "stdout": "fatal: [node-2]: UNREACHABLE!",
+    "event_data": {"task": "Print hello", "role": "hello_world", "host": "node-2"},
+}
+
+HOST_IGNORED_FAILURE_EVENT = {
+    "event": "runner_on_failed",
+    "stdout": "fatal: [node-1]: FAILED! => \r\n  msg: not found\r\n...ignoring",
+    "event_data": {"task": "Check service", "role": "hello_world", "host": "node-1", "ignore_errors": True},
+}
+
+HOST_FAILED_EVENT = {
+    "event": "runner_on_failed",
+    "stdout": "fatal: [node-2]: FAILED! => \r\n  msg: not found",
+    "event_data": {"task": "Check service", "role": "hello_world", "host": "node-2", "ignore_errors": None},
+}
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ansible_events_test.py
+#
+class AnsibleEventStreamTestShould(unittest.TestCase):
+    def _create_stream(self, verbose: bool, print_fn=None) -> AnsibleEventStream:
+        return AnsibleEventStream.create(
+            verbose,
+            extract_msg_fn=lambda output: "Hello World" if "msg:" in output else "",
+            print_fn=print_fn if print_fn else mock.MagicMock(),
+        )
+
+    def test_report_task_progress_as_events_arrive(self):
+        print_fn = mock.MagicMock()
+        stream = self._create_stream(verbose=False, print_fn=print_fn)
+        stream.on_event_fn(TASK_START_EVENT)
+        print_fn.assert_called_once_with("Running task: Print hello")
+
+    def test_collect_host_results(self):
+        stream = self._create_stream(verbose=False)
+        for event in [TASK_START_EVENT, HOST_OK_EVENT, HOST_UNREACHABLE_EVENT]:
+            self.assertFalse(stream.on_event_fn(event))
+
+        results = stream.get_host_results_fn()
+        self.assertEqual(
+            [(r.host, r.status, r.changed) for r in results], [("node-1", "ok", True), ("node-2", "unreachable", False)]
+        )
+        self.assertEqual(results[0].duration_sec, 0.25)
+
+    def test_report_ignored_failures_separately_from_failures(self):
+        stream = self._create_stream(verbose=False)
+        for event in [HOST_IGNORED_FAILURE_EVENT, HOST_FAILED_EVENT]:
+            stream.on_event_fn(event)
+        self.assertEqual(
+            [(r.host, r.status) for r in stream.get_host_results_fn()], [("node-1", "ignored"), ("node-2", "failed")]
+        )
+
+    def test_keep_only_extracted_messages_when_not_verbose(self):
+        stream = self._create_stream(verbose=False)
+        for event in [TASK_START_EVENT, HOST_OK_EVENT]:
+            stream.on_event_fn(event)
+        self.assertEqual(stream.get_output_fn(), "Hello World")
+        self.assertIn("TASK [hello_world : Print hello]", stream.get_output_tail_fn())
+        self.assertNotIn("\r", stream.get_output_tail_fn())
+
+    def test_keep_full_output_when_verbose(self):
+        stream = self._create_stream(verbose=True)
+        for event in [TASK_START_EVENT, HOST_OK_EVENT]:
+            stream.on_event_fn(event)
+        self.assertIn("TASK [hello_world : Print hello]", stream.get_output_fn())
+        self.assertIn("Hello World", stream.get_output_fn())
+
+    def test_bound_output_tail(self):
+        stream = AnsibleEventStream(
+            False, extract_msg_fn=lambda output: "", print_fn=mock.MagicMock(), tail_max_events=2
+        )
+        for index in range(5):
+            stream.on_event_fn({"event": "verbose", "stdout": f"line {index}"})
+        self.assertEqual(stream.get_output_tail_fn(), "line 3\nline 4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import Future
 from typing import List, Optional
 from unittest.mock import MagicMock
 
@@ -9,6 +10,8 @@ from provisioner_shared.components.runtime.runner.ansible.ansible_runner import
     AnsibleHost,
     AnsiblePlaybook,
     AnsibleRunnerLocal,
+    AnsibleRunRequest,
+    AnsibleRunResult,
 )
 from provisioner_shared.test_lib.faker import TestFakes
 
@@ -22,6 +25,9 @@ class FakeAnsibleRunnerLocal(TestFakes, AnsibleRunnerLocal):
     def create(ctx: Context) -> "FakeAnsibleRunnerLocal":
         fake = FakeAnsibleRunnerLocal(ctx=ctx)
         fake.run_fn = MagicMock(side_effect=fake.run_fn)
+        fake.run_with_result_fn = MagicMock(side_effect=fake.run_with_result_fn)
+        fake.submit_fn = MagicMock(side_effect=fake.submit_fn)
+        fake.submit_all_fn = MagicMock(side_effect=fake.submit_all_fn)
         return fake
 
     def run_fn(
@@ -31,7 +37,43 @@ class FakeAnsibleRunnerLocal(TestFakes, AnsibleRunnerLocal):
         ansible_vars: Optional[List[str]] = None,
         ansible_tags: Optional[List[str]] = None,
         ansible_playbook_package: Optional[str] = ANSIBLE_PLAYBOOKS_PYTHON_PACKAGE,
+        incremental: Optional[bool] = False,
     ) -> str:
         return self.trigger_side_effect(
-            "run_fn", selected_hosts, playbook, ansible_vars, ansible_tags, ansible_playbook_package
+            "run_fn", selected_hosts, playbook, ansible_vars, ansible_tags, ansible_playbook_package, incremental
         )
+
+    def run_with_result_fn(
+        self,
+        selected_hosts: List[AnsibleHost],
+        playbook: AnsiblePlaybook,
+        ansible_vars: Optional[List[str]] = None,
+        ansible_tags: Optional[List[str]] = None,
+        ansible_playbook_package: Optional[str] = ANSIBLE_PLAYBOOKS_PYTHON_PACKAGE,
+        incremental: Optional[bool] = False,
+    ) -> AnsibleRunResult:
+        return self.trigger_side_effect(
+            "run_with_result_fn",
+            selected_hosts,
+            playbook,
+            ansible_vars,
+            ansible_tags,
+            ansible_playbook_package,
+            incremental,
+        )
+
+    def submit_fn(
+        self,
+        selected_hosts: List[AnsibleHost],
+        playbook: AnsiblePlaybook,
+        ansible_vars: Optional[List[str]] = None,
+        ansible_tags: Optional[List[str]] = None,
+        ansible_playbook_package: Optional[str] = ANSIBLE_PLAYBOOKS_PYTHON_PACKAGE,
+        incremental: Optional[bool] = False,
+    ) -> "Future[AnsibleRunResult]":
+        return self.trigger_side_effect(
+            "submit_fn", selected_hosts, playbook, ansible_vars, ansible_tags, ansible_playbook_package, incremental
+        )
+
+    def submit_all_fn(self, run_requests: List[AnsibleRunRequest]) -> List["Future[AnsibleRunResult]"]:
+        return self.trigger_side_effect("submit_all_fn", run_requests)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+ANSIBLE_SELECTED_HOSTS_GROUP = "selected_hosts"
+ANSIBLE_HOST_VARS_DIR_NAME = "host_vars"
+ANSIBLE_INVENTORY_FILE_MODE = 0o600
+
+
+def _write_private_json_file(file_path: str, content: dict) -> None:
+    # Created with owner only permissions, the content is never readable by other users
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, ANSIBLE_INVENTORY_FILE_MODE)
+    with os.fdopen(fd, "w") as f:
+        json.dump(content, f, indent=2)
+
+
+class AnsibleInventory:
+    """
+    Structured Ansible inventory, hosts are kept as host variables dicts and written in one pass
+    in the JSON form of the Ansible YAML inventory format.
+
+    Every host is a member of the selected_hosts group and optionally of additional groups.
+    Secret host variables (e.g. ansible_password) are not written to the inventory file, they are
+    written to a per host host_vars file next to it which Ansible loads alongside the inventory.
+    """
+
+    _all_vars: dict
+    _hosts: Dict[str, dict]
+    _secret_vars: Dict[str, dict]
+    _groups: Dict[str, Dict[str, None]]
+
+    def __init__(self, all_vars: Optional[dict] = None) -> None:
+        self._all_vars = all_vars if all_vars else {}
+        self._hosts = {}
+        self._secret_vars = {}
+        # Group members are kept as dict keys, insertion ordered with no duplicates
+        self._groups = {ANSIBLE_SELECTED_HOSTS_GROUP: {}}
+
+    @staticmethod
+    def create(all_vars: Optional[dict] = None) -> "AnsibleInventory":
+        return AnsibleInventory(all_vars)
+
+    def _add_host(
+        self,
+        name: str,
+        host_vars: Optional[dict] = None,
+        groups: Optional[List[str]] = None,
+        secret_vars: Optional[dict] = None,
+    ) -> "AnsibleInventory":
+        self._hosts[name] = host_vars if host_vars else {}
+        if secret_vars:
+            self._secret_vars[name] = secret_vars
+        for group in [ANSIBLE_SELECTED_HOSTS_GROUP] + (groups if groups else []):
+            self._groups.setdefault(group, {})[name] = None
+        return self
+
+    def _get_host_names(self, group: Optional[str] = ANSIBLE_SELECTED_HOSTS_GROUP) -> List[str]:
+        return list(self._groups.get(group, {}).keys())
+
+    def _to_dict(self) -> dict:
+        children = {}
+        for group, members in self._groups.items():
+            if group == ANSIBLE_SELECTED_HOSTS_GROUP:
+                # Host variables are defined once, on their selected_hosts entry
+                children[group] = {"hosts": {name: self._hosts[name] for name in members}}
+            else:
+                children[group] = {"hosts": {name: None for name in members}}
+        return {"all": {"vars": self._all_vars, "children": children}}
+
+    def _write(self, dir_path: str, file_name: str) -> str:
+        """
+        Write the inventory file and the secret host_vars files, returns the inventory file path.
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        inventory_file_path = os.path.join(dir_path, file_name)
+        _write_private_json_file(inventory_file_path, self._to_dict())
+
+        if self._secret_vars:
+            host_vars_dir = os.path.join(dir_path, ANSIBLE_HOST_VARS_DIR_NAME)
+            os.makedirs(host_vars_dir, mode=0o700, exist_ok=True)
+            for name, secret_vars in self._secret_vars.items():
+                _write_private_json_file(os.path.join(host_vars_dir, f"{name}.json"), secret_vars)
+
+        logger.debug(
+            f"Created ansible inventory. path: {inventory_file_path}, hosts: {len(self._hosts)}, groups: {len(self._groups)}"
+        )
+        return inventory_file_path
+
+    add_host_fn = _add_host
+    get_host_names_fn = _get_host_names
+    to_dict_fn = _to_dict
+    write_fn = _write
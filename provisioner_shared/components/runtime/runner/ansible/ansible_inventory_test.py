@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.infra.context import Context
+from provisioner_shared.components.runtime.runner.ansible.ansible_inventory import AnsibleInventory
+from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleHost, AnsibleRunnerLocal
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ansible_inventory_test.py
+#
+class AnsibleInventoryTestShould(unittest.TestCase):
+    def test_add_hosts_to_selected_hosts_and_additional_groups(self):
+        inventory = AnsibleInventory.create(all_vars={"ansible_connection": "ssh"})
+        inventory.add_host_fn("master", {"ansible_host": "192.168.1.1"}, groups=["k3s_masters"])
+        inventory.add_host_fn("worker", {"ansible_host": "192.168.1.2"})
+
+        self.assertEqual(
+            inventory.to_dict_fn(),
+            {
+                "all": {
+                    "vars": {"ansible_connection": "ssh"},
+                    "children": {
+                        "selected_hosts": {
+                            "hosts": {
+                                "master": {"ansible_host": "192.168.1.1"},
+                                "worker": {"ansible_host": "192.168.1.2"},
+                            }
+                        },
+                        "k3s_masters": {"hosts": {"master": None}},
+                    },
+                }
+            },
+        )
+        self.assertEqual(inventory.get_host_names_fn("k3s_masters"), ["master"])
+
+    def test_write_secrets_to_private_host_vars_files(self):
+        inventory = AnsibleInventory.create()
+        inventory.add_host_fn("node-1", {"ansible_user": "pi"}, secret_vars={"ansible_password": "raspberry"})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inventory_file_path = inventory.write_fn(temp_dir, "hosts")
+            with open(inventory_file_path) as f:
+                inventory_content = f.read()
+            secrets_file_path = os.path.join(temp_dir, "host_vars", "node-1.json")
+            with open(secrets_file_path) as f:
+                secrets = json.load(f)
+
+            self.assertNotIn("raspberry", inventory_content)
+            self.assertEqual(secrets, {"ansible_password": "raspberry"})
+            for file_path in [inventory_file_path, secrets_file_path]:
+                self.assertEqual(stat.S_IMODE(os.stat(file_path).st_mode), 0o600)
+
+    def test_runner_prepares_structured_host_vars(self):
+        ssh_session_pool = mock.Mock()
+        ssh_session_pool.get_ansible_ssh_common_args_fn.return_value = "-o StrictHostKeyChecking=no"
+        runner = AnsibleRunnerLocal(
+            io_utils=None,
+            paths=None,
+            process=None,
+            progress=None,
+            printer=None,
+            ctx=Context.create(dry_run=False, verbose=False),
+            ssh_session_pool=ssh_session_pool,
+        )
+        inventory = runner._prepare_ansible_inventory(
+            [
+                AnsibleHost("local", "ansible_connection=local"),
+                AnsibleHost(
+                    "node-1", "192.168.1.1", port=2222, username="pi", password="raspberry", groups=["k3s_agents"]
+                ),
+            ]
+        )
+
+        selected_hosts = inventory.to_dict_fn()["all"]["children"]["selected_hosts"]["hosts"]
+        self.assertEqual(selected_hosts["local"], {"ansible_connection": "local"})
+        self.assertEqual(
+            selected_hosts["node-1"],
+            {
+                "ansible_host": "192.168.1.1",
+                "ansible_user": "pi",
+                "ansible_port": 2222,
+                "ansible_ssh_common_args": "-o StrictHostKeyChecking=no",
+            },
+        )
+        self.assertEqual(inventory.get_host_names_fn("k3s_agents"), ["node-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
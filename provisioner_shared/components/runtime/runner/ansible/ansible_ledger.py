@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleHost
+
+ANSIBLE_LEDGER_FILE_PATH = os.path.expanduser("~/.config/provisioner/ansible/ledger.json")
+
+
+class AnsibleLedgerEntry:
+    content_hash: str
+    vars_hash: str
+    converged_at: float
+
+    def __init__(self, content_hash: str, vars_hash: str, converged_at: float) -> None:
+        self.content_hash = content_hash
+        self.vars_hash = vars_hash
+        self.converged_at = converged_at
+
+    @staticmethod
+    def from_dict(entry_dict: dict) -> "AnsibleLedgerEntry":
+        return AnsibleLedgerEntry(entry_dict["content_hash"], entry_dict["vars_hash"], entry_dict["converged_at"])
+
+    def to_dict(self) -> dict:
+        return {"content_hash": self.content_hash, "vars_hash": self.vars_hash, "converged_at": self.converged_at}
+
+    def is_up_to_date(self, content_hash: str, vars_hash: str) -> bool:
+        return self.content_hash == content_hash and self.vars_hash == vars_hash
+
+
+class AnsibleConvergenceLedger:
+    """
+    Record of the hosts a playbook was successfully applied to, along with the playbook and roles content
+    hash and the Ansible variables hash it was applied with.
+
+    A host whose entry is missing or was recorded with different hashes is stale and has to be converged
+    again, any other host already is in the desired state.
+    """
+
+    _file_path: str
+
+    def __init__(self, file_path: str = ANSIBLE_LEDGER_FILE_PATH) -> None:
+        self._file_path = file_path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create(file_path: str = ANSIBLE_LEDGER_FILE_PATH) -> "AnsibleConvergenceLedger":
+        logger.debug(f"Creating Ansible convergence ledger (path: {file_path})...")
+        return AnsibleConvergenceLedger(file_path)
+
+    def _get_host_key(self, host: "AnsibleHost") -> str:
+        return f"{host.host}@{host.ip_address}:{host.port}"
+
+    def _load(self) -> Dict[str, Dict[str, AnsibleLedgerEntry]]:
+        # Read on every access, entries recorded by other provisioner processes are not lost on save
+        if not os.path.exists(self._file_path):
+            return {}
+        try:
+            with open(self._file_path, "r") as f:
+                return {
+                    host_key: {name: AnsibleLedgerEntry.from_dict(entry) for name, entry in playbooks.items()}
+                    for host_key, playbooks in json.load(f).items()
+                }
+        except (ValueError, KeyError, TypeError, AttributeError) as ex:
+            # A corrupted ledger only means every host is converged again
+            logger.warning(f"Ignoring unreadable convergence ledger. path: {self._file_path}, ex: {ex}")
+            return {}
+
+    def _save(self, entries: Dict[str, Dict[str, AnsibleLedgerEntry]]) -> None:
+        content = {
+            host_key: {name: entry.to_dict() for name, entry in playbooks.items()}
+            for host_key, playbooks in entries.items()
+        }
+        os.makedirs(os.path.dirname(self._file_path), exist_ok=True)
+        tmp_file_path = f"{self._file_path}.{os.getpid()}.tmp"
+        with open(tmp_file_path, "w") as f:
+            json.dump(content, f, indent=2)
+        os.replace(tmp_file_path, self._file_path)
+
+    def _filter_stale_hosts(
+        self, hosts: List["AnsibleHost"], playbook_name: str, content_hash: str, vars_hash: str
+    ) -> List["AnsibleHost"]:
+        with self._lock:
+            entries = self._load()
+            stale_hosts = []
+            for host in hosts:
+                entry = entries.get(self._get_host_key(host), {}).get(playbook_name)
+                if entry is None or not entry.is_up_to_date(content_hash, vars_hash):
+                    stale_hosts.append(host)
+            return stale_hosts
+
+    def _record_converged(
+        self, hosts: List["AnsibleHost"], playbook_name: str, content_hash: str, vars_hash: str
+    ) -> None:
+        if len(hosts) == 0:
+            return
+        with self._lock:
+            entries = self._load()
+            converged_at = time.time()
+            for host in hosts:
+                entries.setdefault(self._get_host_key(host), {})[playbook_name] = AnsibleLedgerEntry(
+                    content_hash, vars_hash, converged_at
+                )
+            self._save(entries)
+        logger.debug(f"Recorded converged hosts. playbook: {playbook_name}, hosts: {len(hosts)}")
+
+    filter_stale_hosts_fn = _filter_stale_hosts
+    record_converged_fn = _record_converged
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_ledger import AnsibleConvergenceLedger
+from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleHost
+
+MASTER = AnsibleHost("node-1", "192.168.1.1")
+WORKER = AnsibleHost("node-2", "192.168.1.2")
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ansible_ledger_test.py
+#
+class AnsibleConvergenceLedgerTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "ansible", "ledger.json")
+        self.ledger = AnsibleConvergenceLedger.create(self.file_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_consider_unrecorded_hosts_stale(self):
+        self.assertEqual(
+            self.ledger.filter_stale_hosts_fn([MASTER, WORKER], "k3s", "content", "vars"), [MASTER, WORKER]
+        )
+
+    def test_skip_hosts_converged_with_same_content_and_vars(self):
+        self.ledger.record_converged_fn([MASTER], "k3s", "content", "vars")
+
+        # Entries are persisted, a new ledger instance reads them back
+        ledger = AnsibleConvergenceLedger.create(self.file_path)
+        self.assertEqual(ledger.filter_stale_hosts_fn([MASTER, WORKER], "k3s", "content", "vars"), [WORKER])
+        self.assertEqual(ledger.filter_stale_hosts_fn([MASTER], "k3s", "changed-content", "vars"), [MASTER])
+        self.assertEqual(ledger.filter_stale_hosts_fn([MASTER], "k3s", "content", "changed-vars"), [MASTER])
+        self.assertEqual(ledger.filter_stale_hosts_fn([MASTER], "docker", "content", "vars"), [MASTER])
+
+    def test_consider_host_with_new_address_stale(self):
+        self.ledger.record_converged_fn([MASTER], "k3s", "content", "vars")
+        moved_master = AnsibleHost("node-1", "10.0.0.1")
+        self.assertEqual(self.ledger.filter_stale_hosts_fn([moved_master], "k3s", "content", "vars"), [moved_master])
+
+    def test_ignore_corrupted_ledger_file(self):
+        os.makedirs(os.path.dirname(self.file_path))
+        with open(self.file_path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(self.ledger.filter_stale_hosts_fn([MASTER], "k3s", "content", "vars"), [MASTER])
+
+        self.ledger.record_converged_fn([MASTER], "k3s", "content", "vars")
+        self.assertEqual(self.ledger.filter_stale_hosts_fn([MASTER], "k3s", "content", "vars"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import shlex
+import subprocess
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+from loguru import logger
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_events import AnsibleHostTaskResult
+from provisioner_shared.components.runtime.runner.ansible.ansible_timings import (
+    AnsibleTaskTiming,
+    AnsibleTimingsReport,
+)
+from provisioner_shared.components.runtime.utils.yaml_util import YamlSafeLoader
+
+# Opt-in, selects the in process executor for playbooks targeting local connection hosts only
+ENV_ANSIBLE_LOCAL_EXECUTOR = "PROVISIONER_ANSIBLE_LOCAL_EXECUTOR"
+
+ANSIBLE_LOCAL_PLAY_KEYS = {"name", "hosts", "gather_facts", "roles", "environment", "serial", "vars"}
+ANSIBLE_LOCAL_ROLE_KEYS = {"role", "name", "tags", "vars"}
+ANSIBLE_LOCAL_TASK_KEYS = {"name", "tags", "register", "changed_when", "environment"}
+ANSIBLE_LOCAL_MODULES = {"copy", "script", "template", "debug"}
+ANSIBLE_LOCAL_FILE_MODULE_KEYS = {"src", "dest", "mode"}
+ANSIBLE_BUILTIN_PREFIX = "ansible.builtin."
+
+# The only Jinja2 expressions evaluated locally, a (dotted) variable name optionally piped to 'mandatory'
+_EXPRESSION_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][\w.]*)\s*(?:\|\s*mandatory\s*)?\}\}")
+_VAR_NAME_PATTERN = re.compile(r"^[A-Za-z_]\w*$")
+# Octal file modes only, symbolic modes (i.e. u+x) are left to Ansible
+_OCTAL_MODE_PATTERN = re.compile(r"^0?[0-7]{3,4}$")
+_TEMPLATE_MARKERS = ("{{", "{%", "{#")
+
+
+class _UnsupportedLocalPlaybook(Exception):
+    pass
+
+
+class _LocalTaskFailure(Exception):
+    pass
+
+
+def _is_supported_text(text: str) -> bool:
+    return not any(marker in _EXPRESSION_PATTERN.sub("", text) for marker in _TEMPLATE_MARKERS)
+
+
+def _verify_supported_values(value: Any) -> None:
+    if isinstance(value, str) and not _is_supported_text(value):
+        raise _UnsupportedLocalPlaybook(f"unsupported template expression: {value}")
+    if isinstance(value, dict):
+        for item in value.values():
+            _verify_supported_values(item)
+    if isinstance(value, list):
+        for item in value:
+            _verify_supported_values(item)
+
+
+def _resolve(name: str, variables: dict) -> Any:
+    value = variables
+    for part in name.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise _LocalTaskFailure(f"The task includes an undefined variable. name: {name}")
+        value = value[part]
+    return value
+
+
+def _render(value: Any, variables: dict) -> Any:
+    if isinstance(value, str):
+        match = _EXPRESSION_PATTERN.fullmatch(value.strip())
+        if match:
+            # A single expression keeps the variable type, same as Ansible native types
+            return _resolve(match.group(1), variables)
+        return _EXPRESSION_PATTERN.sub(lambda m: str(_resolve(m.group(1), variables)), value)
+    if isinstance(value, dict):
+        return {key: _render(item, variables) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_render(item, variables) for item in value]
+    return value
+
+
+def _parse_key_values(text: str) -> Dict[str, str]:
+    """
+    Parse 'key=value key2="other value"' free form arguments, same as ansible-playbook -e arguments.
+    """
+    try:
+        tokens = shlex.split(text)
+    except ValueError as ex:
+        raise _UnsupportedLocalPlaybook(f"unparsable arguments: {text}, ex: {ex}")
+    result = {}
+    for token in tokens:
+        key, sep, value = token.partition("=")
+        if not sep or not _VAR_NAME_PATTERN.match(key):
+            raise _UnsupportedLocalPlaybook(f"unsupported argument: {token}")
+        result[key] = value
+    return result
+
+
+def _load_yaml_file(file_path: str) -> Any:
+    with open(file_path, "r") as f:
+        return yaml.load(f, Loader=YamlSafeLoader)
+
+
+def _find_role_file(role_path: str, dir_name: str) -> Optional[str]:
+    for file_name in ["main.yaml", "main.yml"]:
+        file_path = os.path.join(role_path, dir_name, file_name)
+        if os.path.isfile(file_path):
+            return file_path
+    return None
+
+
+class AnsibleLocalTask:
+    role: str
+    role_path: str
+    name: str
+    module: str
+    args: Any
+    register: Optional[str]
+    changed_when: Optional[bool]
+    environment: dict
+    variables: dict
+
+    def __init__(
+        self,
+        role: str,
+        role_path: str,
+        name: str,
+        module: str,
+        args: Any,
+        register: Optional[str],
+        changed_when: Optional[bool],
+        environment: dict,
+        variables: dict,
+    ) -> None:
+        self.role = role
+        self.role_path = role_path
+        self.name = name
+        self.module = module
+        self.args = args
+        self.register = register
+        self.changed_when = changed_when
+        self.environment = environment
+        self.variables = variables
+
+
+class AnsibleLocalPlan:
+    tasks: List[AnsibleLocalTask]
+    environment: dict
+
+    def __init__(self, tasks: List[AnsibleLocalTask], environment: dict) -> None:
+        self.tasks = tasks
+        self.environment = environment
+
+
+class AnsibleLocalRunResult:
+    output: str
+    host_results: List[AnsibleHostTaskResult]
+    timings: AnsibleTimingsReport
+    error: Optional[str]
+
+    def __init__(
+        self,
+        output: str,
+        host_results: List[AnsibleHostTaskResult],
+        timings: AnsibleTimingsReport,
+        error: Optional[str] = None,
+    ) -> None:
+        self.output = output
+        self.host_results = host_results
+        self.timings = timings
+        self.error = error
+
+
+class AnsibleLocalExecutor:
+    """
+    Run playbooks targeting local connection hosts in process, without spawning ansible-playbook.
+
+    Only a subset of Ansible is supported: a single play of roles, with no facts gathering, whose tasks use the
+    copy, template, script and debug modules with register, changed_when, environment and tags.
+    Jinja2 expressions are limited to (dotted) variable names, optionally piped to the 'mandatory' filter.
+    Any other playbook is not planned and is expected to run through ansible-playbook.
+    Selected by setting PROVISIONER_ANSIBLE_LOCAL_EXECUTOR=true, ansible-playbook is used otherwise.
+    """
+
+    _verbose: bool
+    _print_fn: Callable[[str], None]
+
+    def __init__(self, verbose: bool, print_fn: Callable[[str], None] = print) -> None:
+        self._verbose = verbose
+        self._print_fn = print_fn
+
+    @staticmethod
+    def create(verbose: bool, print_fn: Callable[[str], None] = print) -> "AnsibleLocalExecutor":
+        logger.debug("Creating Ansible local executor...")
+        return AnsibleLocalExecutor(verbose, print_fn)
+
+    def _create_plan(
+        self, playbook_content: str, ansible_vars: List[str], ansible_tags: List[str]
+    ) -> Optional[AnsibleLocalPlan]:
+        """
+        Tasks to run locally in order, None if the playbook uses anything beyond the supported subset.
+        """
+        try:
+            return self._create_plan_or_raise(playbook_content, ansible_vars, ansible_tags)
+        except (_UnsupportedLocalPlaybook, yaml.YAMLError, OSError) as ex:
+            logger.debug(f"Playbook is not supported by the local executor, using ansible-playbook. reason: {ex}")
+            return None
+
+    def _create_plan_or_raise(
+        self, playbook_content: str, ansible_vars: List[str], ansible_tags: List[str]
+    ) -> AnsibleLocalPlan:
+        plays = yaml.load(playbook_content, Loader=YamlSafeLoader)
+        if not isinstance(plays, list) or len(plays) != 1 or not isinstance(plays[0], dict):
+            raise _UnsupportedLocalPlaybook("expected a single play")
+        play = plays[0]
+        unsupported_keys = set(play.keys()) - ANSIBLE_LOCAL_PLAY_KEYS
+        if unsupported_keys:
+            raise _UnsupportedLocalPlaybook(f"unsupported play keywords: {sorted(unsupported_keys)}")
+        if play.get("gather_facts", True) not in (False, "no", "false"):
+            raise _UnsupportedLocalPlaybook("facts gathering is enabled")
+
+        extra_vars = {}
+        for ansible_var in ansible_vars:
+            extra_vars.update(_parse_key_values(ansible_var))
+        selected_tags = set(ansible_tags)
+        environment = play.get("environment") or {}
+        _verify_supported_values(environment)
+
+        roles = []
+        defaults = {}
+        for role_entry in play.get("roles") or []:
+            role_entry = role_entry if isinstance(role_entry, dict) else {"role": role_entry}
+            unsupported_keys = set(role_entry.keys()) - ANSIBLE_LOCAL_ROLE_KEYS
+            if unsupported_keys:
+                raise _UnsupportedLocalPlaybook(f"unsupported role keywords: {sorted(unsupported_keys)}")
+            role_path = str(role_entry.get("role") or role_entry.get("name"))
+            if not os.path.isabs(role_path) or _find_role_file(role_path, "tasks") is None:
+                raise _UnsupportedLocalPlaybook(f"role tasks not found. role: {role_path}")
+            defaults_file_path = _find_role_file(role_path, "defaults")
+            # Role defaults are visible to every role of the play
+            defaults.update((_load_yaml_file(defaults_file_path) or {}) if defaults_file_path else {})
+            roles.append((role_path, role_entry))
+
+        tasks = []
+        for role_path, role_entry in roles:
+            variables = {
+                **defaults,
+                **(play.get("vars") or {}),
+                **(role_entry.get("vars") or {}),
+                **extra_vars,
+                "role_path": role_path,
+            }
+            role_tags = self._get_tags(role_entry.get("tags"))
+            for task in _load_yaml_file(_find_role_file(role_path, "tasks")) or []:
+                local_task = self._create_task(role_path, task, variables)
+                task_tags = role_tags | self._get_tags(task.get("tags"))
+                if not selected_tags or "always" in task_tags or task_tags & selected_tags:
+                    tasks.append(local_task)
+        return AnsibleLocalPlan(tasks, environment)
+
+    def _get_tags(self, tags: Any) -> set:
+        if not tags:
+            return set()
+        return {tags} if isinstance(tags, str) else set(tags)
+
+    def _create_task(self, role_path: str, task: Any, variables: dict) -> AnsibleLocalTask:
+        if not isinstance(task, dict):
+            raise _UnsupportedLocalPlaybook(f"unsupported task: {task}")
+        module_keys = [key for key in task.keys() if key not in ANSIBLE_LOCAL_TASK_KEYS]
+        if len(module_keys) != 1:
+            raise _UnsupportedLocalPlaybook(f"unsupported task keywords: {module_keys}")
+        module = module_keys[0].removeprefix(ANSIBLE_BUILTIN_PREFIX)
+        if module not in ANSIBLE_LOCAL_MODULES:
+            raise _UnsupportedLocalPlaybook(f"unsupported module: {module}")
+        changed_when = task.get("changed_when")
+        if changed_when is not None and not isinstance(changed_when, bool):
+            raise _UnsupportedLocalPlaybook(f"unsupported changed_when: {changed_when}")
+
+        args = task[module_keys[0]]
+        if module == "script":
+            if not isinstance(args, str):
+                raise _UnsupportedLocalPlaybook("script arguments must be free form")
+        elif module == "debug":
+            args = args if isinstance(args, dict) else {"msg": str(args).strip().removeprefix("msg=")}
+            if set(args.keys()) != {"msg"}:
+                raise _UnsupportedLocalPlaybook(f"unsupported debug arguments: {list(args.keys())}")
+        else:
+            args = args if isinstance(args, dict) else _parse_key_values(str(args))
+            if not {"src", "dest"} <= set(args.keys()) <= ANSIBLE_LOCAL_FILE_MODULE_KEYS:
+                raise _UnsupportedLocalPlaybook(f"unsupported {module} arguments: {list(args.keys())}")
+            mode = args.get("mode")
+            if isinstance(mode, str) and not (_OCTAL_MODE_PATTERN.match(mode) or _EXPRESSION_PATTERN.fullmatch(mode)):
+                raise _UnsupportedLocalPlaybook(f"unsupported {module} mode: {mode}")
+            if module == "template":
+                template_path = self._get_role_file_path(role_path, "templates", str(args["src"]))
+                with open(template_path, "r") as f:
+                    _verify_supported_values(f.read())
+        _verify_supported_values(args)
+        environment = task.get("environment") or {}
+        _verify_supported_values(environment)
+
+        return AnsibleLocalTask(
+            role=os.path.basename(role_path.rstrip("/")),
+            role_path=role_path,
+            # Unnamed tasks are named after their module, same as Ansible
+            name=task.get("name") or module,
+            module=module,
+            args=args,
+            register=task.get("register"),
+            changed_when=changed_when,
+            environment=environment,
+            variables=variables,
+        )
+
+    def _get_role_file_path(self, role_path: str, dir_name: str, src: str) -> str:
+        # Templated sources are resolved at run time, only literal paths are looked up in the role
+        if os.path.isabs(src) or "{{" in src:
+            return src
+        return os.path.join(role_path, dir_name, src)
+
+    def _run(self, plan: AnsibleLocalPlan, host_names: List[str], playbook_name: str) -> AnsibleLocalRunResult:
+        """
+        Run the planned tasks one after the other on every host, a host stops on its first failed task.
+        """
+        messages: List[str] = []
+        transcript: List[str] = []
+        host_results: List[AnsibleHostTaskResult] = []
+        timings: List[AnsibleTaskTiming] = []
+        registered: Dict[str, dict] = {host_name: {} for host_name in host_names}
+        active_hosts = list(host_names)
+        error = None
+
+        for task in plan.tasks:
+            if not active_hosts:
+                break
+            task_name = self._get_task_name(task)
+            if task_name != "debug":
+                self._print_fn(f"Running task: {task_name}")
+            transcript.append(f"TASK [{task.role} : {task_name}]")
+            for host_name in list(active_hosts):
+                started_at = time.time()
+                try:
+                    variables = {**task.variables, **registered[host_name], "inventory_hostname": host_name}
+                    result = self._run_task(task, plan, variables)
+                    status = "ok"
+                except _LocalTaskFailure as ex:
+                    result = ex.args[1] if len(ex.args) > 1 else {"msg": str(ex)}
+                    status = "failed"
+                ended_at = time.time()
+
+                changed = result.get("changed", False) if task.changed_when is None else task.changed_when
+                result["changed"] = changed
+                result["failed"] = status == "failed"
+                if task.register:
+                    registered[host_name][task.register] = result
+                host_results.append(
+                    AnsibleHostTaskResult(host_name, task_name, task.role, status, changed, ended_at - started_at)
+                )
+                timings.append(
+                    AnsibleTaskTiming(
+                        host_name,
+                        task_name,
+                        task.role,
+                        "changed" if changed and status == "ok" else status,
+                        started_at,
+                        ended_at,
+                    )
+                )
+                transcript.append(f"{'changed' if changed and status == 'ok' else status}: [{host_name}]")
+
+                if "msg" in result and task.module == "debug":
+                    message = "\n".join(line.lstrip() for line in str(result["msg"]).splitlines()).strip()
+                    if message:
+                        messages.append(message)
+                        transcript.append(message)
+
+                if status == "failed":
+                    active_hosts.remove(host_name)
+                    failure = (result.get("stderr") or result.get("stdout") or result.get("msg") or "").strip()
+                    transcript.append(failure)
+                    error = error if error else failure
+
+        output = "\n".join(transcript) if self._verbose else "\n".join(messages)
+        return AnsibleLocalRunResult(output, host_results, AnsibleTimingsReport(playbook_name, timings), error)
+
+    def _get_task_name(self, task: AnsibleLocalTask) -> str:
+        try:
+            return str(_render(task.name, task.variables))
+        except _LocalTaskFailure:
+            # Same as Ansible, names referring to undefined variables are displayed as is
+            return task.name
+
+    def _run_task(self, task: AnsibleLocalTask, plan: AnsibleLocalPlan, variables: dict) -> dict:
+        args = _render(task.args, variables)
+        if task.module == "debug":
+            return {"msg": args["msg"], "changed": False}
+
+        environment = {
+            **os.environ,
+            **{key: str(value) for key, value in _render(plan.environment, variables).items()},
+            **{key: str(value) for key, value in _render(task.environment, variables).items()},
+        }
+        if task.module == "script":
+            return self._run_script(task, args, environment)
+        return self._write_file(task, args, variables)
+
+    def _run_script(self, task: AnsibleLocalTask, args: str, environment: dict) -> dict:
+        script_name, _, script_args = args.strip().partition(" ")
+        script_path = self._get_role_file_path(task.role_path, "files", script_name)
+        with open(script_path, "r") as f:
+            first_line = f.readline()
+        interpreter = first_line[2:].strip() if first_line.startswith("#!") else "/bin/sh"
+        # Arguments are passed through the shell, same as the Ansible script module
+        process = subprocess.run(
+            f"{interpreter} {shlex.quote(script_path)} {script_args}",
+            shell=True,
+            capture_output=True,
+            text=True,
+            env=environment,
+            cwd=os.path.expanduser("~"),
+        )
+        result = {
+            "rc": process.returncode,
+            "stdout": process.stdout,
+            "stderr": process.stderr,
+            "stdout_lines": process.stdout.splitlines(),
+            "stderr_lines": process.stderr.splitlines(),
+            "changed": True,
+        }
+        if process.returncode != 0:
+            raise _LocalTaskFailure("non-zero return code", {**result, "msg": "non-zero return code"})
+        return result
+
+    def _write_file(self, task: AnsibleLocalTask, args: dict, variables: dict) -> dict:
+        dir_name = "templates" if task.module == "template" else "files"
+        src_path = self._get_role_file_path(task.role_path, dir_name, str(args["src"]))
+        # Destination is an Ansible 'path' argument, environment variables and user are expanded
+        dest_path = os.path.expanduser(os.path.expandvars(str(args["dest"])))
+        if str(args["dest"]).endswith("/") or os.path.isdir(dest_path):
+            dest_path = os.path.join(dest_path, os.path.basename(src_path))
+        try:
+            with open(src_path, "rb") as f:
+                content = f.read()
+        except OSError as ex:
+            raise _LocalTaskFailure(f"Could not find or access source file. path: {src_path}, ex: {ex}")
+        if task.module == "template":
+            content = str(_render(content.decode("utf-8"), variables)).encode("utf-8")
+
+        mode = None
+        if "mode" in args:
+            # YAML reads an unquoted 0644 as an integer, a quoted one is an octal string
+            mode = args["mode"]
+            if not isinstance(mode, int):
+                if not _OCTAL_MODE_PATTERN.match(str(mode)):
+                    raise _LocalTaskFailure(f"Unsupported file mode, expected an octal mode. mode: {mode}")
+                mode = int(str(mode), 8)
+
+        changed = True
+        try:
+            if os.path.isfile(dest_path):
+                with open(dest_path, "rb") as f:
+                    changed = f.read() != content
+            if changed:
+                os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+                with open(dest_path, "wb") as f:
+                    f.write(content)
+            if mode is not None:
+                os.chmod(dest_path, mode)
+        except OSError as ex:
+            raise _LocalTaskFailure(f"Could not write destination file. path: {dest_path}, ex: {ex}")
+        return {"dest": dest_path, "src": src_path, "changed": changed}
+
+    create_plan_fn = _create_plan
+    run_fn = _run
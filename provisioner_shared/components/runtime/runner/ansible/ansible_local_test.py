@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_local import AnsibleLocalExecutor
+
+ROLE_TASKS = """
+---
+- name: "Copy library (dest: {{ dest_dir }})"
+  copy:
+    src: lib.sh
+    dest: "{{ dest_dir }}/lib.sh"
+    mode: "0600"
+  tags: ['greet']
+
+- name: Render greeting config
+  template:
+    src: greeting.conf
+    dest: "{{ dest_dir }}/"
+  tags: ['greet']
+
+- name: Print a greeting
+  script: greet.sh {{ greeting }}
+  register: scriptOut
+  changed_when: False
+  environment:
+    ENV_USERNAME: "{{ username | mandatory }}"
+  tags: ['greet']
+
+- debug: msg={{ scriptOut.stdout }}
+  tags: ['greet']
+
+- name: Untagged task
+  debug:
+    msg: "never selected"
+"""
+
+GREET_SCRIPT = """#!/bin/bash
+echo "${1}, ${ENV_USERNAME}"
+echo "  indented line"
+"""
+
+PLAYBOOK = """
+---
+- name: Greet
+  hosts: selected_hosts
+  gather_facts: no
+  environment:
+    TERM: xterm
+
+  roles:
+    - role: {role_path}
+"""
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ansible_local_test.py
+#
+class AnsibleLocalExecutorTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.role_path = os.path.join(self.temp_dir.name, "roles", "greet")
+        self.dest_dir = os.path.join(self.temp_dir.name, "dest")
+        self._write_role_file("tasks/main.yaml", ROLE_TASKS)
+        self._write_role_file("defaults/main.yaml", "greeting: Hello\nusername: John\n")
+        self._write_role_file("files/lib.sh", "echo lib\n")
+        self._write_role_file("files/greet.sh", GREET_SCRIPT)
+        self._write_role_file("templates/greeting.conf", "greeting={{ greeting }}\n")
+        self.print_fn = mock.MagicMock()
+        self.executor = AnsibleLocalExecutor.create(verbose=False, print_fn=self.print_fn)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_role_file(self, relative_path: str, content: str) -> None:
+        file_path = os.path.join(self.role_path, relative_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as f:
+            f.write(content)
+
+    def _deny_writes(self, real_open):
+        def open_fn(file, mode="r", *args, **kwargs):
+            if "w" in mode and str(file).startswith(self.dest_dir):
+                raise PermissionError(13, "Permission denied", file)
+            return real_open(file, mode, *args, **kwargs)
+
+        return open_fn
+
+    def _create_plan(self, playbook: str = PLAYBOOK, ansible_vars=None, ansible_tags=None):
+        return self.executor.create_plan_fn(
+            playbook.format(role_path=self.role_path),
+            [f"dest_dir={self.dest_dir}"] + (ansible_vars or []),
+            ansible_tags if ansible_tags is not None else ["greet", "linux"],
+        )
+
+    def test_run_supported_role_tasks_in_process(self):
+        plan = self._create_plan(ansible_vars=["username='Jane Doe'"])
+        self.assertEqual(len(plan.tasks), 4)
+
+        result = self.executor.run_fn(plan, ["local"], "greet")
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.output, "Hello, Jane Doe\nindented line")
+        with open(os.path.join(self.dest_dir, "greeting.conf")) as f:
+            self.assertEqual(f.read(), "greeting=Hello\n")
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.join(self.dest_dir, "lib.sh")).st_mode), 0o600)
+        self.assertEqual(
+            [(r.task, r.status, r.changed) for r in result.host_results],
+            [
+                (f"Copy library (dest: {self.dest_dir})", "ok", True),
+                ("Render greeting config", "ok", True),
+                ("Print a greeting", "ok", False),
+                ("debug", "ok", False),
+            ],
+        )
+        self.assertEqual(len(result.timings.timings), 4)
+        self.print_fn.assert_any_call("Running task: Print a greeting")
+
+        # Files already in place are not changed again
+        second_result = self.executor.run_fn(plan, ["local"], "greet")
+        self.assertEqual([r.changed for r in second_result.host_results[:2]], [False, False])
+
+    def test_stop_host_on_failed_script(self):
+        self._write_role_file("files/greet.sh", "#!/bin/bash\necho 'greeting failed' >&2\nexit 3\n")
+        result = self.executor.run_fn(self._create_plan(), ["local"], "greet")
+
+        self.assertEqual(result.error, "greeting failed")
+        self.assertEqual([r.status for r in result.host_results], ["ok", "ok", "failed"])
+
+    def test_fail_task_when_destination_is_not_writable(self):
+        os.makedirs(self.dest_dir)
+        with mock.patch("builtins.open", side_effect=self._deny_writes(open)):
+            result = self.executor.run_fn(self._create_plan(), ["local"], "greet")
+
+        self.assertIn("Could not write destination file", result.error)
+        self.assertEqual([r.status for r in result.host_results], ["failed"])
+
+    def test_fail_task_on_templated_symbolic_mode(self):
+        self._write_role_file(
+            "tasks/main.yaml", '- copy:\n    src: lib.sh\n    dest: "{{ dest_dir }}/"\n    mode: "{{ lib_mode }}"\n'
+        )
+        result = self.executor.run_fn(self._create_plan(ansible_vars=["lib_mode=u+x"], ansible_tags=[]), ["local"], "x")
+        self.assertIn("expected an octal mode", result.error)
+        self.assertEqual([r.status for r in result.host_results], ["failed"])
+
+    def test_not_plan_symbolic_modes(self):
+        self._write_role_file("tasks/main.yaml", '- copy:\n    src: lib.sh\n    dest: /tmp/lib.sh\n    mode: "u+x"\n')
+        self.assertIsNone(self._create_plan())
+
+    def test_not_plan_unsupported_playbooks(self):
+        self._write_role_file("tasks/main.yaml", "- name: Install\n  apt:\n    name: git\n")
+        self.assertIsNone(self._create_plan())
+
+        self._write_role_file("tasks/main.yaml", '- debug:\n    msg: "{{ greeting | upper }}"\n')
+        self.assertIsNone(self._create_plan())
+
+        self._write_role_file("tasks/main.yaml", "- debug:\n    msg: hello\n")
+        self.assertIsNone(self._create_plan(playbook=PLAYBOOK.replace("gather_facts: no", "gather_facts: yes")))
+        self.assertIsNone(self._create_plan(playbook=PLAYBOOK.replace("hosts:", "become: true\n  hosts:")))
+        self.assertIsNotNone(self._create_plan())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+from typing import List, Optional
+
+# Lines starting (after indentation) with any of these begin a new Ansible output section,
+# host status lines are matched with their host so result keys (e.g. 'changed: true') are not
+ANSIBLE_SECTION_PREFIXES = ("TASK", "PLAY", "RUNNING", "ok: [", "changed: [", "fatal: [", "skipped: [", "failed: [")
+ANSIBLE_FAILURE_PREFIXES = ("fatal: [", "failed: [")
+ANSIBLE_MSG_HEADER = "msg:"
+ANSIBLE_MSG_HEADER_STYLES = ("", "|-", "|2-")
+ANSIBLE_STDERR_HEADER = "stderr: |-"
+ANSIBLE_STDERR_END = "stderr_lines:"
+
+_STATE_NONE = 0
+_STATE_MSG = 1
+_STATE_STDERR = 2
+
+
+class AnsibleOutputParser:
+    """
+    Line oriented parser of the YAML callback playbook output, extracts 'msg:' blocks, 'stderr:' blocks
+    and failed task blocks (fatal: / failed:) in a single pass.
+
+    Output is fed incrementally as it is emitted, every line is inspected once so parsing time is linear
+    in the output size. A partial trailing line is buffered until the rest of it is fed or the parser is flushed.
+
+    Block boundaries:
+    - msg: starts at a 'msg:' / 'msg: |-' / 'msg: |2-' line, ends at the next section line (TASK, PLAY, ok:, ...)
+    - stderr: starts at a 'stderr: |-' line, ends at the 'stderr_lines:' line
+    - failure: starts at a 'fatal: [host]' / 'failed: [host]' line, ends at the next section line
+    """
+
+    _messages: List[str]
+    _stderr_blocks: List[str]
+    _failures: List[str]
+    _partial_line: str
+    _state: int
+    _block_lines: List[str]
+    _failure_lines: Optional[List[str]]
+
+    def __init__(self) -> None:
+        self._messages = []
+        self._stderr_blocks = []
+        self._failures = []
+        self._partial_line = ""
+        self._state = _STATE_NONE
+        self._block_lines = []
+        # Failed task blocks contain the msg and stderr blocks, lines are collected alongside them
+        self._failure_lines = None
+
+    @staticmethod
+    def create() -> "AnsibleOutputParser":
+        return AnsibleOutputParser()
+
+    def _feed(self, output: str) -> "AnsibleOutputParser":
+        if not output:
+            return self
+        lines = output.split("\n")
+        lines[0] = self._partial_line + lines[0]
+        self._partial_line = lines.pop()
+        for line in lines:
+            self._parse_line(line.rstrip("\r"))
+        return self
+
+    def _flush(self) -> "AnsibleOutputParser":
+        """
+        Parse the buffered partial line and close any open block.
+        """
+        if self._partial_line:
+            self._parse_line(self._partial_line.rstrip("\r"))
+            self._partial_line = ""
+        self._close_block()
+        self._close_failure()
+        return self
+
+    def _parse_line(self, line: str) -> None:
+        stripped = line.lstrip()
+
+        if stripped.startswith(ANSIBLE_SECTION_PREFIXES):
+            self._close_block()
+            self._close_failure()
+            if stripped.startswith(ANSIBLE_FAILURE_PREFIXES):
+                self._failure_lines = [line]
+            return
+
+        if self._failure_lines is not None:
+            self._failure_lines.append(line)
+
+        if self._state == _STATE_STDERR:
+            if stripped.startswith(ANSIBLE_STDERR_END):
+                self._close_block()
+            else:
+                self._block_lines.append(line)
+            return
+
+        if self._state == _STATE_MSG:
+            # A msg block lasts until the next section, nested headers are part of its content
+            self._block_lines.append(stripped)
+            return
+
+        if stripped.startswith(ANSIBLE_MSG_HEADER) and stripped[len(ANSIBLE_MSG_HEADER) :].strip() in (
+            ANSIBLE_MSG_HEADER_STYLES
+        ):
+            self._state = _STATE_MSG
+        elif stripped.rstrip() == ANSIBLE_STDERR_HEADER:
+            self._state = _STATE_STDERR
+
+    def _close_block(self) -> None:
+        if self._state == _STATE_MSG:
+            message = "\n".join(self._block_lines).strip()
+            if message:
+                self._messages.append(message)
+        elif self._state == _STATE_STDERR:
+            stderr = "\n".join(self._block_lines).strip()
+            if stderr:
+                self._stderr_blocks.append(stderr)
+        self._state = _STATE_NONE
+        self._block_lines = []
+
+    def _close_failure(self) -> None:
+        if self._failure_lines is not None:
+            self._failures.append("\n".join(self._failure_lines).strip())
+            self._failure_lines = None
+
+    def _get_messages(self) -> List[str]:
+        return list(self._messages)
+
+    def _get_stderr_blocks(self) -> List[str]:
+        return list(self._stderr_blocks)
+
+    def _get_failures(self) -> List[str]:
+        return list(self._failures)
+
+    feed_fn = _feed
+    flush_fn = _flush
+    get_messages_fn = _get_messages
+    get_stderr_blocks_fn = _get_stderr_blocks
+    get_failures_fn = _get_failures
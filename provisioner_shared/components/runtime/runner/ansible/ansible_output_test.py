@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_output import AnsibleOutputParser
+
+PLAYBOOK_OUTPUT = """
+PLAY [Install k3s] *************************************************************
+
+TASK [k3s : Print version] *****************************************************
+ok: [node-1] =>
+  msg: |-
+    k3s version v1.29.0
+      installed from release
+ok: [node-2] =>
+  msg: |-
+    k3s version v1.28.5
+
+TASK [k3s : Start service] *****************************************************
+fatal: [node-2]: FAILED! =>
+  changed: true
+  msg: non-zero return code
+  rc: 1
+  stderr: |-
+    Job for k3s.service failed.
+      See 'journalctl -xeu k3s.service' for details.
+  stderr_lines: <omitted>
+
+PLAY RECAP *********************************************************************
+node-1                     : ok=2    changed=0    unreachable=0    failed=0
+"""
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ansible_output_test.py
+#
+class AnsibleOutputParserTestShould(unittest.TestCase):
+    def test_extract_msg_blocks_without_indentation(self):
+        parser = AnsibleOutputParser.create().feed_fn(PLAYBOOK_OUTPUT).flush_fn()
+        self.assertEqual(
+            parser.get_messages_fn(),
+            ["k3s version v1.29.0\ninstalled from release", "k3s version v1.28.5"],
+        )
+
+    def test_extract_stderr_and_failure_blocks(self):
+        parser = AnsibleOutputParser.create().feed_fn(PLAYBOOK_OUTPUT).flush_fn()
+        self.assertEqual(
+            parser.get_stderr_blocks_fn(),
+            ["Job for k3s.service failed.\n      See 'journalctl -xeu k3s.service' for details."],
+        )
+        failures = parser.get_failures_fn()
+        self.assertEqual(len(failures), 1)
+        self.assertTrue(failures[0].startswith("fatal: [node-2]: FAILED!"))
+        self.assertTrue(failures[0].endswith("stderr_lines: <omitted>"))
+
+    def test_parse_output_fed_in_arbitrary_chunks(self):
+        parser = AnsibleOutputParser.create()
+        for index in range(0, len(PLAYBOOK_OUTPUT), 7):
+            parser.feed_fn(PLAYBOOK_OUTPUT[index : index + 7].replace("\n", "\r\n"))
+        parser.flush_fn()
+        expected = AnsibleOutputParser.create().feed_fn(PLAYBOOK_OUTPUT).flush_fn()
+        self.assertEqual(parser.get_messages_fn(), expected.get_messages_fn())
+        self.assertEqual(parser.get_stderr_blocks_fn(), expected.get_stderr_blocks_fn())
+        self.assertEqual(parser.get_failures_fn(), expected.get_failures_fn())
+
+    def test_close_open_msg_block_on_flush(self):
+        parser = AnsibleOutputParser.create().feed_fn("ok: [node-1] =>\n  msg: |-\n    Hello World")
+        self.assertEqual(parser.get_messages_fn(), [])
+        self.assertEqual(parser.flush_fn().get_messages_fn(), ["Hello World"])
+
+
+if __name__ == "__main__":
+    unittest.main()
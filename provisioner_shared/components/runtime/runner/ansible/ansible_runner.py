@@ -1,14 +1,19 @@
 # !/usr/bin/env python3
 
+import atexit
+import functools
+import hashlib
+import json
 import os
-import re
+import shutil
+import string
 import tempfile
 import threading
-import time
-from typing import Callable, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
-import ansible_runner
-import paramiko
+from ansible_runner.interface import init_command_config
+from ansible_runner.runner import Runner
 from loguru import logger
 
 from provisioner_shared.components.runtime.errors.cli_errors import (
@@ -19,6 +24,27 @@ from provisioner_shared.components.runtime.errors.cli_errors import (
 )
 from provisioner_shared.components.runtime.infra.context import Context
 from provisioner_shared.components.runtime.infra.remote_context import RemoteContext
+from provisioner_shared.components.runtime.runner.ansible.ansible_events import (
+    AnsibleEventStream,
+    AnsibleHostTaskResult,
+)
+from provisioner_shared.components.runtime.runner.ansible.ansible_inventory import AnsibleInventory
+from provisioner_shared.components.runtime.runner.ansible.ansible_ledger import AnsibleConvergenceLedger
+from provisioner_shared.components.runtime.runner.ansible.ansible_local import (
+    ENV_ANSIBLE_LOCAL_EXECUTOR,
+    AnsibleLocalExecutor,
+    AnsibleLocalPlan,
+)
+from provisioner_shared.components.runtime.runner.ansible.ansible_output import AnsibleOutputParser
+from provisioner_shared.components.runtime.runner.ansible.ansible_timings import (
+    ANSIBLE_TIMINGS_DIR_NAME,
+    ANSIBLE_TIMINGS_TOP_TASKS,
+    ENV_ANSIBLE_TIMINGS_FILE,
+    AnsibleTimingsReport,
+)
+from provisioner_shared.components.runtime.runner.ansible.ansible_worker import ENV_ANSIBLE_WORKER, AnsibleWorker
+from provisioner_shared.components.runtime.runner.ansible.ssh_readiness import SSHReadinessProber
+from provisioner_shared.components.runtime.runner.ansible.ssh_session_pool import SSHSessionPool
 from provisioner_shared.components.runtime.utils.io_utils import IOUtils
 from provisioner_shared.components.runtime.utils.os import OsArch
 from provisioner_shared.components.runtime.utils.paths import Paths
@@ -28,7 +54,9 @@ from provisioner_shared.components.runtime.utils.progress_indicator import Progr
 
 ProvisionerAnsibleProjectPath = os.path.expanduser("~/.config/provisioner/ansible")
 
+# JSON form of the YAML inventory format, the Ansible yaml inventory plugin accepts extensionless files
 ANSIBLE_HOSTS_FILE_NAME = "hosts"
+ANSIBLE_RUNS_DIR_NAME = "runs"
 ANSIBLE_LOCAL_CONNECTION = "ansible_connection=local"
 
 ANSIBLE_CFG_PYTHON_PACKAGE = "provisioner_shared.components.runtime.runner.ansible.resources"
@@ -47,15 +75,6 @@ ANSIBLE_STDOUT_PLUGIN_NAME = "custom_yaml"
 
 ANSIBLE_VALUES_SENSITIVE_KEYWORDS = ["token", "secret", "api_token", "api_secret", "password", "pass", "pwd"]
 
-INVENTORY_FORMAT = """
-[all:vars]
-ansible_connection=ssh
-
-# These are the user selected hosts from the prompted selection menu
-[selected_hosts]
-{}
-"""
-
 ENV_VARS = {
     "ANSIBLE_CONFIG": f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_CFG_FILE_NAME}",
     "ANSIBLE_CALLBACK_PLUGINS": f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_CALLBACK_PLUGINS_DIR_NAME}",
@@ -66,20 +85,146 @@ ENV_VARS = {
     "ANSIBLE_COMMAND_WARNINGS": "False",
     "ANSIBLE_ACTION_WARNINGS": "False",
     "ANSIBLE_FORCE_COLOR": "false",
+    "ANSIBLE_NOCOLOR": "true",
 }
 
 REMOTE_MACHINE_LOCAL_BIN_FOLDER = "~/.local/bin"
 
+ENV_ANSIBLE_USE_PACKAGE_RESOURCES = "PROVISIONER_ANSIBLE_USE_PACKAGE_RESOURCES"
+ANSIBLE_RESOURCES_STAMP_FILE_NAME = ".resources.sha256"
+
+ENV_ANSIBLE_PIPELINING = "PROVISIONER_ANSIBLE_PIPELINING"
+ENV_ANSIBLE_CONTROL_PERSIST = "PROVISIONER_ANSIBLE_CONTROL_PERSIST"
+ANSIBLE_CONTROL_PATH_DIR_NAME = "cp"
+ANSIBLE_DEFAULT_CONTROL_PERSIST = "60s"
+
+# Ansible runs a task on 5 hosts at a time unless told otherwise
+ANSIBLE_DEFAULT_FORKS = 5
+ANSIBLE_MAX_AUTO_FORKS = 50
+
+ENV_ANSIBLE_FACT_CACHE = "PROVISIONER_ANSIBLE_FACT_CACHE"
+ENV_ANSIBLE_FACT_CACHE_TTL = "PROVISIONER_ANSIBLE_FACT_CACHE_TTL"
+ANSIBLE_FACT_CACHE_DIR_NAME = "facts"
+ANSIBLE_DEFAULT_FACT_CACHE_TTL_SEC = 86400
+
+ENV_ANSIBLE_MAX_CONCURRENT_RUNS = "PROVISIONER_ANSIBLE_MAX_CONCURRENT_RUNS"
+ANSIBLE_DEFAULT_MAX_CONCURRENT_RUNS = 4
+
+
+def _get_env_int_value(env_var_name: str, default: int) -> int:
+    value = os.environ.get(env_var_name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(
+            f"Ignoring non numeric environment variable value. name: {env_var_name}, value: {value}, default: {default}"
+        )
+    return default
+
+
+def _hash_paths(paths: List[str]) -> str:
+    """
+    Content hash of files and directories trees, compiled Python files are excluded.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        file_paths = [path]
+        if os.path.isdir(path):
+            file_paths = []
+            for root, dirs, file_names in os.walk(path):
+                dirs[:] = sorted(name for name in dirs if name != "__pycache__")
+                file_paths += [os.path.join(root, name) for name in sorted(file_names) if not name.endswith(".pyc")]
+        for file_path in file_paths:
+            digest.update(os.path.relpath(file_path, os.path.dirname(path)).encode("utf-8"))
+            with open(file_path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+class AnsibleSSHConnectionSettings:
+    """
+    Ansible [ssh_connection] settings, applied as environment variables of every ansible-playbook run.
+
+    Multiplexing lets all tasks of a host share a single SSH connection, pipelining executes
+    modules over that connection without copying them to the remote host first.
+    Pipelining requires 'requiretty' to be disabled in the remote sudoers, it can be turned off
+    using the PROVISIONER_ANSIBLE_PIPELINING environment variable.
+    """
+
+    pipelining: bool
+    control_persist: str
+
+    def __init__(self, pipelining: bool = True, control_persist: str = ANSIBLE_DEFAULT_CONTROL_PERSIST) -> None:
+        self.pipelining = pipelining
+        self.control_persist = control_persist
+
+    @staticmethod
+    def from_env() -> "AnsibleSSHConnectionSettings":
+        pipelining = os.environ.get(ENV_ANSIBLE_PIPELINING, "true").lower() not in ("false", "0", "no")
+        control_persist = os.environ.get(ENV_ANSIBLE_CONTROL_PERSIST, ANSIBLE_DEFAULT_CONTROL_PERSIST)
+        return AnsibleSSHConnectionSettings(pipelining, control_persist)
+
+    def to_env_vars(self, control_path_dir: str) -> dict:
+        return {
+            "ANSIBLE_PIPELINING": str(self.pipelining),
+            "ANSIBLE_SSH_ARGS": f"-C -o ControlMaster=auto -o ControlPersist={self.control_persist}",
+            "ANSIBLE_SSH_CONTROL_PATH_DIR": control_path_dir,
+        }
+
+
+class AnsibleFactCacheSettings:
+    """
+    Ansible facts gathered on remote hosts are cached locally as JSON files and reused until they expire.
+
+    With 'smart' gathering, plays skip fact gathering on hosts whose facts are cached, consecutive runs
+    against the same hosts gather facts once per TTL. Facts are cached per selected hosts set since
+    the cache is keyed by inventory host names, which might be reused across clusters.
+    """
+
+    enabled: bool
+    ttl_sec: int
+
+    def __init__(self, enabled: bool = True, ttl_sec: int = ANSIBLE_DEFAULT_FACT_CACHE_TTL_SEC) -> None:
+        self.enabled = enabled
+        self.ttl_sec = ttl_sec
+
+    @staticmethod
+    def from_env() -> "AnsibleFactCacheSettings":
+        enabled = os.environ.get(ENV_ANSIBLE_FACT_CACHE, "true").lower() not in ("false", "0", "no")
+        ttl_sec = _get_env_int_value(ENV_ANSIBLE_FACT_CACHE_TTL, ANSIBLE_DEFAULT_FACT_CACHE_TTL_SEC)
+        return AnsibleFactCacheSettings(enabled, ttl_sec)
+
+    def to_env_vars(self) -> dict:
+        # The jsonfile cache plugin and its directory are set by ansible-runner from its fact_cache setting
+        if not self.enabled:
+            return {}
+        return {"ANSIBLE_GATHERING": "smart", "ANSIBLE_CACHE_PLUGIN_TIMEOUT": str(self.ttl_sec)}
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_playbook_template(content: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Split playbook content into (literal text, placeholder name) segments, once per distinct content.
+    Escaped braces ({{ and }}) are unescaped into the literal text, same as str.format.
+    """
+    return tuple((literal, field_name) for literal, field_name, _, _ in string.Formatter().parse(content))
+
 
 class AnsiblePlaybook:
     __name: str
     __content: str
     __remote_context: RemoteContext
+    __template: Tuple[Tuple[str, Optional[str]], ...]
+    __placeholders: frozenset
 
     def __init__(self, name: str, content: str, remote_context: Optional[RemoteContext] = None) -> None:
         self.__name = name
         self.__content = content
         self.__remote_context = remote_context
+        self.__template = _compile_playbook_template(content)
+        self.__placeholders = frozenset(field_name for _, field_name in self.__template if field_name is not None)
 
     @staticmethod
     def copy_and_add_context(copy_from: "AnsiblePlaybook", remote_context: RemoteContext) -> "AnsiblePlaybook":
@@ -91,21 +236,24 @@ class AnsiblePlaybook:
     def is_remote_run_as_dry_run(self) -> bool:
         return self.__remote_context.is_dry_run() is True
 
+    def get_remote_context(self) -> Optional[RemoteContext]:
+        return self.__remote_context
+
     def get_content(self, paths: Paths, ansible_playbook_package: str, dry_run: bool) -> str:
         """
         Playbook content support the following string format values:
         - {ansible_playbooks_path}: replace with the ansible-playbook resource root folder path
-        - {modifiers}: Add modifier flags: DRY_RUN / VERBOSE / SILENT
+        - {modifiers}: Add modifier flags: DRY_RUN / VERBOSE / SILENT and the 'serial' batch size play keyword
         """
         resolved_path: str = ""
-        if "ansible_playbooks_path" in self.__content:
+        if "ansible_playbooks_path" in self.__placeholders:
             resolved_path = self._get_ansible_playbook_path(paths, ansible_playbook_package)
 
         # TODO: Separate between the {modifiers} section to the XTERM, add two section that
         #       will be added to the playbook content under 'environment:' attribute
         modifiers: str = ""
-        # if "modifiers" in self.__content and not dry_run:
-        if "modifiers" in self.__content:
+        # if "modifiers" in self.__placeholders and not dry_run:
+        if "modifiers" in self.__placeholders:
             if self.__remote_context is None:
                 logger.debug(
                     "Empty remote context, modifiers won't get added to the Ansible playbook (dry_run / verbose / silent)"
@@ -113,16 +261,30 @@ class AnsiblePlaybook:
             else:
                 modifiers = self._generate_modifiers(self.__remote_context)
 
-        return self.__content.format(ansible_playbooks_path=resolved_path, modifiers=modifiers)
+        values = {"ansible_playbooks_path": resolved_path, "modifiers": modifiers}
+        return "".join(
+            literal if field_name is None else f"{literal}{values[field_name]}"
+            for literal, field_name in self.__template
+        )
+
+    def get_roles_path(self, paths: Paths, ansible_playbook_package: str) -> Optional[str]:
+        """
+        Resolved ansible-playbook resource root folder path, None if the playbook does not refer to it.
+        """
+        if "ansible_playbooks_path" not in self.__placeholders:
+            return None
+        return str(self._get_ansible_playbook_path(paths, ansible_playbook_package))
 
     def _generate_modifiers(self, remote_context: RemoteContext):
+        # Play keywords share the play level indentation of the {modifiers} placeholder
+        play_keywords = f'\n  serial: "{remote_context.get_serial()}"' if remote_context.get_serial() else ""
         # Added TERM=xterm: xterm to allow a unified Linux terminal experience, not all terminals are supported
         if not remote_context.is_dry_run() and not remote_context.is_silent() and not remote_context.is_verbose():
-            return """
+            return f"""{play_keywords}
   environment:
     TERM: xterm
 """
-        return f"""
+        return f"""{play_keywords}
   environment:
     TERM: xterm
     {"DRY_RUN: True" if remote_context.is_dry_run() else ""}
@@ -159,6 +321,7 @@ class AnsibleHost:
         username: str = None,
         password: Optional[str] = None,
         ssh_private_key_file_path: Optional[str] = None,
+        groups: Optional[List[str]] = None,
     ) -> None:
 
         self.host = host
@@ -167,6 +330,8 @@ class AnsibleHost:
         self.username = username
         self.password = password
         self.ssh_private_key_file_path = ssh_private_key_file_path
+        # Inventory groups in addition to 'selected_hosts'
+        self.groups = groups
 
     @staticmethod
     def from_dict(ansible_host_dict: dict) -> "AnsibleHost":
@@ -181,32 +346,49 @@ class AnsibleHost:
                 if "ssh_private_key_file_path" in ansible_host_dict
                 else None
             ),
+            groups=ansible_host_dict["groups"] if "groups" in ansible_host_dict else None,
         )
 
 
-class AnsibleStdFileDescriptors:
-    stdout_fd: int
-    stderr_fd: int
-    stdout_path: str
-    stderr_path: str
-    ansible_done: threading.Event
-    reader_thread: threading.Thread
+class AnsibleRunResult:
+    output: str
+    host_results: List[AnsibleHostTaskResult]
+    timings: AnsibleTimingsReport
+
+    def __init__(
+        self,
+        output: str,
+        host_results: Optional[List[AnsibleHostTaskResult]] = None,
+        timings: Optional[AnsibleTimingsReport] = None,
+    ) -> None:
+        self.output = output
+        self.host_results = host_results if host_results else []
+        self.timings = timings if timings else AnsibleTimingsReport()
+
+
+class AnsibleRunRequest:
+    selected_hosts: List[AnsibleHost]
+    playbook: AnsiblePlaybook
+    ansible_vars: Optional[List[str]]
+    ansible_tags: Optional[List[str]]
+    ansible_playbook_package: str
+    incremental: bool
 
     def __init__(
         self,
-        stdout_fd: int,
-        stderr_fd: int,
-        stdout_path: str,
-        stderr_path: str,
-        ansible_done: threading.Event,
-        reader_thread: threading.Thread,
-    ):
-        self.stdout_fd = stdout_fd
-        self.stderr_fd = stderr_fd
-        self.stdout_path = stdout_path
-        self.stderr_path = stderr_path
-        self.ansible_done = ansible_done
-        self.reader_thread = reader_thread
+        selected_hosts: List[AnsibleHost],
+        playbook: AnsiblePlaybook,
+        ansible_vars: Optional[List[str]] = None,
+        ansible_tags: Optional[List[str]] = None,
+        ansible_playbook_package: Optional[str] = ANSIBLE_PLAYBOOKS_PYTHON_PACKAGE,
+        incremental: Optional[bool] = False,
+    ) -> None:
+        self.selected_hosts = selected_hosts
+        self.playbook = playbook
+        self.ansible_vars = ansible_vars
+        self.ansible_tags = ansible_tags
+        self.ansible_playbook_package = ansible_playbook_package
+        self.incremental = incremental
 
 
 class AnsibleRunnerLocal:
@@ -214,11 +396,24 @@ class AnsibleRunnerLocal:
     _os_arch: OsArch = None
     _dry_run: bool = None
     _verbose: bool = None
+    _timings: bool = None
+    _ignore_ledger: bool = None
     _paths: Paths = None
     _io_utils: IOUtils = None
     _process: Process = None
     _progress: ProgressIndicator = None
     _printer: Printer = None
+    _ssh_session_pool: SSHSessionPool = None
+    _ssh_prober: SSHReadinessProber = None
+    _ssh_connection_settings: AnsibleSSHConnectionSettings = None
+    _fact_cache_settings: AnsibleFactCacheSettings = None
+    _use_package_resources: bool = None
+    _max_concurrent_runs: int = None
+    _executor: ThreadPoolExecutor = None
+    _convergence_ledger: AnsibleConvergenceLedger = None
+    _local_executor: AnsibleLocalExecutor = None
+    _use_local_executor: bool = None
+    _ansible_worker: Optional[AnsibleWorker] = None
 
     def __init__(
         self,
@@ -228,6 +423,14 @@ class AnsibleRunnerLocal:
         progress: ProgressIndicator,
         printer: Printer,
         ctx: Context,
+        ssh_session_pool: Optional[SSHSessionPool] = None,
+        ssh_prober: Optional[SSHReadinessProber] = None,
+        ssh_connection_settings: Optional[AnsibleSSHConnectionSettings] = None,
+        max_concurrent_runs: Optional[int] = None,
+        fact_cache_settings: Optional[AnsibleFactCacheSettings] = None,
+        convergence_ledger: Optional[AnsibleConvergenceLedger] = None,
+        local_executor: Optional[AnsibleLocalExecutor] = None,
+        ansible_worker: Optional[AnsibleWorker] = None,
     ) -> None:
 
         self._io_utils = io_utils
@@ -237,42 +440,138 @@ class AnsibleRunnerLocal:
         self._printer = printer
         self._dry_run = ctx.is_dry_run()
         self._verbose = ctx.is_verbose()
+        self._timings = ctx.is_timings()
+        self._ignore_ledger = ctx.is_ignore_ledger()
         self._os_arch = ctx.os_arch
+        self._ssh_session_pool = ssh_session_pool if ssh_session_pool else SSHSessionPool.create()
+        self._ssh_prober = ssh_prober if ssh_prober else SSHReadinessProber.create(session_pool=self._ssh_session_pool)
+        self._ssh_connection_settings = (
+            ssh_connection_settings if ssh_connection_settings else AnsibleSSHConnectionSettings.from_env()
+        )
+        self._fact_cache_settings = fact_cache_settings if fact_cache_settings else AnsibleFactCacheSettings.from_env()
+        self._use_package_resources = os.environ.get(ENV_ANSIBLE_USE_PACKAGE_RESOURCES, "").lower() in (
+            "true",
+            "1",
+            "yes",
+        )
+        self._max_concurrent_runs = (
+            max_concurrent_runs
+            if max_concurrent_runs
+            else _get_env_int_value(ENV_ANSIBLE_MAX_CONCURRENT_RUNS, ANSIBLE_DEFAULT_MAX_CONCURRENT_RUNS)
+        )
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._staging_lock = threading.Lock()
+        self._convergence_ledger = convergence_ledger if convergence_ledger else AnsibleConvergenceLedger.create()
+        self._roles_hashes: Dict[str, str] = {}
+        self._local_executor = local_executor if local_executor else AnsibleLocalExecutor.create(self._verbose)
+        # Opt-in, local only playbooks run through ansible-playbook unless the local executor is selected
+        self._use_local_executor = os.environ.get(ENV_ANSIBLE_LOCAL_EXECUTOR, "").lower() in ("true", "1", "yes")
+        self._ansible_worker = ansible_worker
+        if self._ansible_worker is None and os.environ.get(ENV_ANSIBLE_WORKER, "").lower() in ("true", "1", "yes"):
+            self._ansible_worker = AnsibleWorker.create()
+            atexit.register(self._ansible_worker.close_fn)
 
     @staticmethod
     def create(
-        ctx: Context, io_utils: IOUtils, paths: Paths, process: Process, progress: ProgressIndicator, printer: Printer
+        ctx: Context,
+        io_utils: IOUtils,
+        paths: Paths,
+        process: Process,
+        progress: ProgressIndicator,
+        printer: Printer,
+        ssh_session_pool: Optional[SSHSessionPool] = None,
     ) -> "AnsibleRunnerLocal":
 
         logger.debug(f"Creating Ansible runner (dry_run: {ctx.is_dry_run()}, verbose: {ctx.is_verbose()})...")
-        return AnsibleRunnerLocal(io_utils, paths, process, progress, printer, ctx)
-
-    def _prepare_ansible_host_items(self, ansible_hosts: List[AnsibleHost]) -> List[str]:
-        result = []
+        return AnsibleRunnerLocal(io_utils, paths, process, progress, printer, ctx, ssh_session_pool)
 
-        if self._dry_run and len(ansible_hosts) == 0:
-            return result
+    def _get_ssh_session_pool(self) -> SSHSessionPool:
+        """
+        SSH sessions opened by the readiness check, reusable for remote commands and file staging.
+        """
+        return self._ssh_session_pool
 
+    def _validate_ansible_hosts(self, ansible_hosts: List[AnsibleHost]) -> None:
         for host in ansible_hosts:
             if not host.host or not host.ip_address and not self._dry_run:
                 err_msg = f"Ansible selected host is missing manadatory arguments. host: {host.host}, ip: {host.ip_address}, port: {host.port}"
                 logger.error(err_msg)
                 raise InvalidAnsibleHostPair(err_msg)
 
-            # Do not append 'ansible_host=' prefix for local connection
+    def _prepare_ansible_inventory(self, ansible_hosts: List[AnsibleHost]) -> AnsibleInventory:
+        inventory = AnsibleInventory.create(all_vars={"ansible_connection": "ssh"})
+
+        if self._dry_run and len(ansible_hosts) == 0:
+            return inventory
+
+        self._validate_ansible_hosts(ansible_hosts)
+        for host in ansible_hosts:
+            # Local connection hosts carry no SSH connection variables
             if ANSIBLE_LOCAL_CONNECTION in host.ip_address:
-                result.append(f"{host.host} {host.ip_address}")
-            else:
-                host_entry = f"{host.host} ansible_host={host.ip_address} ansible_user={host.username} ansible_port={host.port} ansible_ssh_common_args='-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null'"
-                if host.password:
-                    # k8s-master ansible_host=1.1.1.1 ansible_user=user1 ansible_password=password1
-                    host_entry += f" ansible_password={host.password}"
-                if host.ssh_private_key_file_path:
-                    # k8s-node1 ansible_host=1.1.1.2 ansible_user=user2 ansible_private_key_file=~/.ssh/rsa_key
-                    host_entry += f" ansible_private_key_file={host.ssh_private_key_file_path}"
-                result.append(host_entry)
+                inventory.add_host_fn(host.host, {"ansible_connection": "local"}, host.groups)
+                continue
+
+            host_vars = {
+                "ansible_host": host.ip_address,
+                "ansible_user": host.username,
+                "ansible_port": host.port,
+                "ansible_ssh_common_args": self._ssh_session_pool.get_ansible_ssh_common_args_fn(host),
+            }
+            if host.ssh_private_key_file_path:
+                host_vars["ansible_private_key_file"] = host.ssh_private_key_file_path
+            # Passwords are kept out of the inventory file, in an owner only readable host_vars file
+            secret_vars = {"ansible_password": host.password} if host.password else None
+            inventory.add_host_fn(host.host, host_vars, host.groups, secret_vars)
+
+        return inventory
+
+    def _stage_ansible_resources(self) -> dict:
+        """
+        Make the packaged ansible.cfg and callback plugins available to ansible-playbook.
+        Returns environment variables overriding the default staged resources locations, if any.
+
+        Resources are copied to ~/.config/provisioner/ansible only when their content hash differs from
+        the last staged one. Alternatively, Ansible can be pointed at the installed package directories
+        which requires no writes at all.
+        """
+        if self._dry_run:
+            return {}
+
+        # Concurrent runs share the staged resources, only one of them copies
+        with self._staging_lock:
+            return self._stage_ansible_resources_unlocked()
+
+    def _stage_ansible_resources_unlocked(self) -> dict:
+        ansible_cfg_src_filepath = self._paths.get_file_path_from_python_package(
+            ANSIBLE_CFG_PYTHON_PACKAGE, ANSIBLE_CFG_FILE_NAME
+        )
+        callbacks_src_dir = str(
+            self._paths.get_dir_path_from_python_package(ANSIBLE_CFG_PYTHON_PACKAGE, ANSIBLE_CALLBACK_PLUGINS_DIR_NAME)
+        )
+        if self._use_package_resources:
+            logger.debug(f"Using packaged ansible resources. config: {ansible_cfg_src_filepath}")
+            return {"ANSIBLE_CONFIG": ansible_cfg_src_filepath, "ANSIBLE_CALLBACK_PLUGINS": callbacks_src_dir}
+
+        resources_hash = _hash_paths([ansible_cfg_src_filepath, callbacks_src_dir])
+        stamp_filepath = f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_RESOURCES_STAMP_FILE_NAME}"
+        staged_paths = [
+            f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_CFG_FILE_NAME}",
+            f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_CALLBACK_PLUGINS_DIR_NAME}",
+        ]
+        if self._io_utils.read_file_safe_fn(stamp_filepath) == resources_hash and all(
+            os.path.exists(path) for path in staged_paths
+        ):
+            logger.debug(f"Staged ansible resources are up to date. hash: {resources_hash}")
+            return {}
 
-        return result
+        self._create_ansible_config_file()
+        self._create_ansible_callback_plugins_folder()
+        # Stamped last, an interrupted staging is repeated on the next run
+        self._io_utils.write_file_safe_fn(
+            content=resources_hash, file_name=ANSIBLE_RESOURCES_STAMP_FILE_NAME, dir_path=ProvisionerAnsibleProjectPath
+        )
+        return {}
 
     def _create_ansible_config_file(self):
         # Copy config file to ~/.config/provisioner/ansible/ansible.cfg
@@ -295,14 +594,56 @@ class AnsibleRunnerLocal:
         self._io_utils.copy_directory_fn(from_path=callbacks_src_dir, to_path=callbacks_dest_dir)
         logger.debug(f"Copied ansible callback plugins. source: {callbacks_src_dir}, dest: {callbacks_dest_dir}")
 
-    def _create_inventory_hosts_file(self, selected_hosts: List[AnsibleHost]) -> str:
-        ansible_hosts_list = self._prepare_ansible_host_items(selected_hosts)
-        hosts_list = "\n".join(ansible_hosts_list)
-        inventory = INVENTORY_FORMAT.format(hosts_list)
-        hosts_file_path = self._io_utils.write_file_safe_fn(
-            content=inventory, file_name=ANSIBLE_HOSTS_FILE_NAME, dir_path=ProvisionerAnsibleProjectPath
-        )
-        logger.debug(f"Created ansible hosts file. path: {hosts_file_path}")
+    def _create_control_path_dir(self) -> str:
+        # A directory per run, concurrent runs never share or clean up each other multiplexed SSH sockets
+        control_path_root = f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_CONTROL_PATH_DIR_NAME}"
+        os.makedirs(control_path_root, mode=0o700, exist_ok=True)
+        control_path_dir = tempfile.mkdtemp(prefix="run-", dir=control_path_root)
+        logger.debug(f"Created ansible SSH control path directory. path: {control_path_dir}")
+        return control_path_dir
+
+    def _remove_control_path_dir(self, control_path_dir: str) -> None:
+        # Control masters left behind exit by themselves once their ControlPersist idle time elapses
+        shutil.rmtree(control_path_dir, ignore_errors=True)
+
+    def _get_timings_file_path(self, playbook_name: str, workspace_dir: str) -> str:
+        if self._timings:
+            # Kept for later inspection, the last run of every playbook overrides its previous timings
+            timings_dir = f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_TIMINGS_DIR_NAME}"
+            os.makedirs(timings_dir, exist_ok=True)
+            return f"{timings_dir}/{playbook_name}.json"
+        # Removed along with the run workspace
+        return f"{workspace_dir}/timings.json"
+
+    def _print_timings(self, timings: AnsibleTimingsReport) -> None:
+        if self._timings:
+            self._printer.print_fn(f"\n{timings.format_slowest(ANSIBLE_TIMINGS_TOP_TASKS)}")
+
+    def _create_run_workspace(self) -> str:
+        """
+        Private data directory of a single run holding its inventory, playbook, artifacts and timings,
+        concurrent runs never overwrite each other files.
+        """
+        if self._dry_run:
+            return ProvisionerAnsibleProjectPath
+        runs_root = f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_RUNS_DIR_NAME}"
+        os.makedirs(runs_root, mode=0o700, exist_ok=True)
+        workspace_dir = tempfile.mkdtemp(prefix="run-", dir=runs_root)
+        logger.debug(f"Created ansible run workspace. path: {workspace_dir}")
+        return workspace_dir
+
+    def _remove_run_workspace(self, workspace_dir: str) -> None:
+        # The inventory might contain host passwords, nothing is left behind once the run completes
+        if self._dry_run:
+            return
+        shutil.rmtree(workspace_dir, ignore_errors=True)
+
+    def _create_inventory_hosts_file(self, selected_hosts: List[AnsibleHost], workspace_dir: str) -> str:
+        inventory = self._prepare_ansible_inventory(selected_hosts)
+        if self._dry_run:
+            # Dry run does not write files, the command refers to the workspace inventory path
+            return f"{workspace_dir}/{ANSIBLE_HOSTS_FILE_NAME}"
+        return inventory.write_fn(dir_path=workspace_dir, file_name=ANSIBLE_HOSTS_FILE_NAME)
 
     def _generate_ansible_playbook_args(
         self,
@@ -310,11 +651,18 @@ class AnsibleRunnerLocal:
         ansible_vars: Optional[List[str]] = None,
         ansible_tags: Optional[List[str]] = None,
         is_dry_run: Optional[bool] = False,
+        forks: Optional[int] = None,
+        inventory_file_path: Optional[str] = None,
+        flush_cache: Optional[bool] = False,
     ) -> List[str]:
 
         cmdline_args = [
             "-i",
-            f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_HOSTS_FILE_NAME}",
+            (
+                inventory_file_path
+                if inventory_file_path
+                else f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_HOSTS_FILE_NAME}"
+            ),
             playbook_file_path,
             # "-e",
             # f"ansible_python_interpreter=auto",
@@ -339,6 +687,13 @@ class AnsibleRunnerLocal:
 
         cmdline_args += ["--tags"] + [tags_str]
 
+        if forks:
+            cmdline_args += ["--forks", str(forks)]
+
+        if flush_cache:
+            # Cached facts of the inventory hosts are dropped, facts are gathered again
+            cmdline_args += ["--flush-cache"]
+
         if self._verbose:
             # cmdline_args += ["-vvvv"]
             cmdline_args += ["-v"]
@@ -347,13 +702,36 @@ class AnsibleRunnerLocal:
         #         cmdline_args += ['-b', '-c', 'paramiko', '--ask-pass']
         return cmdline_args
 
-    def _create_playbook_file(self, name: str, content: str) -> str:
-        playbooks_dest_dir = self._io_utils.create_directory_fn(
-            f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_PLAYBOOKS_DIR_NAME}"
-        )
+    def _create_playbook_file(self, name: str, content: str, workspace_dir: str) -> str:
+        playbooks_dest_dir = self._io_utils.create_directory_fn(f"{workspace_dir}/{ANSIBLE_PLAYBOOKS_DIR_NAME}")
         logger.debug(f"Created playbook file. path: {playbooks_dest_dir}\n{content}")
         return self._io_utils.write_file_safe_fn(content=content, file_name=name, dir_path=playbooks_dest_dir)
 
+    def _get_forks(self, playbook: AnsiblePlaybook, selected_hosts: List[AnsibleHost]) -> Optional[int]:
+        remote_context = playbook.get_remote_context()
+        if remote_context is not None and remote_context.get_forks():
+            return remote_context.get_forks()
+        # Larger fleets run every host in parallel rather than in waves of the default forks
+        if len(selected_hosts) > ANSIBLE_DEFAULT_FORKS:
+            return min(len(selected_hosts), ANSIBLE_MAX_AUTO_FORKS)
+        return None
+
+    def _get_fact_cache_dir(self, selected_hosts: List[AnsibleHost]) -> str:
+        hosts_key = "\n".join(sorted(f"{host.host}={host.ip_address}:{host.port}" for host in selected_hosts))
+        digest = hashlib.sha256(hosts_key.encode("utf-8")).hexdigest()[:16]
+        return f"{ProvisionerAnsibleProjectPath}/{ANSIBLE_FACT_CACHE_DIR_NAME}/{digest}"
+
+    def _is_refresh_facts(self, playbook: AnsiblePlaybook) -> bool:
+        remote_context = playbook.get_remote_context()
+        return remote_context is not None and remote_context.is_refresh_facts() is True
+
+    def _get_strategy_env_vars(self, playbook: AnsiblePlaybook) -> dict:
+        # Applies to every play of the playbook which does not set a strategy explicitly
+        remote_context = playbook.get_remote_context()
+        if remote_context is not None and remote_context.get_strategy():
+            return {"ANSIBLE_STRATEGY": remote_context.get_strategy()}
+        return {}
+
     def _clear_sensitive_data_from_args(self, ansible_args: Optional[List[str]] = None) -> str:
         if not ansible_args or len(ansible_args) == 0:
             return ansible_args
@@ -380,7 +758,27 @@ class AnsibleRunnerLocal:
         ansible_vars: Optional[List[str]] = None,
         ansible_tags: Optional[List[str]] = None,
         ansible_playbook_package: Optional[str] = ANSIBLE_PLAYBOOKS_PYTHON_PACKAGE,
+        incremental: Optional[bool] = False,
     ) -> str:
+        return self._run_with_result(
+            selected_hosts, playbook, ansible_vars, ansible_tags, ansible_playbook_package, incremental
+        ).output
+
+    def _run_with_result(
+        self,
+        selected_hosts: List[AnsibleHost],
+        playbook: AnsiblePlaybook,
+        ansible_vars: Optional[List[str]] = None,
+        ansible_tags: Optional[List[str]] = None,
+        ansible_playbook_package: Optional[str] = ANSIBLE_PLAYBOOKS_PYTHON_PACKAGE,
+        incremental: Optional[bool] = False,
+    ) -> AnsibleRunResult:
+        """
+        Run a playbook and return its output along with the per host task results and timings.
+
+        On incremental runs, hosts the same playbook content and variables were already successfully
+        applied to are skipped unless the ignore ledger modifier is used, hosts that succeed are recorded.
+        """
 
         # Problem:
         # To use ansible-playground with host entry that uses ansible_password=secret
@@ -401,47 +799,254 @@ class AnsibleRunnerLocal:
         # as it relies on less cross language dependancies that has to be separately managed;
         # Thus this essentially by-passes the need for another library installed
         # on the host machine : sshpass.
-        self._create_ansible_config_file()
-        self._create_ansible_callback_plugins_folder()
-        self._create_inventory_hosts_file(selected_hosts)
-        self._check_ssh_conn_on_hosts(ansible_hosts=selected_hosts)
+        self._validate_ansible_hosts(selected_hosts)
 
-        playbook_content_escaped = playbook.get_content(self._paths, ansible_playbook_package, self._dry_run)
-        playbook_file_path = self._create_playbook_file(name=playbook.get_name(), content=playbook_content_escaped)
-        ansible_playbook_args: List[str] = self._generate_ansible_playbook_args(
-            playbook_file_path, ansible_vars, ansible_tags, playbook.is_remote_run_as_dry_run()
-        )
-        ansible_playbook_args_reducted = self._clear_sensitive_data_from_args(ansible_playbook_args)
-        logger.debug(f"About to run command:\nansible-playbook {' '.join(map(str, ansible_playbook_args_reducted))}")
-        # logger.debug(f"About to run command:\nansible-playbook {' '.join(map(str, ansible_playbook_args))}")
+        convergence_key = None
+        if incremental and not self._dry_run and not playbook.is_remote_run_as_dry_run():
+            convergence_key = self._get_convergence_key(playbook, ansible_vars, ansible_tags, ansible_playbook_package)
+            selected_hosts = self._filter_converged_hosts(selected_hosts, playbook, convergence_key)
+            if len(selected_hosts) == 0:
+                return AnsibleRunResult(f"All selected hosts are already converged. playbook: {playbook.get_name()}")
 
-        if self._dry_run:
-            return f"name: {playbook.get_name()}\ncontent:\n{playbook_content_escaped}\ncommand:\nansible-playbook {' '.join(map(str, ansible_playbook_args_reducted))}"
-
-        file_descriptors = self.prepare_file_descriptors(self._verbose)
-        out, err, rc = self._run_and_capture_ansible_output(
-            file_descriptors,
-            lambda: ansible_runner.run_command(
-                private_data_dir=ProvisionerAnsibleProjectPath,
-                executable_cmd="ansible-playbook",
-                cmdline_args=ansible_playbook_args,
-                runner_mode="subprocess",
-                envvars=ENV_VARS,
-                quiet=False,
-                # input_fd=sys.stdin,
-                output_fd=file_descriptors.stdout_fd,
-                error_fd=file_descriptors.stderr_fd,
-            ),
+        local_plan = self._get_local_plan(
+            selected_hosts, playbook, ansible_vars, ansible_tags, ansible_playbook_package
         )
+        if local_plan:
+            return self._run_locally(local_plan, selected_hosts, playbook, convergence_key)
+
+        resources_env_vars = self._stage_ansible_resources()
+        # SSH readiness opens the pooled sessions the inventory might point Ansible to
+        self._check_ssh_conn_on_hosts(ansible_hosts=selected_hosts)
+
+        workspace_dir = self._create_run_workspace()
+        control_path_dir = None
+        try:
+            inventory_file_path = self._create_inventory_hosts_file(selected_hosts, workspace_dir)
+            playbook_content_escaped = playbook.get_content(self._paths, ansible_playbook_package, self._dry_run)
+            playbook_file_path = self._create_playbook_file(
+                name=playbook.get_name(), content=playbook_content_escaped, workspace_dir=workspace_dir
+            )
+            ansible_playbook_args: List[str] = self._generate_ansible_playbook_args(
+                playbook_file_path,
+                ansible_vars,
+                ansible_tags,
+                playbook.is_remote_run_as_dry_run(),
+                self._get_forks(playbook, selected_hosts),
+                inventory_file_path,
+                self._is_refresh_facts(playbook),
+            )
+            ansible_playbook_args_reducted = self._clear_sensitive_data_from_args(ansible_playbook_args)
+            logger.debug(
+                f"About to run command:\nansible-playbook {' '.join(map(str, ansible_playbook_args_reducted))}"
+            )
+            # logger.debug(f"About to run command:\nansible-playbook {' '.join(map(str, ansible_playbook_args))}")
+
+            if self._dry_run:
+                return AnsibleRunResult(
+                    f"name: {playbook.get_name()}\ncontent:\n{playbook_content_escaped}\ncommand:\nansible-playbook {' '.join(map(str, ansible_playbook_args_reducted))}"
+                )
+
+            control_path_dir = self._create_control_path_dir()
+            timings_file_path = self._get_timings_file_path(playbook.get_name(), workspace_dir)
+            envvars = {
+                **ENV_VARS,
+                **resources_env_vars,
+                **self._ssh_connection_settings.to_env_vars(control_path_dir),
+                **self._get_strategy_env_vars(playbook),
+                **self._fact_cache_settings.to_env_vars(),
+                ENV_ANSIBLE_TIMINGS_FILE: timings_file_path,
+            }
+            event_stream = AnsibleEventStream.create(self._verbose, self.extract_ansible_msg_content)
+            rc = self._run_and_capture_ansible_output(
+                lambda: init_command_config(
+                    executable_cmd="ansible-playbook",
+                    cmdline_args=ansible_playbook_args,
+                    private_data_dir=workspace_dir,
+                    envvars=envvars,
+                    # Output is consumed from the event stream only, not echoed nor written to the artifacts folder
+                    quiet=True,
+                    settings={"suppress_output_file": True},
+                    # Facts are otherwise cached in the run artifacts folder, removed with the run workspace
+                    fact_cache=self._get_fact_cache_dir(selected_hosts) if self._fact_cache_settings.enabled else None,
+                    event_handler=event_stream.on_event_fn,
+                    status_handler=event_stream.on_status_fn,
+                ),
+            )
+            timings = AnsibleTimingsReport.from_file(timings_file_path)
+        finally:
+            if control_path_dir:
+                self._remove_control_path_dir(control_path_dir)
+            self._remove_run_workspace(workspace_dir)
+
+        self._print_timings(timings)
+
+        if convergence_key:
+            # Hosts that completed successfully are recorded even if others failed
+            self._convergence_ledger.record_converged_fn(
+                self._get_converged_hosts(selected_hosts, event_stream.get_host_results_fn()),
+                playbook.get_name(),
+                *convergence_key,
+            )
 
         # Handle non-zero return codes
         if rc != 0:
-            self.handle_failure_exit_code(out, err)
+            # ansible-runner runs the playbook in a pseudo terminal, stderr is part of the event stream output
+            self.handle_failure_exit_code(event_stream.get_output_tail_fn(), "")
 
-        if self._verbose:
-            return str(out)
-        else:
-            return self.extract_ansible_msg_content(out)
+        return AnsibleRunResult(event_stream.get_output_fn(), event_stream.get_host_results_fn(), timings)
+
+    def _submit(
+        self,
+        selected_hosts: List[AnsibleHost],
+        playbook: AnsiblePlaybook,
+        ansible_vars: Optional[List[str]] = None,
+        ansible_tags: Optional[List[str]] = None,
+        ansible_playbook_package: Optional[str] = ANSIBLE_PLAYBOOKS_PYTHON_PACKAGE,
+        incremental: Optional[bool] = False,
+    ) -> "Future[AnsibleRunResult]":
+        """
+        Run a playbook in the background, at most max_concurrent_runs playbooks run at the same time.
+        Every run uses its own workspace, failures are raised when calling result() on the returned future.
+        """
+        return self._get_executor().submit(
+            self._run_with_result,
+            selected_hosts,
+            playbook,
+            ansible_vars,
+            ansible_tags,
+            ansible_playbook_package,
+            incremental,
+        )
+
+    def _submit_all(self, run_requests: List[AnsibleRunRequest]) -> List["Future[AnsibleRunResult]"]:
+        """
+        Run independent playbooks concurrently, futures are returned in the order of the run requests.
+        """
+        return [
+            self._submit(
+                request.selected_hosts,
+                request.playbook,
+                request.ansible_vars,
+                request.ansible_tags,
+                request.ansible_playbook_package,
+                request.incremental,
+            )
+            for request in run_requests
+        ]
+
+    def _get_local_plan(
+        self,
+        selected_hosts: List[AnsibleHost],
+        playbook: AnsiblePlaybook,
+        ansible_vars: Optional[List[str]],
+        ansible_tags: Optional[List[str]],
+        ansible_playbook_package: str,
+    ) -> Optional[AnsibleLocalPlan]:
+        """
+        Local executor plan when every selected host is a local connection host and the playbook only
+        uses what the local executor supports, None when ansible-playbook is required.
+        """
+        if not self._use_local_executor or self._dry_run or len(selected_hosts) == 0:
+            return None
+        if any(host.ip_address != ANSIBLE_LOCAL_CONNECTION for host in selected_hosts):
+            return None
+
+        # Same extra variables and tags ansible-playbook would have been called with
+        local_vars = [
+            f"local_bin_folder='{REMOTE_MACHINE_LOCAL_BIN_FOLDER}'",
+            f"dry_run={playbook.is_remote_run_as_dry_run()}",
+        ] + (ansible_vars or [])
+        local_tags = (ansible_tags or []) + ([self._os_arch.os] if self._os_arch else [])
+        return self._local_executor.create_plan_fn(
+            playbook.get_content(self._paths, ansible_playbook_package, self._dry_run), local_vars, local_tags
+        )
+
+    def _run_locally(
+        self,
+        local_plan: AnsibleLocalPlan,
+        selected_hosts: List[AnsibleHost],
+        playbook: AnsiblePlaybook,
+        convergence_key: Optional[Tuple[str, str]],
+    ) -> AnsibleRunResult:
+        logger.debug(f"Running playbook with the local executor. name: {playbook.get_name()}")
+        result = self._local_executor.run_fn(local_plan, [host.host for host in selected_hosts], playbook.get_name())
+        if self._timings:
+            timings_file_path = self._get_timings_file_path(playbook.get_name(), workspace_dir=None)
+            with open(timings_file_path, "w") as f:
+                json.dump(result.timings.to_dict(), f)
+        self._print_timings(result.timings)
+
+        if convergence_key:
+            self._convergence_ledger.record_converged_fn(
+                self._get_converged_hosts(selected_hosts, result.host_results), playbook.get_name(), *convergence_key
+            )
+
+        if result.error is not None:
+            raise AnsiblePlaybookRunnerException(result.error)
+        return AnsibleRunResult(result.output, result.host_results, result.timings)
+
+    def _get_convergence_key(
+        self,
+        playbook: AnsiblePlaybook,
+        ansible_vars: Optional[List[str]],
+        ansible_tags: Optional[List[str]],
+        ansible_playbook_package: str,
+    ) -> Tuple[str, str]:
+        """
+        Playbook and roles content hash, Ansible variables and tags hash.
+        """
+        content_digest = hashlib.sha256(
+            playbook.get_content(self._paths, ansible_playbook_package, self._dry_run).encode("utf-8")
+        )
+        roles_path = playbook.get_roles_path(self._paths, ansible_playbook_package)
+        if roles_path:
+            # Roles do not change while the process runs, every roles folder is hashed once
+            if roles_path not in self._roles_hashes:
+                self._roles_hashes[roles_path] = _hash_paths([roles_path])
+            content_digest.update(self._roles_hashes[roles_path].encode("utf-8"))
+
+        vars_content = json.dumps(
+            {"vars": ansible_vars or [], "tags": ansible_tags or [], "os": self._os_arch.os if self._os_arch else None}
+        )
+        return content_digest.hexdigest(), hashlib.sha256(vars_content.encode("utf-8")).hexdigest()
+
+    def _filter_converged_hosts(
+        self, selected_hosts: List[AnsibleHost], playbook: AnsiblePlaybook, convergence_key: Tuple[str, str]
+    ) -> List[AnsibleHost]:
+        if self._ignore_ledger:
+            logger.debug("Ignore ledger modifier is enabled, running on all selected hosts")
+            return selected_hosts
+
+        stale_hosts = self._convergence_ledger.filter_stale_hosts_fn(
+            selected_hosts, playbook.get_name(), *convergence_key
+        )
+        skipped_count = len(selected_hosts) - len(stale_hosts)
+        if skipped_count > 0:
+            self._printer.print_fn(
+                f"Skipping already converged hosts, use --ignore-ledger to run on all hosts. (skipped: {skipped_count}, remaining: {len(stale_hosts)})"
+            )
+        return stale_hosts
+
+    def _get_converged_hosts(
+        self, selected_hosts: List[AnsibleHost], host_results: List[AnsibleHostTaskResult]
+    ) -> List[AnsibleHost]:
+        statuses: Dict[str, set] = {}
+        for result in host_results:
+            statuses.setdefault(result.host, set()).add(result.status)
+        return [
+            host
+            for host in selected_hosts
+            if host.host in statuses and not statuses[host.host] & {"failed", "unreachable"}
+        ]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                logger.debug(f"Creating ansible runs executor (max_concurrent_runs: {self._max_concurrent_runs})...")
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_concurrent_runs, thread_name_prefix="ansible-run"
+                )
+            return self._executor
 
     def handle_failure_exit_code(self, out: str, err: str) -> None:
         message = err if err else out
@@ -463,95 +1068,22 @@ class AnsibleRunnerLocal:
                 message = self._try_extract_stderr_message(message)
             raise AnsiblePlaybookRunnerException(message)
 
-    def _run_and_capture_ansible_output(
-        self, file_descriptors: AnsibleStdFileDescriptors, ansible_runner_call: Callable[..., tuple[str, str, int]]
-    ) -> tuple[str, str, int]:
-        out = ""
-        err = ""
+    def _run_and_capture_ansible_output(self, create_ansible_runner: Callable[[], Runner]) -> int:
+        """
+        Run ansible-playbook and return its return code, output is consumed by the runner event handler
+        as it is emitted, with no polling and without reading the full output back into memory.
+        """
         rc = 0
-
         try:
-            # Return tuple (out, err, rc), we ignore out and err
-            # and use the file descriptors to read the output
-            _, _, rc = ansible_runner_call()
-
-            # Signal that ansible has completed
-            file_descriptors.ansible_done.set()
-
-            # Wait for reader thread to finish
-            file_descriptors.reader_thread.join(timeout=2)
-
-            # Read the full output for return values
-            with open(file_descriptors.stdout_path, "r") as f:
-                out = f.read()
-            with open(file_descriptors.stderr_path, "r") as f:
-                err = f.read()
-
+            runner = create_ansible_runner()
+            # The worker returns nothing when busy or unavailable, ansible-playbook is spawned instead
+            worker_result = self._ansible_worker.run_fn(runner) if self._ansible_worker else None
+            status, rc = worker_result if worker_result else runner.run()
+            logger.debug(f"Ansible run completed. status: {status}, rc: {rc}")
         except Exception as e:
             logger.error(f"Error running ansible-playbook: {e}")
 
-        finally:
-            # Close file descriptors
-            file_descriptors.stdout_fd.close()
-            file_descriptors.stderr_fd.close()
-
-            # Clean up temp files
-            try:
-                os.unlink(file_descriptors.stdout_path)
-                os.unlink(file_descriptors.stderr_path)
-            except Exception as e:
-                logger.error(f"Error cleaning up temp files: {e}")
-
-        return out, err, rc
-
-    def prepare_file_descriptors(self, is_verbose: bool) -> AnsibleStdFileDescriptors:
-        # Create temp files for stdout and stderr
-        stdout_file = tempfile.NamedTemporaryFile(mode="w+", delete=False)
-        stderr_file = tempfile.NamedTemporaryFile(mode="w+", delete=False)
-
-        stdout_path = stdout_file.name
-        stderr_path = stderr_file.name
-
-        # Close the file objects so ansible_runner can open them for writing
-        stdout_file.close()
-        stderr_file.close()
-
-        # Create file objects for ansible_runner
-        stdout_fd = open(stdout_path, "w")
-        stderr_fd = open(stderr_path, "w")
-
-        # Thread function to read and filter task names
-        def read_and_filter(file_path):
-            with open(file_path, "r") as f:
-                # Go to end of file
-                f.seek(0, os.SEEK_END)
-
-                while True:
-                    line = f.readline()
-                    if not line:
-                        # If ansible_runner process has completed, exit
-                        if ansible_done.is_set():
-                            break
-                        # Otherwise wait for more content
-                        time.sleep(0.1)
-                        continue
-
-                    # Extract task names
-                    task_match = re.search(r"TASK \[.*?: (.*?)\]", line)
-                    if task_match:
-                        task_name = task_match.group(1)
-                        if task_name != "debug":
-                            print(f"Running task: {task_name}")
-
-        # Flag to signal when ansible has completed
-        ansible_done = threading.Event()
-
-        # Start reader thread
-        reader_thread = threading.Thread(target=read_and_filter, args=(stdout_path,))
-        reader_thread.daemon = True
-        reader_thread.start()
-
-        return AnsibleStdFileDescriptors(stdout_fd, stderr_fd, stdout_path, stderr_path, ansible_done, reader_thread)
+        return rc
 
     def is_password_was_used_in_hosts(self, selected_hosts: List[AnsibleHost]) -> bool:
         for selected_host in selected_hosts:
@@ -560,13 +1092,18 @@ class AnsibleRunnerLocal:
         return False
 
     def _try_extract_stderr_message(self, ansible_run_output: str) -> str:
-        match = re.search(r"stderr: \|-\s+(.*?)\s+stderr_lines:", ansible_run_output, re.DOTALL)
-        extracted_text = ansible_run_output
-        if match:
-            extracted_text = match.group(1)
-        else:
-            logger.debug("Could not find Ansible stderr in playbook output")
-        return extracted_text
+        """
+        First stderr block of the output, falls back to the failed task blocks and then to the whole output.
+        """
+        parser = AnsibleOutputParser.create().feed_fn(ansible_run_output).flush_fn()
+        stderr_blocks = parser.get_stderr_blocks_fn()
+        if stderr_blocks:
+            return stderr_blocks[0]
+        logger.debug("Could not find Ansible stderr in playbook output")
+        failures = parser.get_failures_fn()
+        if failures:
+            return "\n".join(failures)
+        return ansible_run_output
 
     def extract_ansible_msg_content(self, ansible_output: str) -> str:
         """
@@ -580,65 +1117,38 @@ class AnsibleRunnerLocal:
         """
         if not ansible_output:
             return ""
-
-        # Pattern to match 'msg:' content blocks
-        pattern = r"(?:^|\n)\s*msg: (?:\|-|\|2-)?\s*\n(.*?)(?=\n\s*(?:TASK|PLAY|RUNNING|ok:|changed:|fatal:|skipped:|failed:)|\Z)"
-
-        # Find all matches in the text
-        matches = re.finditer(pattern, ansible_output, re.DOTALL | re.MULTILINE)
-
-        # Extract and clean up each match
-        extracted_messages = []
-        for match in matches:
-            # Process each line to forcibly remove ALL leading spaces
-            lines = match.group(1).splitlines()
-            cleaned_lines = []
-
-            for line in lines:
-                # Strip all leading spaces for every line
-                cleaned_lines.append(line.lstrip())
-
-            # Join back and add to results
-            extracted_messages.append("\n".join(cleaned_lines).strip())
-
-        return "\n".join(extracted_messages)
+        return "\n".join(AnsibleOutputParser.create().feed_fn(ansible_output).flush_fn().get_messages_fn())
 
     def _check_ssh_conn_on_hosts(self, ansible_hosts: List[AnsibleHost]) -> None:
+        """Ensure SSH is ready on all remote hosts before proceeding, hosts are probed concurrently."""
         if self._dry_run:
             return
 
-        for selected_host in ansible_hosts:
-            if selected_host.ip_address == ANSIBLE_LOCAL_CONNECTION:
-                continue
-            self._wait_for_ssh(selected_host)
-
-    def _wait_for_ssh(self, host: AnsibleHost) -> None:
-        """Ensure SSH is ready before proceeding."""
-        max_attempts = 5
-        attempt = 0
-        while attempt < max_attempts:
-            try:
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                if host.password:
-                    client.connect(host.ip_address, port=host.port, username=host.username, password=host.password)
-                else:
-                    client.connect(
-                        host.ip_address,
-                        port=host.port,
-                        username=host.username,
-                        key_filename=host.ssh_private_key_file_path,
-                    )
-                # print("✅ SSH Connection Successful")
-                self._printer.print_fn("SSH Connection Successful", LeadingIcon.CHECKMARK)
-                client.close()
-                return
-            except Exception:
-                self._printer.print_fn(f"🔄 Waiting for SSH... ({attempt + 1}/{max_attempts})")
-                time.sleep(2)
-                attempt += 1
-        raise AnsibleRunnerNoHostSSHAccessException(
-            f"❌ No SSH access to host. name: {host.host}, ip: {host.ip_address}, port: {host.port}"
-        )
+        remote_hosts = [host for host in ansible_hosts if host.ip_address != ANSIBLE_LOCAL_CONNECTION]
+        if len(remote_hosts) == 0:
+            return
+
+        self._printer.print_fn(f"🔄 Waiting for SSH... (hosts: {len(remote_hosts)})")
+        try:
+            report = self._ssh_prober.probe_hosts_fn(remote_hosts)
+        finally:
+            # ansible-playbook opens its own connections, probe sessions are kept only to back control masters
+            self._ssh_session_pool.release_idle_sessions_fn()
+        for result in report.ready_hosts():
+            self._printer.print_fn(
+                f"SSH Connection Successful. name: {result.host.host}, attempts: {result.attempts}",
+                LeadingIcon.CHECKMARK,
+            )
+
+        if not report.is_all_ready():
+            unreachable = ", ".join(
+                f"(name: {result.host.host}, ip: {result.host.ip_address}, port: {result.host.port}, error: {result.error})"
+                for result in report.unreachable_hosts()
+            )
+            raise AnsibleRunnerNoHostSSHAccessException(f"❌ No SSH access to hosts. {unreachable}")
 
     run_fn = _run
+    run_with_result_fn = _run_with_result
+    submit_fn = _submit
+    submit_all_fn = _submit_all
+    get_ssh_session_pool_fn = _get_ssh_session_pool
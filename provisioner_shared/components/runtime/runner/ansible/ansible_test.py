@@ -1,15 +1,33 @@
 #!/usr/bin/env python3
 
 import os
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
 from provisioner_shared.components.runtime.errors.cli_errors import InvalidAnsibleHostPair
 from provisioner_shared.components.runtime.infra.context import Context
 from provisioner_shared.components.runtime.infra.remote_context import RemoteContext
+from provisioner_shared.components.runtime.runner.ansible.ansible_events import AnsibleHostTaskResult
+from provisioner_shared.components.runtime.runner.ansible.ansible_ledger import AnsibleConvergenceLedger
+from provisioner_shared.components.runtime.runner.ansible.ansible_local import ENV_ANSIBLE_LOCAL_EXECUTOR
 from provisioner_shared.components.runtime.runner.ansible.ansible_runner import (
+    ANSIBLE_DEFAULT_FACT_CACHE_TTL_SEC,
+    ANSIBLE_DEFAULT_MAX_CONCURRENT_RUNS,
+    ENV_ANSIBLE_CONTROL_PERSIST,
+    ENV_ANSIBLE_FACT_CACHE,
+    ENV_ANSIBLE_FACT_CACHE_TTL,
+    ENV_ANSIBLE_MAX_CONCURRENT_RUNS,
+    ENV_ANSIBLE_PIPELINING,
+    AnsibleFactCacheSettings,
     AnsibleHost,
     AnsiblePlaybook,
     AnsibleRunnerLocal,
+    AnsibleRunRequest,
+    AnsibleRunResult,
+    AnsibleSSHConnectionSettings,
 )
 from provisioner_shared.components.runtime.utils.io_utils import IOUtils
 from provisioner_shared.components.runtime.utils.os import OsArch
@@ -195,3 +213,389 @@ class AnsibleRunnerTestShould(unittest.TestCase):
                 f"ansible-playbook -i {os.path.expanduser('~/.config/provisioner/ansible/hosts')} DRY_RUN_RESPONSE -e local_bin_folder='~/.local/bin' -e dry_run=True -e {ANSIBLE_SENSITIVE_VAR_1_RESOLVED} -e {ANSIBLE_SENSITIVE_VAR_2_RESOLVED} --tags {ANSIBLE_TAG_1},{ANSIBLE_TAG_2},TEST_OS -v",
             ],
         )
+
+
+class AnsibleSSHConnectionSettingsTestShould(unittest.TestCase):
+    def test_enable_multiplexing_and_pipelining_by_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            env_vars = AnsibleSSHConnectionSettings.from_env().to_env_vars("/control/path/dir")
+        self.assertEqual(
+            env_vars,
+            {
+                "ANSIBLE_PIPELINING": "True",
+                "ANSIBLE_SSH_ARGS": "-C -o ControlMaster=auto -o ControlPersist=60s",
+                "ANSIBLE_SSH_CONTROL_PATH_DIR": "/control/path/dir",
+            },
+        )
+
+    def test_read_settings_from_env(self):
+        with mock.patch.dict(os.environ, {ENV_ANSIBLE_PIPELINING: "false", ENV_ANSIBLE_CONTROL_PERSIST: "300s"}):
+            env_vars = AnsibleSSHConnectionSettings.from_env().to_env_vars("/control/path/dir")
+        self.assertEqual(env_vars["ANSIBLE_PIPELINING"], "False")
+        self.assertIn("ControlPersist=300s", env_vars["ANSIBLE_SSH_ARGS"])
+
+    def test_control_path_dir_is_unique_per_run(self):
+        ctx = Context.create(dry_run=False, verbose=False)
+        runner = AnsibleRunnerLocal(
+            io_utils=None, paths=None, process=None, progress=None, printer=None, ctx=ctx, ssh_session_pool=mock.Mock()
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch(
+                "provisioner_shared.components.runtime.runner.ansible.ansible_runner.ProvisionerAnsibleProjectPath",
+                temp_dir,
+            ):
+                first_run_dir = runner._create_control_path_dir()
+                second_run_dir = runner._create_control_path_dir()
+            self.assertNotEqual(first_run_dir, second_run_dir)
+            self.assertEqual(os.path.dirname(first_run_dir), os.path.join(temp_dir, "cp"))
+            runner._remove_control_path_dir(first_run_dir)
+            self.assertFalse(os.path.exists(first_run_dir))
+            self.assertTrue(os.path.exists(second_run_dir))
+
+
+class AnsibleParallelExecutionTestShould(unittest.TestCase):
+    def setUp(self):
+        self.runner = AnsibleRunnerLocal(
+            io_utils=None,
+            paths=None,
+            process=None,
+            progress=None,
+            printer=None,
+            ctx=Context.create(dry_run=False, verbose=False),
+            ssh_session_pool=mock.Mock(),
+        )
+
+    def _create_playbook(self, remote_context: RemoteContext) -> AnsiblePlaybook:
+        return AnsiblePlaybook(
+            name=ANSIBLE_DUMMY_PLAYBOOK_NAME,
+            content=ANSIBLE_DUMMY_PLAYBOOK_CONTENT_WITH_REMOTE_CTX,
+            remote_context=remote_context,
+        )
+
+    def _create_hosts(self, count: int) -> list:
+        return [AnsibleHost(f"node-{index}", f"192.168.1.{index}") for index in range(count)]
+
+    def test_use_forks_from_remote_context(self):
+        playbook = self._create_playbook(RemoteContext.create(forks=3))
+        forks = self.runner._get_forks(playbook, self._create_hosts(20))
+        self.assertEqual(forks, 3)
+        args = self.runner._generate_ansible_playbook_args("playbook.yaml", forks=forks)
+        self.assertEqual(args[-2:], ["--forks", "3"])
+
+    def test_run_all_hosts_in_parallel_for_large_fleets(self):
+        playbook = self._create_playbook(RemoteContext.create())
+        self.assertIsNone(self.runner._get_forks(playbook, self._create_hosts(5)))
+        self.assertEqual(self.runner._get_forks(playbook, self._create_hosts(20)), 20)
+        self.assertEqual(self.runner._get_forks(playbook, self._create_hosts(200)), 50)
+
+    def test_add_serial_play_keyword_to_modifiers(self):
+        playbook = AnsiblePlaybook(
+            name=ANSIBLE_DUMMY_PLAYBOOK_NAME,
+            content="- hosts: selected_hosts\n  {modifiers}\n",
+            remote_context=RemoteContext.create(serial="25%"),
+        )
+        content = playbook.get_content(paths=None, ansible_playbook_package=None, dry_run=False)
+        self.assertIn('\n  serial: "25%"\n  environment:\n    TERM: xterm', content)
+
+    def test_render_placeholders_and_escaped_braces_like_str_format(self):
+        content = "- hosts: selected_hosts\n  vars:\n    path: '{{{{ playbook_dir }}}}'\n  roles:\n    - {ansible_playbooks_path}/roles/k3s\n"
+        paths = mock.Mock()
+        paths.get_dir_path_from_python_package.return_value = "/site-packages/provisioner/resources"
+        playbook = AnsiblePlaybook(ANSIBLE_DUMMY_PLAYBOOK_NAME, content)
+
+        rendered = playbook.get_content(paths, "provisioner.resources", dry_run=False)
+        self.assertEqual(
+            rendered, content.format(ansible_playbooks_path="/site-packages/provisioner/resources", modifiers="")
+        )
+        self.assertEqual(
+            playbook.get_roles_path(paths, "provisioner.resources"), "/site-packages/provisioner/resources"
+        )
+        self.assertIsNone(AnsiblePlaybook(ANSIBLE_DUMMY_PLAYBOOK_NAME, "- hosts: all\n").get_roles_path(paths, None))
+
+    def test_set_strategy_env_var_only_when_requested(self):
+        self.assertEqual(self.runner._get_strategy_env_vars(self._create_playbook(RemoteContext.create())), {})
+        self.assertEqual(
+            self.runner._get_strategy_env_vars(self._create_playbook(RemoteContext.create(strategy="free"))),
+            {"ANSIBLE_STRATEGY": "free"},
+        )
+
+
+class AnsibleFactCacheTestShould(unittest.TestCase):
+    def test_cache_facts_by_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            env_vars = AnsibleFactCacheSettings.from_env().to_env_vars()
+        self.assertEqual(env_vars, {"ANSIBLE_GATHERING": "smart", "ANSIBLE_CACHE_PLUGIN_TIMEOUT": "86400"})
+
+    def test_read_settings_from_env(self):
+        with mock.patch.dict(os.environ, {ENV_ANSIBLE_FACT_CACHE_TTL: "600"}):
+            self.assertEqual(AnsibleFactCacheSettings.from_env().to_env_vars()["ANSIBLE_CACHE_PLUGIN_TIMEOUT"], "600")
+        with mock.patch.dict(os.environ, {ENV_ANSIBLE_FACT_CACHE: "false"}):
+            self.assertEqual(AnsibleFactCacheSettings.from_env().to_env_vars(), {})
+
+    def test_fall_back_to_default_ttl_on_malformed_env_value(self):
+        with mock.patch.dict(os.environ, {ENV_ANSIBLE_FACT_CACHE_TTL: "1d"}):
+            self.assertEqual(AnsibleFactCacheSettings.from_env().ttl_sec, ANSIBLE_DEFAULT_FACT_CACHE_TTL_SEC)
+
+    def test_cache_facts_per_selected_hosts(self):
+        runner = AnsibleRunnerLocal(
+            io_utils=None,
+            paths=None,
+            process=None,
+            progress=None,
+            printer=None,
+            ctx=Context.create(dry_run=False, verbose=False),
+            ssh_session_pool=mock.Mock(),
+        )
+        master = AnsibleHost("node-1", "192.168.1.1")
+        worker = AnsibleHost("node-2", "192.168.1.2")
+        other_cluster_master = AnsibleHost("node-1", "10.0.0.1")
+
+        cluster_dir = runner._get_fact_cache_dir([master, worker])
+        self.assertEqual(cluster_dir, runner._get_fact_cache_dir([worker, master]))
+        self.assertNotEqual(cluster_dir, runner._get_fact_cache_dir([other_cluster_master, worker]))
+        self.assertEqual(os.path.dirname(cluster_dir), os.path.expanduser("~/.config/provisioner/ansible/facts"))
+
+    def test_flush_cached_facts_on_refresh(self):
+        runner = AnsibleRunnerLocal(
+            io_utils=None,
+            paths=None,
+            process=None,
+            progress=None,
+            printer=None,
+            ctx=Context.create(dry_run=False, verbose=False),
+            ssh_session_pool=mock.Mock(),
+        )
+        playbook = AnsiblePlaybook(
+            ANSIBLE_DUMMY_PLAYBOOK_NAME, ANSIBLE_DUMMY_PLAYBOOK_CONTENT, RemoteContext.create(refresh_facts=True)
+        )
+        self.assertTrue(runner._is_refresh_facts(playbook))
+        args = runner._generate_ansible_playbook_args("playbook.yaml", flush_cache=runner._is_refresh_facts(playbook))
+        self.assertEqual(args[-1], "--flush-cache")
+        self.assertFalse(runner._is_refresh_facts(ANSIBLE_DUMMY_PLAYBOOK))
+
+
+class AnsibleConcurrentRunsTestShould(unittest.TestCase):
+    def setUp(self):
+        self.runner = AnsibleRunnerLocal(
+            io_utils=None,
+            paths=None,
+            process=None,
+            progress=None,
+            printer=None,
+            ctx=Context.create(dry_run=False, verbose=False),
+            ssh_session_pool=mock.Mock(),
+            max_concurrent_runs=2,
+        )
+
+    def test_isolate_workspace_per_run(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch(
+                "provisioner_shared.components.runtime.runner.ansible.ansible_runner.ProvisionerAnsibleProjectPath",
+                temp_dir,
+            ):
+                first_workspace = self.runner._create_run_workspace()
+                second_workspace = self.runner._create_run_workspace()
+            self.assertNotEqual(first_workspace, second_workspace)
+            self.assertEqual(os.path.dirname(first_workspace), os.path.join(temp_dir, "runs"))
+            self.runner._remove_run_workspace(first_workspace)
+            self.assertFalse(os.path.exists(first_workspace))
+            self.assertTrue(os.path.exists(second_workspace))
+
+    def test_submit_runs_with_bounded_parallelism(self):
+        lock = threading.Lock()
+        running = {"current": 0, "max": 0}
+
+        def run_with_result(selected_hosts, playbook, *args):
+            with lock:
+                running["current"] += 1
+                running["max"] = max(running["max"], running["current"])
+            time.sleep(0.05)
+            with lock:
+                running["current"] -= 1
+            return AnsibleRunResult(playbook.get_name())
+
+        requests = [
+            AnsibleRunRequest(ANSIBLE_HOSTS, AnsiblePlaybook(f"cluster_{index}", ANSIBLE_DUMMY_PLAYBOOK_CONTENT))
+            for index in range(5)
+        ]
+        with mock.patch.object(self.runner, "_run_with_result", side_effect=run_with_result):
+            futures = self.runner.submit_all_fn(requests)
+            outputs = [future.result(timeout=5).output for future in futures]
+
+        self.assertEqual(outputs, [f"cluster_{index}" for index in range(5)])
+        self.assertEqual(running["max"], 2)
+
+    def test_fall_back_to_default_max_concurrent_runs_on_malformed_env_value(self):
+        with mock.patch.dict(os.environ, {ENV_ANSIBLE_MAX_CONCURRENT_RUNS: "four"}):
+            runner = AnsibleRunnerLocal(
+                io_utils=None,
+                paths=None,
+                process=None,
+                progress=None,
+                printer=None,
+                ctx=Context.create(dry_run=False, verbose=False),
+                ssh_session_pool=mock.Mock(),
+            )
+        self.assertEqual(runner._max_concurrent_runs, ANSIBLE_DEFAULT_MAX_CONCURRENT_RUNS)
+
+
+class AnsibleConvergenceTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ledger = AnsibleConvergenceLedger.create(os.path.join(self.temp_dir.name, "ledger.json"))
+        self.master = AnsibleHost("node-1", "192.168.1.1")
+        self.worker = AnsibleHost("node-2", "192.168.1.2")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_runner(self, ignore_ledger: bool) -> AnsibleRunnerLocal:
+        return AnsibleRunnerLocal(
+            io_utils=None,
+            paths=None,
+            process=None,
+            progress=None,
+            printer=mock.Mock(),
+            ctx=Context.create(dry_run=False, verbose=False, ignore_ledger=ignore_ledger),
+            ssh_session_pool=mock.Mock(),
+            convergence_ledger=self.ledger,
+        )
+
+    def test_skip_converged_hosts_unless_ledger_is_ignored(self):
+        self.ledger.record_converged_fn([self.master], ANSIBLE_DUMMY_PLAYBOOK_NAME, "content", "vars")
+
+        runner = self._create_runner(ignore_ledger=False)
+        self.assertEqual(
+            runner._filter_converged_hosts([self.master, self.worker], ANSIBLE_DUMMY_PLAYBOOK, ("content", "vars")),
+            [self.worker],
+        )
+        ignoring_runner = self._create_runner(ignore_ledger=True)
+        self.assertEqual(
+            ignoring_runner._filter_converged_hosts(
+                [self.master, self.worker], ANSIBLE_DUMMY_PLAYBOOK, ("content", "vars")
+            ),
+            [self.master, self.worker],
+        )
+
+    def test_change_convergence_key_on_vars_change(self):
+        runner = self._create_runner(ignore_ledger=False)
+        playbook = AnsiblePlaybook(ANSIBLE_DUMMY_PLAYBOOK_NAME, "---\n- hosts: selected_hosts\n")
+        content_hash, vars_hash = runner._get_convergence_key(playbook, ["k3s_version=v1"], None, None)
+        self.assertEqual(
+            runner._get_convergence_key(playbook, ["k3s_version=v1"], None, None), (content_hash, vars_hash)
+        )
+        self.assertEqual(runner._get_convergence_key(playbook, ["k3s_version=v2"], None, None)[0], content_hash)
+        self.assertNotEqual(runner._get_convergence_key(playbook, ["k3s_version=v2"], None, None)[1], vars_hash)
+
+    def test_record_only_hosts_without_failures(self):
+        runner = self._create_runner(ignore_ledger=False)
+        host_results = [
+            AnsibleHostTaskResult("node-1", "Install k3s", "k3s", "ok"),
+            AnsibleHostTaskResult("node-2", "Install k3s", "k3s", "ok"),
+            AnsibleHostTaskResult("node-2", "Start k3s", "k3s", "failed"),
+        ]
+        self.assertEqual(runner._get_converged_hosts([self.master, self.worker], host_results), [self.master])
+
+    def test_record_hosts_with_ignored_failures(self):
+        runner = self._create_runner(ignore_ledger=False)
+        host_results = [
+            AnsibleHostTaskResult("node-1", "Check k3s", "k3s", "ignored"),
+            AnsibleHostTaskResult("node-1", "Install k3s", "k3s", "ok"),
+        ]
+        self.assertEqual(runner._get_converged_hosts([self.master, self.worker], host_results), [self.master])
+
+
+class AnsibleLocalExecutionTestShould(unittest.TestCase):
+    def setUp(self):
+        self.local_executor = mock.Mock()
+        with mock.patch.dict(os.environ, {ENV_ANSIBLE_LOCAL_EXECUTOR: "true"}):
+            self.runner = AnsibleRunnerLocal(
+                io_utils=None,
+                paths=None,
+                process=None,
+                progress=None,
+                printer=None,
+                ctx=Context.create(dry_run=False, verbose=False, os_arch=OsArch(os="linux")),
+                ssh_session_pool=mock.Mock(),
+                local_executor=self.local_executor,
+            )
+        self.playbook = AnsiblePlaybook(
+            ANSIBLE_DUMMY_PLAYBOOK_NAME, "- hosts: selected_hosts\n", RemoteContext.create()
+        )
+
+    def test_plan_local_execution_only_for_local_hosts(self):
+        local_host = AnsibleHost("local", "ansible_connection=local")
+        self.runner._get_local_plan([local_host], self.playbook, ["username=pi"], ["hello"], None)
+        self.local_executor.create_plan_fn.assert_called_once_with(
+            "- hosts: selected_hosts\n",
+            ["local_bin_folder='~/.local/bin'", "dry_run=False", "username=pi"],
+            ["hello", "linux"],
+        )
+
+        self.local_executor.reset_mock()
+        remote_host = AnsibleHost("node-1", "192.168.1.1")
+        self.assertIsNone(self.runner._get_local_plan([local_host, remote_host], self.playbook, None, None, None))
+        self.local_executor.create_plan_fn.assert_not_called()
+
+    def test_local_execution_is_disabled_by_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            runner = AnsibleRunnerLocal(
+                io_utils=None,
+                paths=None,
+                process=None,
+                progress=None,
+                printer=None,
+                ctx=Context.create(dry_run=False, verbose=False),
+                ssh_session_pool=mock.Mock(),
+                local_executor=self.local_executor,
+            )
+        local_host = AnsibleHost("local", "ansible_connection=local")
+        self.assertIsNone(runner._get_local_plan([local_host], self.playbook, None, None, None))
+        self.local_executor.create_plan_fn.assert_not_called()
+
+
+class AnsibleResourcesStagingTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path_patcher = mock.patch(
+            "provisioner_shared.components.runtime.runner.ansible.ansible_runner.ProvisionerAnsibleProjectPath",
+            self.temp_dir.name,
+        )
+        self.project_path_patcher.start()
+        ctx = Context.create(dry_run=False, verbose=False)
+        self.io_utils = IOUtils.create(ctx)
+        self.runner = AnsibleRunnerLocal(
+            io_utils=self.io_utils,
+            paths=Paths.create(ctx),
+            process=None,
+            progress=None,
+            printer=None,
+            ctx=ctx,
+            ssh_session_pool=mock.Mock(),
+        )
+
+    def tearDown(self):
+        self.project_path_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_stage_resources_only_when_content_changes(self):
+        self.assertEqual(self.runner._stage_ansible_resources(), {})
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "ansible.cfg")))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "callback_plugins", "custom_yaml.py")))
+
+        with mock.patch.object(self.io_utils, "copy_file_fn") as mock_copy_file:
+            self.runner._stage_ansible_resources()
+            mock_copy_file.assert_not_called()
+
+            # i.e. the packaged resources were upgraded since the last staging
+            with open(os.path.join(self.temp_dir.name, ".resources.sha256"), "w") as f:
+                f.write("outdated")
+            self.runner._stage_ansible_resources()
+            mock_copy_file.assert_called_once()
+
+    def test_use_package_resources_without_staging(self):
+        self.runner._use_package_resources = True
+        env_vars = self.runner._stage_ansible_resources()
+        self.assertTrue(env_vars["ANSIBLE_CONFIG"].endswith(os.path.join("resources", "ansible.cfg")))
+        self.assertTrue(os.path.isdir(env_vars["ANSIBLE_CALLBACK_PLUGINS"]))
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from typing import List, Optional
+
+from loguru import logger
+
+# Must match the environment variable read by the task_timings callback plugin
+ENV_ANSIBLE_TIMINGS_FILE = "PROVISIONER_ANSIBLE_TIMINGS_FILE"
+ANSIBLE_TIMINGS_DIR_NAME = "timings"
+ANSIBLE_TIMINGS_TOP_TASKS = 10
+
+
+class AnsibleTaskTiming:
+    host: str
+    task: str
+    role: Optional[str]
+    status: str
+    started_at: float
+    ended_at: float
+    duration_sec: float
+
+    def __init__(
+        self, host: str, task: str, role: Optional[str], status: str, started_at: float, ended_at: float
+    ) -> None:
+        self.host = host
+        self.task = task
+        self.role = role
+        self.status = status
+        self.started_at = started_at
+        self.ended_at = ended_at
+        self.duration_sec = max(0.0, ended_at - started_at)
+
+    @staticmethod
+    def from_dict(timing_dict: dict) -> "AnsibleTaskTiming":
+        return AnsibleTaskTiming(
+            host=timing_dict["host"],
+            task=timing_dict["task"],
+            role=timing_dict.get("role"),
+            status=timing_dict.get("status", "ok"),
+            started_at=float(timing_dict["started_at"]),
+            ended_at=float(timing_dict["ended_at"]),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "host": self.host,
+            "task": self.task,
+            "role": self.role,
+            "status": self.status,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "duration_sec": round(self.duration_sec, 3),
+        }
+
+    def get_display_name(self) -> str:
+        return f"{self.role} : {self.task}" if self.role else self.task
+
+
+class AnsibleTimingsReport:
+    """
+    Per host, per task timings of a single playbook run, as recorded by the task_timings callback plugin.
+    """
+
+    playbook: Optional[str]
+    timings: List[AnsibleTaskTiming]
+
+    def __init__(self, playbook: Optional[str] = None, timings: Optional[List[AnsibleTaskTiming]] = None) -> None:
+        self.playbook = playbook
+        self.timings = timings if timings else []
+
+    @staticmethod
+    def from_dict(report_dict: dict) -> "AnsibleTimingsReport":
+        return AnsibleTimingsReport(
+            playbook=report_dict.get("playbook"),
+            timings=[AnsibleTaskTiming.from_dict(timing) for timing in report_dict.get("timings", [])],
+        )
+
+    @staticmethod
+    def from_file(file_path: str) -> "AnsibleTimingsReport":
+        """
+        Load a report written by the callback plugin, an empty report is returned if it is missing or malformed.
+        """
+        if not os.path.exists(file_path):
+            logger.debug(f"Ansible timings file was not written. path: {file_path}")
+            return AnsibleTimingsReport()
+        try:
+            with open(file_path, "r") as f:
+                return AnsibleTimingsReport.from_dict(json.load(f))
+        except (ValueError, KeyError, TypeError) as ex:
+            logger.warning(f"Failed to read Ansible timings file. path: {file_path}, ex: {ex}")
+            return AnsibleTimingsReport()
+
+    def to_dict(self) -> dict:
+        return {"playbook": self.playbook, "timings": [timing.to_dict() for timing in self.timings]}
+
+    def is_empty(self) -> bool:
+        return len(self.timings) == 0
+
+    def get_slowest(self, count: int = ANSIBLE_TIMINGS_TOP_TASKS) -> List[AnsibleTaskTiming]:
+        return sorted(self.timings, key=lambda timing: timing.duration_sec, reverse=True)[:count]
+
+    def get_host_timings(self, host: str) -> List[AnsibleTaskTiming]:
+        return [timing for timing in self.timings if timing.host == host]
+
+    def format_slowest(self, count: int = ANSIBLE_TIMINGS_TOP_TASKS) -> str:
+        slowest = self.get_slowest(count)
+        if len(slowest) == 0:
+            return "No Ansible task timings were recorded"
+
+        lines = [f"Slowest Ansible tasks (top {len(slowest)} of {len(self.timings)}):"]
+        for timing in slowest:
+            lines.append(
+                f"  {timing.duration_sec:>8.2f}s  {timing.host}  {timing.get_display_name()}  [{timing.status}]"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_timings import (
+    ENV_ANSIBLE_TIMINGS_FILE,
+    AnsibleTaskTiming,
+    AnsibleTimingsReport,
+)
+from provisioner_shared.components.runtime.runner.ansible.resources.callback_plugins import task_timings
+
+TIMINGS_REPORT = AnsibleTimingsReport(
+    playbook="k3s.yaml",
+    timings=[
+        AnsibleTaskTiming("node-1", "Install k3s", "k3s", "changed", started_at=100.0, ended_at=130.5),
+        AnsibleTaskTiming("node-2", "Install k3s", "k3s", "ok", started_at=100.0, ended_at=112.0),
+        AnsibleTaskTiming("node-1", "Gather facts", None, "ok", started_at=90.0, ended_at=92.0),
+    ],
+)
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ansible_timings_test.py
+#
+class AnsibleTimingsReportTestShould(unittest.TestCase):
+    def test_sort_slowest_tasks_first(self):
+        slowest = TIMINGS_REPORT.get_slowest(2)
+        self.assertEqual([(t.host, t.duration_sec) for t in slowest], [("node-1", 30.5), ("node-2", 12.0)])
+
+    def test_format_slowest_tasks(self):
+        output = TIMINGS_REPORT.format_slowest(1)
+        self.assertIn("top 1 of 3", output)
+        self.assertIn("30.50s  node-1  k3s : Install k3s  [changed]", output)
+        self.assertNotIn("Gather facts", output)
+
+    def test_round_trip_through_json_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "timings.json")
+            with open(file_path, "w") as f:
+                json.dump(TIMINGS_REPORT.to_dict(), f)
+            report = AnsibleTimingsReport.from_file(file_path)
+        self.assertEqual(report.playbook, "k3s.yaml")
+        self.assertEqual([t.to_dict() for t in report.timings], [t.to_dict() for t in TIMINGS_REPORT.timings])
+        self.assertEqual(len(report.get_host_timings("node-1")), 2)
+
+    def test_return_empty_report_when_timings_file_is_missing(self):
+        self.assertTrue(AnsibleTimingsReport.from_file("/no/such/timings.json").is_empty())
+
+
+class TaskTimingsCallbackTestShould(unittest.TestCase):
+    def _create_result(self, host: mock.Mock, task: mock.Mock) -> mock.Mock:
+        result = mock.Mock()
+        result._host = host
+        result._task = task
+        result._result = {}
+        return result
+
+    def test_record_task_timings_per_host(self):
+        host = mock.Mock()
+        host.get_name.return_value = "node-1"
+        task = mock.Mock(_uuid="task-uuid", action="command")
+        task.name = "Install k3s"
+        task._role.get_name.return_value = "k3s"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "timings.json")
+            with mock.patch.dict(os.environ, {ENV_ANSIBLE_TIMINGS_FILE: file_path}):
+                callback = task_timings.CallbackModule()
+            with mock.patch.object(task_timings.time, "time", side_effect=[100.0, 104.5]):
+                callback.v2_runner_on_start(host, task)
+                callback.v2_runner_on_ok(self._create_result(host, task))
+            callback.v2_playbook_on_stats(mock.Mock())
+            report = AnsibleTimingsReport.from_file(file_path)
+
+        self.assertEqual(len(report.timings), 1)
+        timing = report.timings[0]
+        self.assertEqual((timing.host, timing.task, timing.role, timing.status), ("node-1", "Install k3s", "k3s", "ok"))
+        self.assertEqual(timing.duration_sec, 4.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+import codecs
+import importlib
+import json
+import os
+import re
+import select
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from typing import Optional, Tuple
+
+from ansible_runner.runner import Runner
+from ansible_runner.utils import OutputEventFilter
+from loguru import logger
+
+ENV_ANSIBLE_WORKER = "PROVISIONER_ANSIBLE_WORKER"
+ANSIBLE_WORKER_MODULE = "provisioner_shared.components.runtime.runner.ansible.ansible_worker"
+ANSIBLE_WORKER_READ_SIZE = 65536
+ANSIBLE_WORKER_FAILED_RC = 255
+ANSIBLE_WORKER_START_TIMEOUT_SEC = 60
+# Marks the end of a playbook output on the worker stdout, followed by the run token and return code
+ANSIBLE_WORKER_SENTINEL = "\n\x00provisioner-ansible-worker:"
+# Sent once by the worker after Ansible was imported, before it accepts any run
+ANSIBLE_WORKER_READY = f"{ANSIBLE_WORKER_SENTINEL}ready\n"
+
+# Imported once by the worker, most of the ansible-playbook startup time is spent importing these
+ANSIBLE_WORKER_WARM_UP_MODULES = [
+    "ansible.cli.playbook",
+    "ansible.executor.playbook_executor",
+    "ansible.executor.task_queue_manager",
+    "ansible.inventory.manager",
+    "ansible.vars.manager",
+    "ansible.parsing.dataloader",
+    "ansible.playbook",
+    "ansible.plugins.loader",
+    "ansible.template",
+]
+
+# Ansible resolves plugin paths and its configuration file when imported, a worker only serves
+# runs whose environment agrees with the one it was started with on these variables
+_IMPORT_TIME_ENV_PATTERN = re.compile(r"^ANSIBLE_(CONFIG|.*(PLUGINS|PATH|PATHS|LIBRARY|MODULE_UTILS))$")
+
+
+class AnsibleWorker:
+    """
+    Long lived process with Ansible already imported, runs playbooks without paying the interpreter
+    startup and Ansible imports on every ansible-playbook run.
+
+    Runs are prepared by ansible-runner as usual (environment, command line, event callbacks), only
+    the ansible-playbook process spawn is replaced: the worker forks a child per run which applies the
+    run environment and working directory and calls the ansible-playbook CLI in process.
+    Every run executes in its own forked child, a run never sees the inventory, variables or
+    configuration of a previous run and the worker itself never runs a playbook.
+
+    The worker serves a single run at a time, concurrent runs fall back to spawning ansible-playbook.
+    """
+
+    _process: Optional[subprocess.Popen]
+    _env_key: Optional[tuple]
+
+    def __init__(self) -> None:
+        self._process = None
+        self._env_key = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create() -> "AnsibleWorker":
+        logger.debug("Creating Ansible worker...")
+        return AnsibleWorker()
+
+    def _run(self, runner: Runner) -> Optional[Tuple[str, int]]:
+        """
+        Run a prepared ansible-runner job on the worker and return its status and return code,
+        None if the worker is busy or unavailable and the job should be run by ansible-runner itself.
+        """
+        if not self._lock.acquire(blocking=False):
+            logger.debug("Ansible worker is busy, spawning ansible-playbook")
+            return None
+        try:
+            config = runner.config
+            process = self._get_process(config.env)
+            if process is None:
+                return None
+
+            token = uuid.uuid4().hex
+            request = {"command": config.command, "env": config.env, "cwd": config.cwd, "token": token}
+            try:
+                process.stdin.write(f"{json.dumps(request)}\n".encode("utf-8"))
+                process.stdin.flush()
+            except OSError as ex:
+                logger.debug(f"Ansible worker is not available, spawning ansible-playbook. ex: {ex}")
+                self._close_unlocked()
+                return None
+
+            runner.status_callback("starting")
+            stdout_handle = OutputEventFilter(
+                None, runner.event_callback, config.suppress_ansible_output, output_json=config.json_mode
+            )
+            try:
+                rc = self._relay_output(process, token, stdout_handle)
+            except (OSError, EOFError, ValueError) as ex:
+                logger.error(f"Ansible worker exited during a playbook run. ex: {ex}")
+                self._close_unlocked()
+                rc = ANSIBLE_WORKER_FAILED_RC
+
+            if rc is None:
+                # Nothing of the run reached the output, it is safe to run it again with ansible-runner
+                logger.debug("Ansible worker exited before running the playbook, spawning ansible-playbook")
+                self._close_unlocked()
+                return None
+            stdout_handle.close()
+
+            runner.rc = rc
+            runner.status_callback("successful" if rc == 0 else "failed")
+            return runner.status, rc
+        finally:
+            self._lock.release()
+
+    def _get_process(self, env: dict) -> Optional[subprocess.Popen]:
+        env_key = tuple(sorted((key, value) for key, value in env.items() if _IMPORT_TIME_ENV_PATTERN.match(key)))
+        if self._process is not None and (self._process.poll() is not None or self._env_key != env_key):
+            logger.debug("Restarting Ansible worker, it exited or the Ansible configuration changed")
+            self._close_unlocked()
+
+        if self._process is None:
+            try:
+                self._process = subprocess.Popen(
+                    [sys.executable, "-m", ANSIBLE_WORKER_MODULE],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    env=env,
+                    bufsize=0,
+                )
+                self._env_key = env_key
+                logger.debug(f"Started Ansible worker. pid: {self._process.pid}")
+            except OSError as ex:
+                logger.warning(f"Failed to start Ansible worker, spawning ansible-playbook. ex: {ex}")
+                return None
+
+            if not self._await_ready(self._process):
+                logger.warning("Ansible worker failed to start, spawning ansible-playbook")
+                self._close_unlocked()
+                return None
+        return self._process
+
+    def _await_ready(self, process: subprocess.Popen) -> bool:
+        """
+        Wait for the worker ready handshake, False if the worker exited or did not become ready in time.
+        """
+        ready = ANSIBLE_WORKER_READY.encode("utf-8")
+        received = b""
+        deadline = time.monotonic() + ANSIBLE_WORKER_START_TIMEOUT_SEC
+        while not received.endswith(ready):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([process.stdout], [], [], remaining)[0]:
+                return False
+            chunk = os.read(process.stdout.fileno(), len(ready))
+            if not chunk:
+                return False
+            # Anything printed while importing Ansible (e.g. deprecation warnings) precedes the handshake
+            received = (received + chunk)[-len(ready) :]
+        return True
+
+    def _relay_output(self, process: subprocess.Popen, token: str, stdout_handle: OutputEventFilter) -> Optional[int]:
+        """
+        Pass the run output to the ansible-runner event filter until the run sentinel, returns the run return code.
+        Returns None if the worker exited before producing any output for the run.
+        """
+        sentinel = f"{ANSIBLE_WORKER_SENTINEL}{token}:".encode("utf-8")
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = b""
+        relayed = False
+        while True:
+            chunk = os.read(process.stdout.fileno(), ANSIBLE_WORKER_READ_SIZE)
+            if not chunk:
+                if not relayed and not pending:
+                    return None
+                raise EOFError("Ansible worker output closed")
+            pending += chunk
+            index = pending.find(sentinel)
+            if index >= 0:
+                end = pending.find(b"\n", index + len(sentinel))
+                if end < 0:
+                    continue
+                stdout_handle.write(decoder.decode(pending[:index], final=True))
+                return int(pending[index + len(sentinel) : end])
+            # Keep enough of the output to detect a sentinel split between reads
+            keep = min(len(pending), len(sentinel) - 1)
+            ready, pending = pending[: len(pending) - keep], pending[len(pending) - keep :]
+            stdout_handle.write(decoder.decode(ready))
+            relayed = relayed or bool(ready)
+
+    def _close_unlocked(self) -> None:
+        if self._process is None:
+            return
+        try:
+            # The worker exits once its stdin is closed
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process.stdout.close()
+        self._process = None
+        self._env_key = None
+
+    def _close(self) -> None:
+        with self._lock:
+            self._close_unlocked()
+
+    run_fn = _run
+    close_fn = _close
+
+
+def _refresh_ansible_constants() -> None:
+    # Constants are resolved when ansible.constants is imported, resolve them again from the run environment
+    from ansible import constants
+
+    for setting in constants.config.get_configuration_definitions():
+        constants.set_constant(setting, constants.config.get_config_value(setting, variables=vars(constants)))
+
+
+def _run_playbook(request: dict) -> None:
+    """
+    Forked child, runs a single playbook and exits.
+    """
+    rc = ANSIBLE_WORKER_FAILED_RC
+    try:
+        os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+        # Output is merged, same as running in a pseudo terminal
+        os.dup2(1, 2)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        _refresh_ansible_constants()
+
+        from ansible.cli.playbook import PlaybookCLI
+
+        sys.argv = request["command"]
+        PlaybookCLI.cli_executor(request["command"])
+        rc = 0
+    except SystemExit as ex:
+        rc = ex.code if isinstance(ex.code, int) else (0 if ex.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(rc)
+
+
+def _serve() -> None:
+    for module in ANSIBLE_WORKER_WARM_UP_MODULES:
+        importlib.import_module(module)
+    sys.stdout.flush()
+    os.write(1, ANSIBLE_WORKER_READY.encode("utf-8"))
+
+    while True:
+        line = sys.stdin.buffer.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            _run_playbook(request)
+        _, status = os.waitpid(pid, 0)
+        rc = os.waitstatus_to_exitcode(status)
+        # Killed by a signal, reported the same as a shell would
+        rc = rc if rc >= 0 else 128 - rc
+        os.write(1, f"{ANSIBLE_WORKER_SENTINEL}{request['token']}:{rc}\n".encode("utf-8"))
+
+
+if __name__ == "__main__":
+    _serve()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_worker import (
+    ANSIBLE_WORKER_READY,
+    ANSIBLE_WORKER_SENTINEL,
+    AnsibleWorker,
+)
+
+ANSIBLE_WORKER_PATH = "provisioner_shared.components.runtime.runner.ansible.ansible_worker"
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ansible_worker_test.py
+#
+class AnsibleWorkerTestShould(unittest.TestCase):
+    def _create_process(self, output: bytes) -> mock.Mock:
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, output)
+        os.close(write_fd)
+        process = mock.Mock()
+        process.stdout = os.fdopen(read_fd, "rb", buffering=0)
+        self.addCleanup(process.stdout.close)
+        return process
+
+    def test_relay_run_output_until_sentinel(self):
+        output = "TASK [Print] ✔\nok: [local]".encode("utf-8")
+        process = self._create_process(output + f"{ANSIBLE_WORKER_SENTINEL}token-1:2\n".encode("utf-8") + b"next")
+        stdout_handle = mock.Mock()
+
+        with mock.patch(f"{ANSIBLE_WORKER_PATH}.ANSIBLE_WORKER_READ_SIZE", 3):
+            rc = AnsibleWorker.create()._relay_output(process, "token-1", stdout_handle)
+
+        self.assertEqual(rc, 2)
+        self.assertEqual("".join(call.args[0] for call in stdout_handle.write.call_args_list), output.decode("utf-8"))
+
+    def test_fail_when_worker_output_closes_before_sentinel(self):
+        process = self._create_process(b"TASK [Print]\n")
+        with self.assertRaises(EOFError):
+            AnsibleWorker.create()._relay_output(process, "token-1", mock.Mock())
+
+    def test_not_report_a_run_when_worker_exits_before_any_output(self):
+        process = self._create_process(b"")
+        self.assertIsNone(AnsibleWorker.create()._relay_output(process, "token-1", mock.Mock()))
+
+    def test_wait_for_ready_handshake(self):
+        worker = AnsibleWorker.create()
+        self.assertTrue(worker._await_ready(self._create_process(f"warning{ANSIBLE_WORKER_READY}".encode("utf-8"))))
+        self.assertFalse(worker._await_ready(self._create_process(b"Traceback (most recent call last):")))
+
+    def test_fall_back_when_worker_crashes_on_start(self):
+        worker = AnsibleWorker.create()
+        runner = mock.Mock()
+        runner.config.env = dict(os.environ)
+        with mock.patch(f"{ANSIBLE_WORKER_PATH}.ANSIBLE_WORKER_MODULE", "provisioner_missing_ansible_worker"):
+            self.assertIsNone(worker.run_fn(runner))
+        self.assertIsNone(worker._process)
+        runner.status_callback.assert_not_called()
+
+    def test_fall_back_when_worker_exits_before_running_the_playbook(self):
+        worker = AnsibleWorker.create()
+        runner = mock.Mock()
+        runner.config.command = ["ansible-playbook"]
+        runner.config.env = {}
+        runner.config.cwd = "/"
+        # Worker already started, exits once the run is requested without any output
+        process = self._create_process(b"")
+        process.poll.return_value = None
+        worker._process = process
+        worker._env_key = ()
+        self.assertIsNone(worker.run_fn(runner))
+        self.assertIsNone(worker._process)
+        runner.event_callback.assert_not_called()
+
+    def test_not_run_when_busy(self):
+        worker = AnsibleWorker.create()
+        runner = mock.Mock()
+        with worker._lock:
+            self.assertIsNone(worker.run_fn(runner))
+        runner.status_callback.assert_not_called()
+
+    def test_restart_worker_when_ansible_configuration_changes(self):
+        worker = AnsibleWorker.create()
+        with mock.patch("subprocess.Popen") as mock_popen, mock.patch.object(worker, "_await_ready", return_value=True):
+            mock_popen.return_value.poll.return_value = None
+            worker._get_process({"ANSIBLE_CONFIG": "/a/ansible.cfg", "ANSIBLE_STRATEGY": "linear"})
+            # Settings read at run time do not require a new worker
+            worker._get_process({"ANSIBLE_CONFIG": "/a/ansible.cfg", "ANSIBLE_STRATEGY": "free"})
+            self.assertEqual(mock_popen.call_count, 1)
+
+            worker._get_process({"ANSIBLE_CONFIG": "/b/ansible.cfg", "ANSIBLE_STRATEGY": "free"})
+            self.assertEqual(mock_popen.call_count, 2)
+            mock_popen.return_value.stdin.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
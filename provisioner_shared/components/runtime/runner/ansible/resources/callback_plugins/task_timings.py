@@ -0,0 +1,77 @@
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+# Set by the provisioner Ansible runner, timings are not recorded when missing
+ENV_TIMINGS_FILE = "PROVISIONER_ANSIBLE_TIMINGS_FILE"
+
+
+class CallbackModule(CallbackBase):
+    """
+    This callback module records the start/end timestamps of every task on every host
+    and writes them as JSON once the playbook completes
+    """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "task_timings"
+    CALLBACK_NEEDS_WHITELIST = False
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self._timings_file = os.environ.get(ENV_TIMINGS_FILE)
+        self._playbook = None
+        self._started = {}
+        self._timings = []
+
+    def v2_playbook_on_start(self, playbook):
+        self._playbook = os.path.basename(playbook._file_name)
+
+    def v2_runner_on_start(self, host, task):
+        self._started[(host.get_name(), task._uuid)] = time.time()
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, "changed" if result._result.get("changed", False) else "ok")
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, "ignored" if ignore_errors else "failed")
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result, "skipped")
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, "unreachable")
+
+    def v2_playbook_on_stats(self, stats):
+        if not self._timings_file:
+            return
+        content = {"playbook": self._playbook, "timings": self._timings}
+        tmp_file = f"{self._timings_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(content, f, indent=2)
+        # Readers never see a partially written file
+        os.replace(tmp_file, self._timings_file)
+
+    def _record(self, result, status):
+        ended_at = time.time()
+        host_name = result._host.get_name()
+        task = result._task
+        # Results of tasks that were never started on the host (e.g. unreachable) take no time
+        started_at = self._started.pop((host_name, task._uuid), ended_at)
+        self._timings.append(
+            {
+                "host": host_name,
+                "task": task.name or task.action,
+                "role": task._role.get_name() if task._role else None,
+                "status": status,
+                "started_at": started_at,
+                "ended_at": ended_at,
+            }
+        )
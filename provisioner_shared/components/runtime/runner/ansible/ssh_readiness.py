@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional
+
+import paramiko
+from loguru import logger
+
+from provisioner_shared.components.runtime.runner.ansible.ssh_session_pool import SSHSessionPool
+
+if TYPE_CHECKING:
+    from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleHost
+
+SSH_READINESS_CONNECT_TIMEOUT_SEC = 10
+SSH_READINESS_DEADLINE_SEC = 60
+SSH_READINESS_INITIAL_BACKOFF_SEC = 0.5
+SSH_READINESS_MAX_BACKOFF_SEC = 8
+SSH_READINESS_MAX_WORKERS = 16
+
+
+class SSHHostReadiness:
+    host: "AnsibleHost"
+    ready: bool
+    attempts: int
+    elapsed_sec: float
+    error: Optional[str]
+
+    def __init__(
+        self, host: "AnsibleHost", ready: bool, attempts: int, elapsed_sec: float, error: Optional[str] = None
+    ) -> None:
+        self.host = host
+        self.ready = ready
+        self.attempts = attempts
+        self.elapsed_sec = elapsed_sec
+        self.error = error
+
+
+class SSHReadinessReport:
+    results: List[SSHHostReadiness]
+
+    def __init__(self, results: List[SSHHostReadiness]) -> None:
+        self.results = results
+
+    def ready_hosts(self) -> List[SSHHostReadiness]:
+        return [result for result in self.results if result.ready]
+
+    def unreachable_hosts(self) -> List[SSHHostReadiness]:
+        return [result for result in self.results if not result.ready]
+
+    def is_all_ready(self) -> bool:
+        return all(result.ready for result in self.results)
+
+
+class SSHReadinessProber:
+    """
+    Wait for SSH to accept connections on multiple hosts concurrently.
+
+    Every host is probed on its own worker with a per connection timeout and an exponential
+    backoff with jitter between attempts, all hosts share a single deadline.
+    The total wait is bounded by the slowest host rather than the sum of all hosts.
+    """
+
+    _connect_timeout_sec: float
+    _deadline_sec: float
+    _initial_backoff_sec: float
+    _max_backoff_sec: float
+    _max_workers: int
+    _session_pool: SSHSessionPool
+
+    def __init__(
+        self,
+        connect_timeout_sec: float = SSH_READINESS_CONNECT_TIMEOUT_SEC,
+        deadline_sec: float = SSH_READINESS_DEADLINE_SEC,
+        initial_backoff_sec: float = SSH_READINESS_INITIAL_BACKOFF_SEC,
+        max_backoff_sec: float = SSH_READINESS_MAX_BACKOFF_SEC,
+        max_workers: int = SSH_READINESS_MAX_WORKERS,
+        session_pool: Optional[SSHSessionPool] = None,
+    ) -> None:
+        self._connect_timeout_sec = connect_timeout_sec
+        self._deadline_sec = deadline_sec
+        self._initial_backoff_sec = initial_backoff_sec
+        self._max_backoff_sec = max_backoff_sec
+        self._max_workers = max_workers
+        self._session_pool = session_pool if session_pool else SSHSessionPool.create()
+
+    @staticmethod
+    def create(
+        connect_timeout_sec: float = SSH_READINESS_CONNECT_TIMEOUT_SEC,
+        deadline_sec: float = SSH_READINESS_DEADLINE_SEC,
+        initial_backoff_sec: float = SSH_READINESS_INITIAL_BACKOFF_SEC,
+        max_backoff_sec: float = SSH_READINESS_MAX_BACKOFF_SEC,
+        max_workers: int = SSH_READINESS_MAX_WORKERS,
+        session_pool: Optional[SSHSessionPool] = None,
+    ) -> "SSHReadinessProber":
+        logger.debug(f"Creating SSH readiness prober (deadline: {deadline_sec}s, max_workers: {max_workers})...")
+        return SSHReadinessProber(
+            connect_timeout_sec, deadline_sec, initial_backoff_sec, max_backoff_sec, max_workers, session_pool
+        )
+
+    def _probe_hosts(self, hosts: List["AnsibleHost"]) -> SSHReadinessReport:
+        if len(hosts) == 0:
+            return SSHReadinessReport([])
+
+        deadline = time.monotonic() + self._deadline_sec
+        max_workers = max(1, min(self._max_workers, len(hosts)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ssh-readiness") as executor:
+            # Results keep the order of the selected hosts
+            results = list(executor.map(lambda host: self._probe_host(host, deadline), hosts))
+        return SSHReadinessReport(results)
+
+    def _probe_host(self, host: "AnsibleHost", deadline: float) -> SSHHostReadiness:
+        started_at = time.monotonic()
+        attempts = 0
+        last_error = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            attempts += 1
+            try:
+                self._connect(host, timeout=min(self._connect_timeout_sec, remaining))
+                logger.debug(f"SSH is ready. host: {host.host}, attempts: {attempts}")
+                return SSHHostReadiness(host, True, attempts, time.monotonic() - started_at)
+            except Exception as ex:
+                last_error = str(ex) or type(ex).__name__
+                logger.debug(f"SSH is not ready yet. host: {host.host}, attempt: {attempts}, ex: {last_error}")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(self._get_backoff_sec(attempts), remaining))
+
+        return SSHHostReadiness(host, False, attempts, time.monotonic() - started_at, last_error)
+
+    def _get_backoff_sec(self, attempt: int) -> float:
+        backoff = min(self._max_backoff_sec, self._initial_backoff_sec * (2 ** (attempt - 1)))
+        # Jitter spreads the retries of hosts booting together
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def _connect(self, host: "AnsibleHost", timeout: float) -> paramiko.SSHClient:
+        # Successful connections are kept open in the session pool for later reuse
+        return self._session_pool.connect_fn(host, timeout=timeout)
+
+    probe_hosts_fn = _probe_hosts
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.errors.cli_errors import AnsibleRunnerNoHostSSHAccessException
+from provisioner_shared.components.runtime.infra.context import Context
+from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleHost, AnsibleRunnerLocal
+from provisioner_shared.components.runtime.runner.ansible.ssh_readiness import SSHReadinessProber
+from provisioner_shared.test_lib.assertions import Assertion
+
+SSH_READINESS_PKG_PATH = "provisioner_shared.components.runtime.runner.ansible.ssh_readiness"
+
+HOST_READY_1 = AnsibleHost(host="ready-1", ip_address="192.168.1.1", username="pi", password="raspberry")
+HOST_READY_2 = AnsibleHost(host="ready-2", ip_address="192.168.1.2", username="pi", password="raspberry")
+HOST_UNREACHABLE = AnsibleHost(host="unreachable", ip_address="192.168.1.3", username="pi", password="raspberry")
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ssh_readiness_test.py
+#
+class SSHReadinessProberTestShould(unittest.TestCase):
+    def _create_connect_side_effect(self, unreachable_ips, delay_sec: float = 0):
+        def connect(host: AnsibleHost, timeout: float):
+            time.sleep(delay_sec)
+            if host.ip_address in unreachable_ips:
+                raise ConnectionRefusedError("Connection refused")
+            return mock.MagicMock()
+
+        return connect
+
+    def test_report_ready_and_unreachable_hosts(self):
+        prober = SSHReadinessProber.create(deadline_sec=0.3, initial_backoff_sec=0.01, max_backoff_sec=0.05)
+        with mock.patch.object(
+            prober, "_connect", side_effect=self._create_connect_side_effect({HOST_UNREACHABLE.ip_address})
+        ):
+            report = prober.probe_hosts_fn([HOST_READY_1, HOST_UNREACHABLE, HOST_READY_2])
+
+        self.assertFalse(report.is_all_ready())
+        self.assertEqual([result.host for result in report.results], [HOST_READY_1, HOST_UNREACHABLE, HOST_READY_2])
+        self.assertEqual([result.host for result in report.ready_hosts()], [HOST_READY_1, HOST_READY_2])
+        unreachable = report.unreachable_hosts()
+        self.assertEqual(len(unreachable), 1)
+        self.assertGreater(unreachable[0].attempts, 1)
+        self.assertEqual(unreachable[0].error, "Connection refused")
+
+    def test_probe_hosts_concurrently(self):
+        hosts = [AnsibleHost(host=f"host-{i}", ip_address=f"10.0.0.{i}") for i in range(8)]
+        prober = SSHReadinessProber.create(deadline_sec=5)
+        with mock.patch.object(prober, "_connect", side_effect=self._create_connect_side_effect(set(), delay_sec=0.1)):
+            started_at = time.monotonic()
+            report = prober.probe_hosts_fn(hosts)
+            elapsed = time.monotonic() - started_at
+
+        self.assertTrue(report.is_all_ready())
+        # Sequential probing would take at least 0.8 seconds
+        self.assertLess(elapsed, 0.5)
+
+    def test_retry_until_host_is_ready(self):
+        attempts = []
+        lock = threading.Lock()
+
+        def connect(host: AnsibleHost, timeout: float):
+            with lock:
+                attempts.append(timeout)
+                if len(attempts) < 3:
+                    raise TimeoutError("timed out")
+            return mock.MagicMock()
+
+        prober = SSHReadinessProber.create(deadline_sec=5, initial_backoff_sec=0.01, max_backoff_sec=0.02)
+        with mock.patch.object(prober, "_connect", side_effect=connect):
+            report = prober.probe_hosts_fn([HOST_READY_1])
+
+        self.assertTrue(report.is_all_ready())
+        self.assertEqual(report.results[0].attempts, 3)
+
+    def test_backoff_grows_exponentially_up_to_max(self):
+        prober = SSHReadinessProber.create(initial_backoff_sec=1, max_backoff_sec=4)
+        with mock.patch(f"{SSH_READINESS_PKG_PATH}.random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual([prober._get_backoff_sec(attempt) for attempt in range(1, 5)], [1, 2, 4, 4])
+        with mock.patch(f"{SSH_READINESS_PKG_PATH}.random.uniform", side_effect=lambda low, high: low):
+            self.assertEqual(prober._get_backoff_sec(2), 1)
+
+    def test_runner_raises_with_unreachable_hosts(self):
+        ctx = Context.create(dry_run=False, verbose=False)
+        prober = SSHReadinessProber.create(deadline_sec=0.1, initial_backoff_sec=0.01, max_backoff_sec=0.02)
+        runner = AnsibleRunnerLocal(
+            io_utils=None, paths=None, process=None, progress=None, printer=mock.MagicMock(), ctx=ctx, ssh_prober=prober
+        )
+        local_host = AnsibleHost(host="localhost", ip_address="ansible_connection=local")
+        with mock.patch.object(
+            prober, "_connect", side_effect=self._create_connect_side_effect({HOST_UNREACHABLE.ip_address})
+        ) as mock_connect:
+            Assertion.expect_raised_failure(
+                self,
+                ex_type=AnsibleRunnerNoHostSSHAccessException,
+                method_to_run=lambda: runner._check_ssh_conn_on_hosts([local_host, HOST_READY_1, HOST_UNREACHABLE]),
+            )
+            probed_hosts = {call.args[0].host for call in mock_connect.call_args_list}
+        self.assertEqual(probed_hosts, {HOST_READY_1.host, HOST_UNREACHABLE.host})
+
+    def test_runner_releases_probe_sessions(self):
+        ctx = Context.create(dry_run=False, verbose=False)
+        session_pool = mock.MagicMock()
+        prober = mock.MagicMock()
+        runner = AnsibleRunnerLocal(
+            io_utils=None,
+            paths=None,
+            process=None,
+            progress=None,
+            printer=mock.MagicMock(),
+            ctx=ctx,
+            ssh_session_pool=session_pool,
+            ssh_prober=prober,
+        )
+        runner._check_ssh_conn_on_hosts([HOST_READY_1])
+        prober.probe_hosts_fn.assert_called_once_with([HOST_READY_1])
+        session_pool.release_idle_sessions_fn.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+import atexit
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import paramiko
+from loguru import logger
+
+if TYPE_CHECKING:
+    from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleHost
+
+ENV_SSH_CONTROL_MASTER = "PROVISIONER_SSH_CONTROL_MASTER"
+SSH_CONTROL_PATH_DIR = os.path.expanduser("~/.config/provisioner/ansible/cp")
+SSH_CONTROL_PERSIST_SEC = 300
+SSH_CONTROL_MASTER_START_TIMEOUT_SEC = 30
+SSH_SESSION_CONNECT_TIMEOUT_SEC = 10
+SSH_COMMON_ARGS = ["-o StrictHostKeyChecking=no", "-o UserKnownHostsFile=/dev/null"]
+
+
+class SSHSessionPool:
+    """
+    Authenticated SSH sessions shared across the runtime operations of a single CLI invocation.
+
+    The SSH readiness check populates the pool, a retried probe of a host reuses its open session
+    instead of paying a key exchange again. Callers of exec_command_fn / open_sftp_fn share the same sessions.
+    When control master is enabled, an OpenSSH ControlMaster socket is started alongside every
+    session and handed to Ansible via ansible_ssh_common_args so ansible-playbook connects over
+    an already authenticated channel. OpenSSH cannot read passwords non interactively, hence
+    control masters are started for private key authenticated hosts only.
+    Without control master, ansible-playbook opens its own connections and the probe sessions are
+    released once the readiness check completes (see release_idle_sessions_fn).
+    """
+
+    _sessions: Dict[str, paramiko.SSHClient]
+    _control_paths: Dict[str, str]
+    _control_master: bool
+    _control_path_dir: str
+    _control_persist_sec: int
+
+    def __init__(
+        self,
+        control_master: bool = False,
+        control_path_dir: Optional[str] = None,
+        control_persist_sec: int = SSH_CONTROL_PERSIST_SEC,
+    ) -> None:
+        self._sessions = {}
+        self._control_paths = {}
+        self._control_master = control_master
+        self._control_path_dir = control_path_dir if control_path_dir else SSH_CONTROL_PATH_DIR
+        self._control_persist_sec = control_persist_sec
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create(
+        control_master: Optional[bool] = None,
+        control_path_dir: Optional[str] = None,
+        control_persist_sec: int = SSH_CONTROL_PERSIST_SEC,
+    ) -> "SSHSessionPool":
+        if control_master is None:
+            control_master = os.environ.get(ENV_SSH_CONTROL_MASTER, "").lower() in ("true", "1", "yes")
+        logger.debug(f"Creating SSH session pool (control_master: {control_master})...")
+        pool = SSHSessionPool(control_master, control_path_dir, control_persist_sec)
+        atexit.register(pool.close_all_fn)
+        return pool
+
+    def _get_key(self, host: "AnsibleHost") -> str:
+        return f"{host.username}@{host.ip_address}:{host.port}"
+
+    def _get(self, host: "AnsibleHost") -> Optional[paramiko.SSHClient]:
+        """
+        Return an open session to the host, None if there is none or it was disconnected.
+        """
+        key = self._get_key(host)
+        with self._lock:
+            client = self._sessions.get(key)
+            if client is None:
+                return None
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                return client
+            del self._sessions[key]
+        client.close()
+        return None
+
+    def _connect(self, host: "AnsibleHost", timeout: float = SSH_SESSION_CONNECT_TIMEOUT_SEC) -> paramiko.SSHClient:
+        """
+        Return an open session to the host, connecting only if there is no reusable one.
+        """
+        client = self._get(host)
+        if client is not None:
+            return client
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            client.connect(
+                host.ip_address,
+                port=host.port,
+                username=host.username,
+                password=host.password if host.password else None,
+                key_filename=None if host.password else host.ssh_private_key_file_path,
+                timeout=timeout,
+                banner_timeout=timeout,
+                auth_timeout=timeout,
+            )
+        except Exception:
+            client.close()
+            raise
+
+        with self._lock:
+            previous = self._sessions.get(self._get_key(host))
+            self._sessions[self._get_key(host)] = client
+        if previous is not None and previous is not client:
+            previous.close()
+
+        if self._control_master:
+            self._start_control_master(host)
+        return client
+
+    def _exec_command(self, host: "AnsibleHost", command: str, timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """
+        Run a command on the host over a pooled session, returns the exit code, stdout and stderr.
+        """
+        client = self._connect(host)
+        _, stdout, stderr = client.exec_command(command, timeout=timeout)
+        out = stdout.read().decode("utf-8", errors="replace")
+        err = stderr.read().decode("utf-8", errors="replace")
+        return stdout.channel.recv_exit_status(), out, err
+
+    def _open_sftp(self, host: "AnsibleHost") -> paramiko.SFTPClient:
+        """
+        Open an SFTP channel over a pooled session, the caller is responsible to close it.
+        """
+        return self._connect(host).open_sftp()
+
+    def _get_control_path(self, host: "AnsibleHost") -> str:
+        # Hashed to keep the socket path under the unix domain socket path length limit
+        digest = hashlib.sha1(self._get_key(host).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self._control_path_dir, digest)
+
+    def _build_control_master_cmd(self, host: "AnsibleHost", control_path: str) -> List[str]:
+        cmd = ["ssh", "-fN"]
+        for arg in SSH_COMMON_ARGS:
+            cmd += arg.split(" ", 1)
+        cmd += [
+            "-o",
+            "BatchMode=yes",
+            "-o",
+            "ControlMaster=yes",
+            "-o",
+            f"ControlPath={control_path}",
+            "-o",
+            f"ControlPersist={self._control_persist_sec}s",
+            "-p",
+            str(host.port),
+        ]
+        if host.ssh_private_key_file_path:
+            cmd += ["-i", host.ssh_private_key_file_path]
+        cmd.append(f"{host.username}@{host.ip_address}" if host.username else host.ip_address)
+        return cmd
+
+    def _is_control_master_alive(self, host: "AnsibleHost", control_path: str) -> bool:
+        if not os.path.exists(control_path):
+            return False
+        check_cmd = ["ssh", "-O", "check", "-o", f"ControlPath={control_path}", "-p", str(host.port), host.ip_address]
+        result = subprocess.run(check_cmd, capture_output=True, timeout=SSH_CONTROL_MASTER_START_TIMEOUT_SEC)
+        return result.returncode == 0
+
+    def _start_control_master(self, host: "AnsibleHost") -> Optional[str]:
+        """
+        Start a background OpenSSH ControlMaster for the host, returns its socket path.
+        Failures are not fatal, Ansible falls back to its own connections.
+        """
+        if host.password:
+            logger.debug(f"Skipping SSH control master for a password authenticated host. host: {host.host}")
+            return None
+        if shutil.which("ssh") is None:
+            logger.debug("Skipping SSH control master, ssh client is not installed")
+            return None
+
+        control_path = self._get_control_path(host)
+        try:
+            os.makedirs(self._control_path_dir, mode=0o700, exist_ok=True)
+            if not self._is_control_master_alive(host, control_path):
+                subprocess.run(
+                    self._build_control_master_cmd(host, control_path),
+                    check=True,
+                    capture_output=True,
+                    timeout=SSH_CONTROL_MASTER_START_TIMEOUT_SEC,
+                )
+        except Exception as ex:
+            logger.debug(f"Failed to start SSH control master. host: {host.host}, ex: {ex}")
+            return None
+
+        with self._lock:
+            self._control_paths[self._get_key(host)] = control_path
+        logger.debug(f"SSH control master is ready. host: {host.host}, path: {control_path}")
+        return control_path
+
+    def _get_ansible_ssh_common_args(self, host: "AnsibleHost") -> str:
+        """
+        Value for the host ansible_ssh_common_args inventory variable, points to a pre-warmed control master if any.
+        """
+        args = list(SSH_COMMON_ARGS)
+        with self._lock:
+            control_path = self._control_paths.get(self._get_key(host))
+        if control_path:
+            args += ["-o ControlMaster=auto", f"-o ControlPath={control_path}"]
+        return " ".join(args)
+
+    def _release_idle_sessions(self) -> None:
+        """
+        Close the pooled sessions unless control master is enabled, nothing reuses them afterwards.
+        """
+        if self._control_master:
+            return
+        self._close_all()
+
+    def _close_all(self) -> None:
+        """
+        Close all pooled sessions, control masters are left running until their ControlPersist expires.
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        for client in sessions:
+            try:
+                client.close()
+            except Exception as ex:
+                logger.debug(f"Failed to close SSH session. ex: {ex}")
+
+    get_fn = _get
+    connect_fn = _connect
+    exec_command_fn = _exec_command
+    open_sftp_fn = _open_sftp
+    start_control_master_fn = _start_control_master
+    get_ansible_ssh_common_args_fn = _get_ansible_ssh_common_args
+    release_idle_sessions_fn = _release_idle_sessions
+    close_all_fn = _close_all
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleHost
+from provisioner_shared.components.runtime.runner.ansible.ssh_readiness import SSHReadinessProber
+from provisioner_shared.components.runtime.runner.ansible.ssh_session_pool import SSHSessionPool
+
+SSH_SESSION_POOL_PKG_PATH = "provisioner_shared.components.runtime.runner.ansible.ssh_session_pool"
+
+KEY_HOST = AnsibleHost(
+    host="node-1", ip_address="192.168.1.1", username="pi", ssh_private_key_file_path="/home/pi/.ssh/id_rsa"
+)
+PASSWORD_HOST = AnsibleHost(host="node-2", ip_address="192.168.1.2", username="pi", password="raspberry")
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/runner/ansible/ssh_session_pool_test.py
+#
+@mock.patch(f"{SSH_SESSION_POOL_PKG_PATH}.atexit.register")
+@mock.patch(f"{SSH_SESSION_POOL_PKG_PATH}.paramiko.SSHClient")
+class SSHSessionPoolTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.control_path_dir = os.path.join(self.temp_dir.name, "cp")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_readiness_check_session_is_reused(self, mock_ssh_client, _):
+        pool = SSHSessionPool.create(control_master=False)
+        prober = SSHReadinessProber.create(deadline_sec=5, session_pool=pool)
+        report = prober.probe_hosts_fn([KEY_HOST])
+        self.assertTrue(report.is_all_ready())
+
+        client = mock_ssh_client.return_value
+        client.exec_command.return_value = (None, mock.MagicMock(), mock.MagicMock())
+        client.exec_command.return_value[1].read.return_value = b"Linux"
+        client.exec_command.return_value[1].channel.recv_exit_status.return_value = 0
+        client.exec_command.return_value[2].read.return_value = b""
+
+        self.assertEqual(pool.exec_command_fn(KEY_HOST, "uname"), (0, "Linux", ""))
+        client.connect.assert_called_once()
+        client.close.assert_not_called()
+
+    def test_reconnect_when_session_is_disconnected(self, mock_ssh_client, _):
+        pool = SSHSessionPool.create(control_master=False)
+        pool.connect_fn(KEY_HOST)
+        mock_ssh_client.return_value.get_transport.return_value.is_active.return_value = False
+        self.assertIsNone(pool.get_fn(KEY_HOST))
+        pool.connect_fn(KEY_HOST)
+        self.assertEqual(mock_ssh_client.return_value.connect.call_count, 2)
+
+    def test_close_all_sessions(self, mock_ssh_client, _):
+        pool = SSHSessionPool.create(control_master=False)
+        pool.connect_fn(KEY_HOST)
+        pool.close_all_fn()
+        mock_ssh_client.return_value.close.assert_called_once()
+        self.assertIsNone(pool.get_fn(KEY_HOST))
+
+    def test_release_idle_sessions_only_without_control_master(self, mock_ssh_client, _):
+        pool = SSHSessionPool.create(control_master=False)
+        pool.connect_fn(KEY_HOST)
+        pool.release_idle_sessions_fn()
+        mock_ssh_client.return_value.close.assert_called_once()
+        self.assertIsNone(pool.get_fn(KEY_HOST))
+
+        with mock.patch(f"{SSH_SESSION_POOL_PKG_PATH}.shutil.which", return_value=None):
+            control_master_pool = SSHSessionPool.create(control_master=True, control_path_dir=self.control_path_dir)
+            control_master_pool.connect_fn(KEY_HOST)
+        mock_ssh_client.return_value.close.reset_mock()
+        control_master_pool.release_idle_sessions_fn()
+        mock_ssh_client.return_value.close.assert_not_called()
+
+    @mock.patch(f"{SSH_SESSION_POOL_PKG_PATH}.shutil.which", return_value="/usr/bin/ssh")
+    @mock.patch(f"{SSH_SESSION_POOL_PKG_PATH}.subprocess.run")
+    def test_hand_control_master_to_ansible(self, mock_subprocess_run, mock_which, mock_ssh_client, _):
+        pool = SSHSessionPool.create(control_master=True, control_path_dir=self.control_path_dir)
+        pool.connect_fn(KEY_HOST)
+        pool.connect_fn(PASSWORD_HOST)
+
+        master_cmd = mock_subprocess_run.call_args.args[0]
+        self.assertEqual(master_cmd[:2], ["ssh", "-fN"])
+        self.assertIn("ControlMaster=yes", master_cmd)
+        self.assertIn("/home/pi/.ssh/id_rsa", master_cmd)
+        self.assertEqual(master_cmd[-1], "pi@192.168.1.1")
+        # Password authenticated hosts cannot use an OpenSSH control master
+        mock_subprocess_run.assert_called_once()
+
+        key_host_args = pool.get_ansible_ssh_common_args_fn(KEY_HOST)
+        self.assertIn(f"-o ControlPath={self.control_path_dir}{os.sep}", key_host_args)
+        self.assertIn("-o ControlMaster=auto", key_host_args)
+        self.assertEqual(
+            pool.get_ansible_ssh_common_args_fn(PASSWORD_HOST),
+            "-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from typing import Any, Callable
 
 from provisioner_shared.components.runtime.infra.context import Context
 from provisioner_shared.components.runtime.runner.ansible.ansible_runner import AnsibleRunnerLocal
+from provisioner_shared.components.runtime.runner.ansible.ssh_session_pool import SSHSessionPool
 from provisioner_shared.components.runtime.utils.checks import Checks
 from provisioner_shared.components.runtime.utils.editor import Editor
 from provisioner_shared.components.runtime.utils.github import GitHub
@@ -22,6 +23,7 @@ from provisioner_shared.components.runtime.utils.prompter import Prompter
 from provisioner_shared.components.runtime.utils.pypi_registry import PyPiRegistry
 from provisioner_shared.components.runtime.utils.randomizer import Randomizer
 from provisioner_shared.components.runtime.utils.summary import Summary
+from provisioner_shared.components.runtime.utils.yaml_cache import ParsedYamlCache
 from provisioner_shared.components.runtime.utils.yaml_util import YamlUtil
 
 
@@ -39,6 +41,7 @@ class CoreCollaborators:
         self.__progress_indicator: ProgressIndicator = None
         self.__process: Process = None
         self.__ansible_runner: AnsibleRunnerLocal = None
+        self.__ssh_session_pool: SSHSessionPool = None
         self.__network_util: NetworkUtil = None
         self.__github: GitHub = None
         self.__hosts_file: HostsFile = None
@@ -134,11 +137,20 @@ class CoreCollaborators:
                     self.process(),
                     self.progress_indicator(),
                     self.printer(),
+                    self.ssh_session_pool(),
                 )
             return self.__ansible_runner
 
         return self._lock_and_get(callback=create_ansible_runner)
 
+    def ssh_session_pool(self) -> SSHSessionPool:
+        def create_ssh_session_pool():
+            if not self.__ssh_session_pool:
+                self.__ssh_session_pool = SSHSessionPool.create()
+            return self.__ssh_session_pool
+
+        return self._lock_and_get(callback=create_ssh_session_pool)
+
     def network_util(self) -> NetworkUtil:
         def create_network_util():
             if not self.__network_util:
@@ -213,7 +225,7 @@ class CoreCollaborators:
     def yaml_util(self) -> YamlUtil:
         def create_yaml_util():
             if not self.__yaml_util:
-                self.__yaml_util = YamlUtil.create(self.__ctx, self.io_utils())
+                self.__yaml_util = YamlUtil.create(self.__ctx, self.io_utils(), ParsedYamlCache.create())
             return self.__yaml_util
 
         return self._lock_and_get(callback=create_yaml_util)
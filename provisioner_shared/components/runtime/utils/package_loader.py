@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 
+import concurrent.futures
+import functools
 import importlib
+import json
 import pathlib
 import subprocess
+from importlib import metadata, resources
 from types import ModuleType
 from typing import Callable, List, Optional
 
@@ -11,11 +15,16 @@ from loguru import logger
 from provisioner_shared.components.runtime.cli.modifiers import PackageManager
 from provisioner_shared.components.runtime.infra.context import Context
 from provisioner_shared.components.runtime.utils.io_utils import IOUtils
+from provisioner_shared.components.runtime.utils.plugin_discovery import PluginDiscoveryCache
 from provisioner_shared.components.runtime.utils.process import Process
 from provisioner_shared.components.runtime.utils.pypi_registry import PyPiRegistry
+from provisioner_shared.components.runtime.utils.startup_profiler import StartupProfiler
 from provisioner_shared.components.runtime.utils.version_compatibility import VersionCompatibility
 
 RUNTIME_PACKAGE_NAME = "provisioner-runtime"
+# Installed runtime package first, sources layout second (development)
+RUNTIME_RESOURCES_PYTHON_PACKAGES = ["provisioner_runtime.resources", "provisioner.resources"]
+RUNTIME_MANIFEST_FILE_NAME = "manifest.json"
 
 
 class PackageLoader:
@@ -24,19 +33,34 @@ class PackageLoader:
     _process: Process = None
     _pkg_mgr: PackageManager = None
     _pypi_registry: PyPiRegistry = None
+    _discovery_cache: PluginDiscoveryCache = None
 
-    def __init__(self, ctx: Context, io_utils: IOUtils, process: Process, pypi: PyPiRegistry) -> None:
+    def __init__(
+        self,
+        ctx: Context,
+        io_utils: IOUtils,
+        process: Process,
+        pypi: PyPiRegistry,
+        discovery_cache: Optional[PluginDiscoveryCache] = None,
+    ) -> None:
         self._ctx = ctx
         self._pkg_mgr = ctx.get_package_manager()
         self._io_utils = io_utils
         self._process = process
         self._pypi_registry = pypi
+        self._discovery_cache = discovery_cache if discovery_cache else PluginDiscoveryCache.create()
         self._cached_runtime_version: Optional[str] = None
 
     @staticmethod
-    def create(ctx: Context, io_utils: IOUtils, process: Process, pypi: PyPiRegistry) -> "PackageLoader":
+    def create(
+        ctx: Context,
+        io_utils: IOUtils,
+        process: Process,
+        pypi: PyPiRegistry,
+        discovery_cache: Optional[PluginDiscoveryCache] = None,
+    ) -> "PackageLoader":
         logger.debug(f"Creating package loader using {ctx._pkg_mgr} as package manager")
-        return PackageLoader(ctx, io_utils, process, pypi)
+        return PackageLoader(ctx, io_utils, process, pypi, discovery_cache)
 
     def _filter_by_keyword(self, pip_lines: List[str], filter_keyword: str, exclusions: List[str]) -> List[str]:
         filtered_packages = []
@@ -48,29 +72,118 @@ class PackageLoader:
         return filtered_packages
 
     def _import_modules(
-        self, packages: List[str], import_path: str, callback: Optional[Callable[[ModuleType], None]] = None
+        self,
+        packages: List[str],
+        import_path: str,
+        callback: Optional[Callable[[ModuleType], None]] = None,
+        defer: Optional[Callable[[str, Callable[[], None]], bool]] = None,
+        max_workers: Optional[int] = None,
+        prefetch: Optional[Callable[[str], None]] = None,
     ) -> None:
+        """
+        Import the packages modules and run the callback on each.
+
+        When a defer function is supplied, it is called with the package name and a loader function
+        which imports the module and runs the callback. If defer returns True the import is postponed
+        to whenever the loader gets called, otherwise the module is imported immediately.
+
+        When max_workers is greater than 1, the non deferred modules are imported concurrently on a
+        thread pool, each preceded by the prefetch function (i.e. pre-parsing the plugin configuration).
+        Callbacks always run on the calling thread in the original packages order.
+        """
         if packages is None:
             logger.warning("No packages to import")
             return
 
+        eager_packages = []
         for package in packages:
-            escaped_package_name = package.replace("-", "_")
-            plugin_import_path = f"{escaped_package_name}.{import_path}"
+            loader = functools.partial(self._import_module, package, import_path, callback)
+            if defer:
+                try:
+                    if defer(package, loader):
+                        logger.debug(f"Deferred module import. package: {package}")
+                        continue
+                except Exception as ex:
+                    logger.debug(f"Failed to defer module import, importing eagerly. package: {package}, ex: {ex}")
+            eager_packages.append(package)
+
+        if max_workers and max_workers > 1 and len(eager_packages) > 1:
+            self._import_modules_concurrently(eager_packages, import_path, callback, max_workers, prefetch)
+            return
+
+        for package in eager_packages:
+            self._import_module(package, import_path, callback)
 
+    def _import_modules_concurrently(
+        self,
+        packages: List[str],
+        import_path: str,
+        callback: Optional[Callable[[ModuleType], None]],
+        max_workers: int,
+        prefetch: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        logger.debug(f"Importing modules concurrently. workers: {max_workers}, packages: {packages}")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(packages))) as executor:
+            futures = [
+                executor.submit(self._prefetch_and_import_plugin_module, package, import_path, prefetch)
+                for package in packages
+            ]
+            # Results are consumed in submission order so registration stays deterministic
+            for package, future in zip(packages, futures):
+                plugin_main_module = future.result()
+                if plugin_main_module is not None:
+                    self._run_module_callback(package, import_path, plugin_main_module, callback)
+
+    def _prefetch_and_import_plugin_module(
+        self, package: str, import_path: str, prefetch: Optional[Callable[[str], None]] = None
+    ) -> Optional[ModuleType]:
+        if prefetch:
             try:
-                logger.debug(f"Importing module {plugin_import_path}")
-                plugin_main_module = importlib.import_module(plugin_import_path)
+                prefetch(package)
             except Exception as ex:
-                print(f"Failed to import module. import_path: {plugin_import_path}, ex: {ex}")
-                continue
+                logger.debug(f"Failed to prefetch module resources. package: {package}, ex: {ex}")
+        # Import time bookkeeping of the profiler is not thread safe, record a plain phase instead
+        return self._import_plugin_module(package, import_path, timed_as_import=False)
 
-            try:
-                if callback:
-                    logger.debug(f"Running module callback on {plugin_import_path}")
+    def _import_module(
+        self, package: str, import_path: str, callback: Optional[Callable[[ModuleType], None]] = None
+    ) -> None:
+        plugin_main_module = self._import_plugin_module(package, import_path)
+        if plugin_main_module is not None:
+            self._run_module_callback(package, import_path, plugin_main_module, callback)
+
+    def _import_plugin_module(
+        self, package: str, import_path: str, timed_as_import: Optional[bool] = True
+    ) -> Optional[ModuleType]:
+        escaped_package_name = package.replace("-", "_")
+        plugin_import_path = f"{escaped_package_name}.{import_path}"
+
+        profiler = StartupProfiler.instance()
+        phase_fn = profiler.import_phase_fn if timed_as_import else profiler.phase_fn
+        try:
+            logger.debug(f"Importing module {plugin_import_path}")
+            with phase_fn(f"plugin {escaped_package_name}: import"):
+                return importlib.import_module(plugin_import_path)
+        except Exception as ex:
+            print(f"Failed to import module. import_path: {plugin_import_path}, ex: {ex}")
+        return None
+
+    def _run_module_callback(
+        self,
+        package: str,
+        import_path: str,
+        plugin_main_module: ModuleType,
+        callback: Optional[Callable[[ModuleType], None]] = None,
+    ) -> None:
+        escaped_package_name = package.replace("-", "_")
+        plugin_import_path = f"{escaped_package_name}.{import_path}"
+        try:
+            if callback:
+                logger.debug(f"Running module callback on {plugin_import_path}")
+                with StartupProfiler.instance().phase_fn(f"plugin {escaped_package_name}: callback"):
                     callback(plugin_main_module)
-            except Exception as ex:
-                logger.error(f"Import module callback failed. import_path: {plugin_import_path}, ex: {ex}")
+        except Exception as ex:
+            logger.error(f"Import module callback failed. import_path: {plugin_import_path}, ex: {ex}")
 
     def _get_pip_installed_packages(
         self,
@@ -84,29 +197,11 @@ class PackageLoader:
         if not debug:
             logger.remove()
 
-        pip_lines: List[str] = None
-        try:
-            logger.debug(
-                f"About to retrieve pip packages. filter_keyword: {filter_keyword}, exclusions: {str(exclusions)}"
-            )
-            pip_install_cmd: List[str] = self._get_pip_cmd()
-            # Get the list of installed packages
-            output = subprocess.check_output(
-                pip_install_cmd
-                + [
-                    "list",
-                    "--no-color",
-                ]
-            )
-            # Decode the output and split it into lines
-            pip_lines = output.decode("utf-8").split("\n")
-            # for line in pip_lines:
-            #     print(line)
-            #     logger.debug(line)
-        except Exception as ex:
-            logger.error(
-                f"Failed to retrieve a list of pip packages, make sure {self._pkg_mgr} is properly installed. ex: {ex}"
-            )
+        logger.debug(
+            f"About to retrieve installed packages. filter_keyword: {filter_keyword}, exclusions: {str(exclusions)}"
+        )
+        pip_lines: List[str] = self._get_installed_package_names()
+        if pip_lines is None:
             return
 
         # Exclude provisioner-runtime and provisioner_runtime
@@ -121,11 +216,73 @@ class PackageLoader:
         # Apply version compatibility filtering if enabled
         if enable_version_filtering and runtime_version:
             logger.debug(f"Applying version compatibility filtering for runtime version: {runtime_version}")
-            filtered_packages = VersionCompatibility.filter_compatible_plugins(filtered_packages, runtime_version)
+            filtered_packages = VersionCompatibility.filter_compatible_plugins(
+                filtered_packages, runtime_version, index=self._get_plugins_compatibility_index(filtered_packages)
+            )
 
         logger.debug(f"Successfully retrieved the following packages: {str(filtered_packages)}")
         return filtered_packages
 
+    def _get_installed_package_names(self) -> Optional[List[str]]:
+        """
+        Resolve the installed package names, cheapest source first:
+          1. Persistent discovery cache (valid as long as site-packages were not modified)
+          2. In-process discovery via importlib.metadata
+          3. The configured package manager i.e. `pip list` / `uv pip list`
+        """
+        packages = self._discovery_cache.get_packages_fn()
+        if packages is not None:
+            return packages
+
+        try:
+            packages = self._discovery_cache.discover_packages_fn()
+        except Exception as ex:
+            logger.debug(f"In-process package discovery failed, falling back to {self._pkg_mgr}. ex: {ex}")
+            packages = None
+
+        if not packages:
+            packages = self._list_packages_from_package_manager()
+            if packages is None:
+                return None
+
+        self._discovery_cache.store_packages_fn(packages)
+        return packages
+
+    def _get_plugins_compatibility_index(self, packages: List[str]) -> Optional[dict]:
+        """
+        Return the compatibility index of the given plugin packages from the discovery cache,
+        re-indexing only plugins that are missing or whose manifest was modified.
+        """
+        try:
+            cached_index = self._discovery_cache.get_compatibility_index_fn()
+            index = VersionCompatibility.build_compatibility_index(packages, existing_index=cached_index)
+            if cached_index is None or any(cached_index.get(package) != index[package] for package in packages):
+                self._discovery_cache.store_compatibility_index_fn({**(cached_index or {}), **index})
+            return index
+        except Exception as ex:
+            logger.debug(f"Failed to resolve plugins compatibility index, checking plugins one by one. ex: {ex}")
+        return None
+
+    def _list_packages_from_package_manager(self) -> Optional[List[str]]:
+        try:
+            pip_install_cmd: List[str] = self._get_pip_cmd()
+            # Get the list of installed packages
+            output = subprocess.check_output(
+                pip_install_cmd
+                + [
+                    "list",
+                    "--no-color",
+                ]
+            )
+            # Decode the output and split it into lines, skip the table header lines
+            pip_lines = output.decode("utf-8").split("\n")
+            return [line.split()[0] for line in pip_lines[2:] if line.strip()]
+        except Exception as ex:
+            logger.error(
+                f"Failed to retrieve a list of pip packages, make sure {self._pkg_mgr} is properly installed. ex: {ex}"
+            )
+        return None
+
     def _load_modules(
         self,
         filter_keyword: str,
@@ -135,17 +292,21 @@ class PackageLoader:
         debug: Optional[bool] = False,
         enable_version_filtering: Optional[bool] = True,
         runtime_version: Optional[str] = None,
+        defer: Optional[Callable[[str, Callable[[], None]], bool]] = None,
+        max_workers: Optional[int] = None,
+        prefetch: Optional[Callable[[str], None]] = None,
     ) -> None:
 
-        filtered_packages = self._get_pip_installed_packages(
-            filter_keyword=filter_keyword,
-            exclusions=exclusions,
-            debug=debug,
-            enable_version_filtering=enable_version_filtering,
-            runtime_version=runtime_version,
-        )
+        with StartupProfiler.instance().phase_fn("plugins discovery"):
+            filtered_packages = self._get_pip_installed_packages(
+                filter_keyword=filter_keyword,
+                exclusions=exclusions,
+                debug=debug,
+                enable_version_filtering=enable_version_filtering,
+                runtime_version=runtime_version,
+            )
 
-        self._import_modules(filtered_packages, import_path, callback)
+        self._import_modules(filtered_packages, import_path, callback, defer, max_workers, prefetch)
 
     def _is_module_loaded(self, module_name: str) -> bool:
         result = False
@@ -186,6 +347,8 @@ class PackageLoader:
         except Exception as ex:
             logger.error(f"Failed to install pip package. name: {package_name}, ex: {ex}")
             raise ex
+        finally:
+            self._discovery_cache.invalidate_fn()
 
     def _uninstall_pip_package(self, package_name: str) -> None:
         try:
@@ -203,6 +366,8 @@ class PackageLoader:
         except Exception as ex:
             logger.error(f"Failed to uninstall pip package. name: {package_name}, ex: {ex}")
             raise ex
+        finally:
+            self._discovery_cache.invalidate_fn()
 
     def _get_pip_cmd(self) -> List[str]:
         # return ["python3", "-m", "pip"]
@@ -272,58 +437,46 @@ class PackageLoader:
             else:
                 print(f"Error: Expected tarball {expected_tarball} not found in {project_path / 'dist'}!")
 
-    def _get_runtime_version_from_pip(self) -> Optional[str]:
+    def _get_runtime_version_from_metadata(self) -> Optional[str]:
         """
-        Try to get runtime version from installed runtime package.
+        Try to get runtime version from the installed runtime distribution metadata (in-process).
 
         Returns:
             Runtime version string if found, None otherwise
         """
-        pip_cmd = self._get_pip_cmd()
-        runtime_version = VersionCompatibility.get_package_version_from_pip(pip_cmd, RUNTIME_PACKAGE_NAME)
-        if runtime_version:
-            logger.debug(f"Found runtime version from pip: {runtime_version}")
-            return runtime_version
+        try:
+            runtime_version = metadata.version(RUNTIME_PACKAGE_NAME)
+            if runtime_version:
+                logger.debug(f"Found runtime version from package metadata: {runtime_version}")
+                return runtime_version
+        except metadata.PackageNotFoundError:
+            logger.debug(f"Runtime package metadata not found. name: {RUNTIME_PACKAGE_NAME}")
+        except Exception as e:
+            logger.debug(f"Error reading runtime package metadata: {e}")
         return None
 
-    def _get_runtime_version_from_local_files(self) -> Optional[str]:
+    def _get_runtime_version_from_bundled_manifest(self) -> Optional[str]:
         """
-        Try to get runtime version from local manifest.json file (for development).
+        Try to get runtime version from the manifest.json bundled with the runtime package,
+        supports both an installed runtime and running from sources (for development).
 
         Returns:
             Runtime version string if found, None otherwise
         """
-        try:
-            import json
-            import pathlib
-
-            # Try different potential paths for the runtime manifest.json
-            potential_paths = [
-                "provisioner/resources/manifest.json",
-                "../provisioner/resources/manifest.json",
-                "../../provisioner/resources/manifest.json",
-                # Also try relative to the current package
-                pathlib.Path(__file__).parent.parent.parent.parent.parent
-                / "provisioner"
-                / "resources"
-                / "manifest.json",
-            ]
-
-            for path in potential_paths:
-                manifest_content = self._io_utils.read_file_safe_fn(path)
-                if manifest_content:
-                    try:
-                        manifest_data = json.loads(manifest_content.strip())
-                        version = manifest_data.get("version")
-                        if version:
-                            logger.debug(f"Found runtime version from local manifest {path}: {version}")
-                            return version
-                    except json.JSONDecodeError as e:
-                        logger.debug(f"Invalid JSON in manifest file {path}: {e}")
-                        continue
+        for package in RUNTIME_RESOURCES_PYTHON_PACKAGES:
+            try:
+                manifest_content = resources.files(package).joinpath(RUNTIME_MANIFEST_FILE_NAME).read_text()
+            except Exception as e:
+                logger.debug(f"Runtime manifest not found. package: {package}, ex: {e}")
+                continue
 
-        except Exception as e:
-            logger.debug(f"Error reading local manifest files: {e}")
+            try:
+                version = json.loads(manifest_content.strip()).get("version")
+                if version:
+                    logger.debug(f"Found runtime version from bundled manifest. package: {package}, version: {version}")
+                    return version
+            except json.JSONDecodeError as e:
+                logger.debug(f"Invalid JSON in runtime manifest. package: {package}, ex: {e}")
 
         return None
 
@@ -341,9 +494,11 @@ class PackageLoader:
             return pypi_version
         return None
 
-    def _get_runtime_version(self) -> Optional[str]:
+    def _get_runtime_version(self, allow_network: Optional[bool] = False) -> Optional[str]:
         """
         Get the current runtime version, trying multiple methods.
+        Local sources are resolved in-process, PyPI is queried only when allow_network is set
+        to prevent a network call on the CLI startup path.
 
         Returns:
             Runtime version string if found, None otherwise
@@ -351,23 +506,24 @@ class PackageLoader:
         if self._cached_runtime_version is not None:
             return self._cached_runtime_version
 
-        # Method 1: Try to get from installed runtime package
-        runtime_version = self._get_runtime_version_from_pip()
+        # Method 1: Try to get from installed runtime package metadata
+        runtime_version = self._get_runtime_version_from_metadata()
         if runtime_version:
             self._cached_runtime_version = runtime_version
             return runtime_version
 
-        # Method 2: Try to get from local manifest.json file (for development)
-        runtime_version = self._get_runtime_version_from_local_files()
+        # Method 2: Try to get from the bundled manifest.json file
+        runtime_version = self._get_runtime_version_from_bundled_manifest()
         if runtime_version:
             self._cached_runtime_version = runtime_version
             return runtime_version
 
-        # Method 3: Try to get latest version from PyPI as fallback (runtime package ONLY)
-        runtime_version = self._get_runtime_version_from_pypi()
-        if runtime_version:
-            self._cached_runtime_version = runtime_version
-            return runtime_version
+        # Method 3: Try to get latest version from PyPI, explicit request only (runtime package ONLY)
+        if allow_network:
+            runtime_version = self._get_runtime_version_from_pypi()
+            if runtime_version:
+                self._cached_runtime_version = runtime_version
+                return runtime_version
 
         logger.warning("Could not determine runtime version from any source")
         return None
@@ -379,12 +535,16 @@ class PackageLoader:
         exclusions: Optional[List[str]] = [],
         callback: Optional[Callable[[ModuleType], None]] = None,
         debug: Optional[bool] = False,
+        defer: Optional[Callable[[str, Callable[[], None]], bool]] = None,
+        max_workers: Optional[int] = None,
+        prefetch: Optional[Callable[[str], None]] = None,
     ) -> None:
         """
         Load modules with automatic runtime version detection and compatibility checking.
         This is the preferred method for loading plugins as it automatically applies version filtering.
         """
-        runtime_version = self._get_runtime_version()
+        with StartupProfiler.instance().phase_fn("runtime version"):
+            runtime_version = self._get_runtime_version()
 
         self._load_modules(
             filter_keyword=filter_keyword,
@@ -394,6 +554,9 @@ class PackageLoader:
             debug=debug,
             enable_version_filtering=True,
             runtime_version=runtime_version,
+            defer=defer,
+            max_workers=max_workers,
+            prefetch=prefetch,
         )
 
     load_modules_fn = _load_modules
@@ -406,3 +569,4 @@ class PackageLoader:
     uninstall_pip_package_fn = _uninstall_pip_package
     build_sdists_fn = _build_sdists
     get_runtime_version_fn = _get_runtime_version
+    get_plugins_compatibility_index_fn = _get_plugins_compatibility_index
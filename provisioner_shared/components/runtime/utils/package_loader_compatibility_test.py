@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
+import json
 import unittest
+from importlib import metadata
 from unittest import mock
 
 from provisioner_shared.components.runtime.utils.package_loader import PackageLoader
@@ -27,71 +29,72 @@ class PackageLoaderCompatibilityTest(unittest.TestCase):
             ctx=self.mock_ctx, io_utils=self.mock_io_utils, process=self.mock_process, pypi=self.mock_pypi_registry
         )
 
-    @mock.patch(
-        "provisioner_shared.components.runtime.utils.package_loader.VersionCompatibility.get_package_version_from_pip"
-    )
-    def test_get_runtime_version_from_pip_success(self, mock_get_version):
-        """Test getting runtime version from pip package"""
-        mock_get_version.return_value = "0.1.15"
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.metadata.version")
+    def test_get_runtime_version_from_metadata_success(self, mock_version):
+        """Test getting runtime version from installed package metadata"""
+        mock_version.return_value = "0.1.15"
 
         result = self.loader._get_runtime_version()
 
         self.assertEqual(result, "0.1.15")
+        mock_version.assert_called_once_with("provisioner-runtime")
 
-    def test_get_runtime_version_from_manifest_file(self):
-        """Test getting runtime version from manifest.json file"""
-        # Mock pip method failing
-        with mock.patch(
-            "provisioner_shared.components.runtime.utils.package_loader.VersionCompatibility.get_package_version_from_pip"
-        ) as mock_pip:
-            mock_pip.return_value = None
-            # Mock io_utils to return manifest content
-            self.mock_io_utils.read_file_safe_fn.side_effect = [
-                '{"version": "0.1.16"}',
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-            ]
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.subprocess")
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.metadata.version")
+    def test_get_runtime_version_does_not_spawn_package_manager(self, mock_version, mock_subprocess):
+        """Test runtime version resolution never shells out to pip"""
+        mock_version.return_value = "0.1.15"
+
+        self.loader._get_runtime_version()
+
+        mock_subprocess.run.assert_not_called()
+        mock_subprocess.check_output.assert_not_called()
 
+    def test_get_runtime_version_from_bundled_manifest(self):
+        """Test getting runtime version from the bundled manifest.json file"""
+        with mock.patch(
+            "provisioner_shared.components.runtime.utils.package_loader.metadata.version",
+            side_effect=metadata.PackageNotFoundError("provisioner-runtime"),
+        ):
             result = self.loader._get_runtime_version()
 
-            self.assertEqual(result, "0.1.16")
+            # Running from sources, resolved from provisioner/resources/manifest.json
+            with open("provisioner/resources/manifest.json", "r") as f:
+                self.assertEqual(result, json.load(f)["version"])
+            self.mock_pypi_registry._get_package_version_fn.assert_not_called()
+
+    def test_get_runtime_version_does_not_use_pypi_by_default(self):
+        """Test PyPI is not queried on the startup path"""
+        with mock.patch.object(self.loader, "_get_runtime_version_from_metadata", return_value=None):
+            with mock.patch.object(self.loader, "_get_runtime_version_from_bundled_manifest", return_value=None):
+                self.mock_pypi_registry._get_package_version_fn.return_value = "0.1.17"
+
+                result = self.loader._get_runtime_version()
+
+                self.assertIsNone(result)
+                self.mock_pypi_registry._get_package_version_fn.assert_not_called()
 
     def test_get_runtime_version_from_pypi_fallback(self):
-        """Test getting runtime version from PyPI as fallback"""
-        # Mock pip method failing
-        with mock.patch(
-            "provisioner_shared.components.runtime.utils.package_loader.VersionCompatibility.get_package_version_from_pip"
-        ) as mock_pip:
-            mock_pip.return_value = None
-            # Mock all local manifest.json files failing
-            self.mock_io_utils.read_file_safe_fn.return_value = None
-            # Mock PyPI registry success
-            self.mock_pypi_registry._get_package_version_fn.return_value = "0.1.17"
+        """Test getting runtime version from PyPI as fallback when explicitly allowed"""
+        with mock.patch.object(self.loader, "_get_runtime_version_from_metadata", return_value=None):
+            with mock.patch.object(self.loader, "_get_runtime_version_from_bundled_manifest", return_value=None):
+                # Mock PyPI registry success
+                self.mock_pypi_registry._get_package_version_fn.return_value = "0.1.17"
 
-            result = self.loader._get_runtime_version()
+                result = self.loader._get_runtime_version(allow_network=True)
 
-            self.assertEqual(result, "0.1.17")
-            self.mock_pypi_registry._get_package_version_fn.assert_called_once_with("provisioner-runtime")
+                self.assertEqual(result, "0.1.17")
+                self.mock_pypi_registry._get_package_version_fn.assert_called_once_with("provisioner-runtime")
 
     def test_get_runtime_version_all_methods_fail(self):
         """Test runtime version detection when all methods fail"""
-        # Mock all methods failing
-        with mock.patch(
-            "provisioner_shared.components.runtime.utils.package_loader.VersionCompatibility.get_package_version_from_pip"
-        ) as mock_pip:
-            mock_pip.return_value = None
-            # Mock all local manifest.json files failing
-            self.mock_io_utils.read_file_safe_fn.return_value = None
-            self.mock_pypi_registry._get_package_version_fn.return_value = None
+        with mock.patch.object(self.loader, "_get_runtime_version_from_metadata", return_value=None):
+            with mock.patch.object(self.loader, "_get_runtime_version_from_bundled_manifest", return_value=None):
+                self.mock_pypi_registry._get_package_version_fn.return_value = None
 
-            result = self.loader._get_runtime_version()
+                result = self.loader._get_runtime_version(allow_network=True)
 
-            self.assertIsNone(result)
+                self.assertIsNone(result)
 
     def test_load_modules_with_version_check_fn_compatible_plugins(self):
         """Test loading modules with version compatibility filtering"""
@@ -114,6 +117,9 @@ class PackageLoaderCompatibilityTest(unittest.TestCase):
                     debug=False,
                     enable_version_filtering=True,
                     runtime_version="0.1.15",
+                    defer=None,
+                    max_workers=None,
+                    prefetch=None,
                 )
 
     def test_load_modules_with_version_check_fn_no_runtime_version(self):
@@ -134,6 +140,9 @@ class PackageLoaderCompatibilityTest(unittest.TestCase):
                     debug=False,
                     enable_version_filtering=True,
                     runtime_version=None,
+                    defer=None,
+                    max_workers=None,
+                    prefetch=None,
                 )
 
     def test_load_modules_with_version_check_fn_returns_callable(self):
@@ -143,21 +152,19 @@ class PackageLoaderCompatibilityTest(unittest.TestCase):
 
     def test_runtime_version_caching(self):
         """Test that runtime version is cached after first retrieval"""
-        with mock.patch(
-            "provisioner_shared.components.runtime.utils.package_loader.VersionCompatibility.get_package_version_from_pip"
-        ) as mock_pip:
-            mock_pip.return_value = "0.1.15"
+        with mock.patch("provisioner_shared.components.runtime.utils.package_loader.metadata.version") as mock_version:
+            mock_version.return_value = "0.1.15"
 
-            # First call should query pip
+            # First call should read the package metadata
             result1 = self.loader._get_runtime_version()
             self.assertEqual(result1, "0.1.15")
 
-            # Second call should use cached value (pip not called again)
+            # Second call should use cached value (metadata not read again)
             result2 = self.loader._get_runtime_version()
             self.assertEqual(result2, "0.1.15")
 
-            # Verify pip was only called once (caching works)
-            self.assertEqual(mock_pip.call_count, 1)
+            # Verify metadata was only read once (caching works)
+            self.assertEqual(mock_version.call_count, 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.cli.modifiers import PackageManager
+from provisioner_shared.components.runtime.utils.package_loader import PackageLoader
+
+PACKAGE_LOADER_PKG_PATH = "provisioner_shared.components.runtime.utils.package_loader"
+
+
+#
+# To run these directly from the terminal use:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/utils/package_loader_test.py
+#
+class PackageLoaderConcurrentImportTestShould(unittest.TestCase):
+    def setUp(self):
+        self.mock_ctx = mock.Mock()
+        self.mock_ctx.get_package_manager.return_value = PackageManager.PIP
+        self.loader = PackageLoader(
+            ctx=self.mock_ctx,
+            io_utils=mock.Mock(),
+            process=mock.Mock(),
+            pypi=mock.Mock(),
+            discovery_cache=mock.Mock(),
+        )
+
+    @mock.patch(f"{PACKAGE_LOADER_PKG_PATH}.importlib.import_module")
+    def test_callbacks_run_on_calling_thread_in_original_order(self, mock_import_module):
+        def slow_first_import(import_path: str):
+            # First plugin finishes importing last, registration order must not change
+            if import_path.startswith("plugin_a"):
+                time.sleep(0.05)
+            return mock.Mock(name=import_path, import_path=import_path)
+
+        mock_import_module.side_effect = slow_first_import
+        callback_order = []
+        callback_threads = set()
+
+        def callback(module):
+            callback_order.append(module.import_path)
+            callback_threads.add(threading.current_thread())
+
+        prefetch = mock.MagicMock()
+        self.loader._import_modules(
+            ["plugin_a", "plugin_b", "plugin_c"], "main", callback, max_workers=3, prefetch=prefetch
+        )
+        self.assertEqual(callback_order, ["plugin_a.main", "plugin_b.main", "plugin_c.main"])
+        self.assertEqual(callback_threads, {threading.current_thread()})
+        self.assertEqual(sorted(call.args[0] for call in prefetch.call_args_list), ["plugin_a", "plugin_b", "plugin_c"])
+
+    @mock.patch(f"{PACKAGE_LOADER_PKG_PATH}.importlib.import_module")
+    def test_failed_import_or_prefetch_does_not_stop_other_plugins(self, mock_import_module):
+        def failing_import(import_path: str):
+            if import_path.startswith("plugin_b"):
+                raise ImportError("broken plugin")
+            return mock.Mock(import_path=import_path)
+
+        mock_import_module.side_effect = failing_import
+        callback = mock.MagicMock()
+        prefetch = mock.MagicMock(side_effect=Exception("prefetch failure"))
+        self.loader._import_modules(
+            ["plugin_a", "plugin_b", "plugin_c"], "main", callback, max_workers=2, prefetch=prefetch
+        )
+        self.assertEqual(
+            [call.args[0].import_path for call in callback.call_args_list], ["plugin_a.main", "plugin_c.main"]
+        )
+
+    @mock.patch(f"{PACKAGE_LOADER_PKG_PATH}.concurrent.futures.ThreadPoolExecutor")
+    @mock.patch(f"{PACKAGE_LOADER_PKG_PATH}.importlib.import_module")
+    def test_sequential_import_by_default(self, mock_import_module, mock_executor):
+        prefetch = mock.MagicMock()
+        self.loader._import_modules(["plugin_a", "plugin_b"], "main", mock.MagicMock(), prefetch=prefetch)
+        mock_executor.assert_not_called()
+        prefetch.assert_not_called()
+        mock_import_module.assert_any_call("plugin_a.main")
+        mock_import_module.assert_any_call("plugin_b.main")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,15 +3,36 @@
 import os
 import pathlib
 import sys
+import threading
 from importlib import resources
 from importlib.resources import files
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from loguru import logger
 
 from provisioner_shared.components.runtime.infra.context import Context
 
+# Installed packages do not move while the process runs, resolved package resource paths are
+# shared by all Paths instances and kept for the process lifetime
+_package_paths_cache: Dict[Tuple[str, str, str], Any] = {}
+_package_paths_cache_lock = threading.Lock()
+
+
+def clear_package_paths_cache() -> None:
+    with _package_paths_cache_lock:
+        _package_paths_cache.clear()
+
+
+def _get_cached_package_path(kind: str, package: str, name: str, resolve_fn) -> Any:
+    key = (kind, package, name)
+    resolved = _package_paths_cache.get(key)
+    if resolved is None:
+        resolved = resolve_fn()
+        with _package_paths_cache_lock:
+            resolved = _package_paths_cache.setdefault(key, resolved)
+    return resolved
+
 
 class Paths:
 
@@ -104,6 +125,11 @@ class Paths:
     def _get_file_path_from_python_package(self, package: str, filename: str) -> str:
         if self._dry_run:
             return "DRY_RUN_RESPONSE"
+        return _get_cached_package_path(
+            "file", package, filename, lambda: self._resolve_file_path_from_python_package(package, filename)
+        )
+
+    def _resolve_file_path_from_python_package(self, package: str, filename: str) -> str:
         # Get the context manager for the resource path
         with files(package).joinpath(filename) as ctxMgrPath:
             # Convert the context manager to a string
@@ -115,7 +141,7 @@ class Paths:
     def _get_dir_path_from_python_package(self, package: str, dirname: str) -> str:
         if self._dry_run:
             return "DRY_RUN_RESPONSE"
-        return resources.files(package).joinpath(dirname)
+        return _get_cached_package_path("dir", package, dirname, lambda: resources.files(package).joinpath(dirname))
 
     get_home_directory_fn = _get_home_directory
     get_current_directory_fn = _get_current_directory
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.infra.context import Context
+from provisioner_shared.components.runtime.utils import paths as paths_module
+from provisioner_shared.components.runtime.utils.paths import Paths, clear_package_paths_cache
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/utils/paths_test.py
+#
+class PathsTestShould(unittest.TestCase):
+    def setUp(self):
+        clear_package_paths_cache()
+
+    def tearDown(self):
+        clear_package_paths_cache()
+
+    def test_resolve_package_dir_path_once_per_process(self):
+        with mock.patch.object(paths_module.resources, "files", wraps=paths_module.resources.files) as mock_files:
+            first = Paths.create(Context.create()).get_dir_path_from_python_package(
+                "provisioner_shared.components.runtime.runner.ansible", "resources"
+            )
+            second = Paths.create(Context.create()).get_dir_path_from_python_package(
+                "provisioner_shared.components.runtime.runner.ansible", "resources"
+            )
+        self.assertEqual(str(first), str(second))
+        self.assertTrue(str(first).endswith("resources"))
+        mock_files.assert_called_once()
+
+    def test_not_cache_dry_run_responses(self):
+        self.assertEqual(
+            Paths.create(Context.create(dry_run=True)).get_dir_path_from_python_package("any.package", "dir"),
+            "DRY_RUN_RESPONSE",
+        )
+        self.assertNotEqual(
+            str(
+                Paths.create(Context.create()).get_dir_path_from_python_package(
+                    "provisioner_shared.components.runtime.runner.ansible", "resources"
+                )
+            ),
+            "DRY_RUN_RESPONSE",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
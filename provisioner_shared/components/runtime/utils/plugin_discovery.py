@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import importlib.util
+import json
+import os
+import sys
+from importlib import metadata
+from typing import Dict, List, Optional, Set
+
+from loguru import logger
+
+PLUGINS_DISCOVERY_CACHE_PATH = os.path.expanduser("~/.config/provisioner/cache/plugins_discovery.json")
+PLUGINS_DISCOVERY_CACHE_VERSION = 1
+
+SITE_PACKAGES_DIR_NAMES = ("site-packages", "dist-packages")
+
+PLUGIN_MANIFEST_RELATIVE_PATH = os.path.join("resources", "manifest.json")
+PLUGIN_MANIFEST_COMMANDS_KEY = "commands"
+PLUGIN_CONFIG_RELATIVE_PATH = os.path.join("resources", "config.yaml")
+
+
+def get_plugin_package_path(package_name: str) -> Optional[str]:
+    """
+    Locate a top level plugin package directory without importing it.
+    """
+    normalized_name = package_name.replace("-", "_")
+    spec = importlib.util.find_spec(normalized_name)
+    if spec is None or spec.origin is None:
+        return None
+    return os.path.dirname(spec.origin)
+
+
+def get_plugin_internal_config_path(package_name: str) -> Optional[str]:
+    """
+    Return the plugin internal configuration path i.e. <plugin>/resources/config.yaml, None if missing.
+    """
+    package_path = get_plugin_package_path(package_name)
+    if package_path is None:
+        return None
+    config_path = os.path.join(package_path, PLUGIN_CONFIG_RELATIVE_PATH)
+    return config_path if os.path.isfile(config_path) else None
+
+
+def read_plugin_manifest(package_name: str) -> Optional[dict]:
+    """
+    Read a plugin resources/manifest.json without importing the plugin package.
+    """
+    try:
+        package_path = get_plugin_package_path(package_name)
+        if package_path is None:
+            return None
+        with open(os.path.join(package_path, PLUGIN_MANIFEST_RELATIVE_PATH), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as ex:
+        logger.debug(f"Could not read plugin manifest. package: {package_name}, ex: {ex}")
+    return None
+
+
+def read_plugin_commands(package_name: str) -> Optional[Dict[str, str]]:
+    """
+    Return the root level commands a plugin attaches to the CLI as declared on its manifest, e.g.
+      "commands": {"install": "Install anything anywhere on any OS/Arch"}
+    A list of command names is supported as well. Returns None if the plugin doesn't declare any.
+    """
+    manifest = read_plugin_manifest(package_name)
+    if not manifest:
+        return None
+    commands = manifest.get(PLUGIN_MANIFEST_COMMANDS_KEY)
+    if isinstance(commands, dict) and len(commands) > 0:
+        return {str(name): str(short_help or "") for name, short_help in commands.items()}
+    if isinstance(commands, list) and len(commands) > 0:
+        return {str(name): "" for name in commands}
+    return None
+
+
+class PluginDiscoveryCache:
+    """
+    Persistent cache of the Python distributions installed on the current interpreter.
+
+    The cache is keyed on a fingerprint of the interpreter prefix and the modification
+    times of its site-packages directories. Installing or removing a distribution adds or
+    removes a *.dist-info folder, which bumps the directory mtime and renders the cache stale.
+    """
+
+    _cache_path: str
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        self._cache_path = cache_path if cache_path else PLUGINS_DISCOVERY_CACHE_PATH
+
+    @staticmethod
+    def create(cache_path: Optional[str] = None) -> "PluginDiscoveryCache":
+        logger.debug("Creating plugin discovery cache...")
+        return PluginDiscoveryCache(cache_path)
+
+    def _get_site_packages_dirs(self) -> List[str]:
+        # Dict keys keep the sys.path order without duplicates
+        result: Dict[str, None] = {}
+        for path in sys.path:
+            if path and os.path.basename(path.rstrip(os.sep)) in SITE_PACKAGES_DIR_NAMES and os.path.isdir(path):
+                result[path] = None
+        return list(result)
+
+    def _compute_fingerprint(self) -> dict:
+        dirs_mtime = {}
+        for site_dir in self._get_site_packages_dirs():
+            try:
+                dirs_mtime[site_dir] = os.stat(site_dir).st_mtime_ns
+            except OSError:
+                continue
+        return {
+            "version": PLUGINS_DISCOVERY_CACHE_VERSION,
+            "prefix": sys.prefix,
+            "site_dirs": dirs_mtime,
+        }
+
+    def _read_cache(self) -> Optional[dict]:
+        try:
+            with open(self._cache_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            logger.debug(f"Failed to read plugin discovery cache, ignoring. path: {self._cache_path}, ex: {ex}")
+        return None
+
+    def _write_cache(self, content: dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(content, f)
+            # Atomic replace to prevent concurrent CLI invocations from reading a partial file
+            os.replace(tmp_path, self._cache_path)
+        except Exception as ex:
+            logger.debug(f"Failed to write plugin discovery cache. path: {self._cache_path}, ex: {ex}")
+
+    def _get_packages(self) -> Optional[List[str]]:
+        """
+        Return the cached installed package names, None if the cache is missing or stale.
+        """
+        cached = self._read_cache()
+        if cached is None:
+            logger.debug("Plugin discovery cache is empty")
+            return None
+        if cached.get("fingerprint") != self._compute_fingerprint():
+            logger.debug("Plugin discovery cache is stale")
+            return None
+        packages = cached.get("packages")
+        if packages is None:
+            return None
+        logger.debug(f"Plugin discovery cache hit. packages: {len(packages)}")
+        return packages
+
+    def _discover_packages(self) -> List[str]:
+        """
+        In-process discovery of installed distributions using importlib.metadata,
+        equivalent to the package names column of `pip list`.
+        """
+        names: Set[str] = set()
+        for dist in metadata.distributions():
+            name = dist.metadata["Name"] if dist.metadata else None
+            if name:
+                names.add(name)
+        return sorted(names)
+
+    def _store_packages(self, packages: List[str]) -> None:
+        self._write_cache({"fingerprint": self._compute_fingerprint(), "packages": packages})
+
+    def _get_compatibility_index(self) -> Optional[dict]:
+        """
+        Return the cached plugins compatibility index, None if the cache is missing or stale.
+        """
+        cached = self._read_cache()
+        if cached is None or cached.get("fingerprint") != self._compute_fingerprint():
+            return None
+        return cached.get("compatibility")
+
+    def _store_compatibility_index(self, index: dict) -> None:
+        """
+        Store the plugins compatibility index next to the cached packages, discarding stale packages.
+        """
+        fingerprint = self._compute_fingerprint()
+        cached = self._read_cache()
+        content = {"fingerprint": fingerprint}
+        if cached is not None and cached.get("fingerprint") == fingerprint and "packages" in cached:
+            content["packages"] = cached["packages"]
+        content["compatibility"] = index
+        self._write_cache(content)
+
+    def _invalidate(self) -> None:
+        try:
+            os.remove(self._cache_path)
+            logger.debug(f"Invalidated plugin discovery cache. path: {self._cache_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            logger.debug(f"Failed to invalidate plugin discovery cache. path: {self._cache_path}, ex: {ex}")
+
+    get_packages_fn = _get_packages
+    discover_packages_fn = _discover_packages
+    store_packages_fn = _store_packages
+    get_compatibility_index_fn = _get_compatibility_index
+    store_compatibility_index_fn = _store_compatibility_index
+    invalidate_fn = _invalidate
+    get_fingerprint_fn = _compute_fingerprint
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.cli.modifiers import PackageManager
+from provisioner_shared.components.runtime.utils.package_loader import PackageLoader
+from provisioner_shared.components.runtime.utils.plugin_discovery import PluginDiscoveryCache
+
+
+#
+# To run these directly from the terminal use:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/utils/plugin_discovery_test.py
+#
+class PluginDiscoveryCacheTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.site_dir = os.path.join(self.temp_dir.name, "site-packages")
+        os.makedirs(self.site_dir)
+        self.cache_path = os.path.join(self.temp_dir.name, "cache", "plugins_discovery.json")
+        self.cache = PluginDiscoveryCache.create(cache_path=self.cache_path)
+        self.sys_path_patcher = mock.patch(
+            "provisioner_shared.components.runtime.utils.plugin_discovery.sys.path", [self.site_dir]
+        )
+        self.sys_path_patcher.start()
+
+    def tearDown(self):
+        self.sys_path_patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_empty_cache_returns_none(self):
+        self.assertIsNone(self.cache.get_packages_fn())
+
+    def test_store_and_get_packages(self):
+        self.cache.store_packages_fn(["provisioner-runtime", "provisioner_examples_plugin"])
+        self.assertEqual(self.cache.get_packages_fn(), ["provisioner-runtime", "provisioner_examples_plugin"])
+
+    def test_cache_is_stale_when_site_packages_change(self):
+        self.cache.store_packages_fn(["provisioner-runtime"])
+        # Simulate a new *.dist-info folder added by a package installation
+        os.makedirs(os.path.join(self.site_dir, "provisioner_examples_plugin-0.1.0.dist-info"))
+        stat = os.stat(self.site_dir)
+        os.utime(self.site_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertIsNone(self.cache.get_packages_fn())
+
+    def test_invalidate_removes_cache(self):
+        self.cache.store_packages_fn(["provisioner-runtime"])
+        self.cache.invalidate_fn()
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.assertIsNone(self.cache.get_packages_fn())
+
+    def test_corrupted_cache_is_ignored(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w") as f:
+            f.write("{not-a-json")
+        self.assertIsNone(self.cache.get_packages_fn())
+
+    def test_store_compatibility_index_keeps_packages(self):
+        self.cache.store_packages_fn(["provisioner_examples_plugin"])
+        self.cache.store_compatibility_index_fn({"provisioner_examples_plugin": {"range": "^0.1.0"}})
+        self.assertEqual(self.cache.get_packages_fn(), ["provisioner_examples_plugin"])
+        self.assertEqual(self.cache.get_compatibility_index_fn(), {"provisioner_examples_plugin": {"range": "^0.1.0"}})
+
+    def test_discover_packages_from_metadata(self):
+        dist_info_dir = os.path.join(self.site_dir, "provisioner_examples_plugin-0.1.0.dist-info")
+        os.makedirs(dist_info_dir)
+        with open(os.path.join(dist_info_dir, "METADATA"), "w") as f:
+            f.write("Metadata-Version: 2.1\nName: provisioner_examples_plugin\nVersion: 0.1.0\n")
+        self.assertEqual(self.cache.discover_packages_fn(), ["provisioner_examples_plugin"])
+
+    def test_discover_packages_without_duplicates(self):
+        dists = [mock.Mock(metadata={"Name": name}) for name in ["b_plugin", "a_plugin", "b_plugin"]]
+        with mock.patch(
+            "provisioner_shared.components.runtime.utils.plugin_discovery.metadata.distributions", return_value=dists
+        ):
+            self.assertEqual(self.cache.discover_packages_fn(), ["a_plugin", "b_plugin"])
+
+    def test_write_cache_through_process_unique_temp_file(self):
+        with mock.patch(
+            "provisioner_shared.components.runtime.utils.plugin_discovery.os.replace", wraps=os.replace
+        ) as mock_replace:
+            self.cache.store_packages_fn(["provisioner_examples_plugin"])
+        mock_replace.assert_called_once_with(f"{self.cache_path}.{os.getpid()}.tmp", self.cache_path)
+        self.assertEqual(os.listdir(os.path.dirname(self.cache_path)), [os.path.basename(self.cache_path)])
+
+
+class PackageLoaderDiscoveryTestShould(unittest.TestCase):
+    def setUp(self):
+        self.mock_ctx = mock.Mock()
+        self.mock_ctx.get_package_manager.return_value = PackageManager.PIP
+        self.mock_cache = mock.Mock()
+        self.loader = PackageLoader(
+            ctx=self.mock_ctx,
+            io_utils=mock.Mock(),
+            process=mock.Mock(),
+            pypi=mock.Mock(),
+            discovery_cache=self.mock_cache,
+        )
+
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.subprocess.check_output")
+    def test_cache_hit_skips_discovery_and_package_manager(self, mock_check_output):
+        self.mock_cache.get_packages_fn.return_value = ["provisioner_examples_plugin", "provisioner-runtime"]
+        result = self.loader._get_pip_installed_packages(
+            filter_keyword="provisioner", exclusions=["provisioner-runtime"], enable_version_filtering=False
+        )
+        self.assertEqual(result, ["provisioner_examples_plugin"])
+        self.mock_cache.discover_packages_fn.assert_not_called()
+        mock_check_output.assert_not_called()
+
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.subprocess.check_output")
+    def test_stale_cache_discovers_in_process_and_stores(self, mock_check_output):
+        self.mock_cache.get_packages_fn.return_value = None
+        self.mock_cache.discover_packages_fn.return_value = ["provisioner_examples_plugin"]
+        result = self.loader._get_pip_installed_packages(filter_keyword="provisioner", enable_version_filtering=False)
+        self.assertEqual(result, ["provisioner_examples_plugin"])
+        self.mock_cache.store_packages_fn.assert_called_once_with(["provisioner_examples_plugin"])
+        mock_check_output.assert_not_called()
+
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.subprocess.check_output")
+    def test_fallback_to_package_manager_when_discovery_fails(self, mock_check_output):
+        self.mock_cache.get_packages_fn.return_value = None
+        self.mock_cache.discover_packages_fn.side_effect = Exception("metadata failure")
+        mock_check_output.return_value = b"Package    Version\n---------- -------\nprovisioner_examples_plugin 0.1.0\n"
+        result = self.loader._get_pip_installed_packages(filter_keyword="provisioner", enable_version_filtering=False)
+        self.assertEqual(result, ["provisioner_examples_plugin"])
+        self.mock_cache.store_packages_fn.assert_called_once_with(["provisioner_examples_plugin"])
+
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.subprocess.check_output")
+    def test_install_and_uninstall_invalidate_cache(self, mock_check_output):
+        self.loader._install_pip_package("provisioner-examples-plugin")
+        self.loader._uninstall_pip_package("provisioner-examples-plugin")
+        self.assertEqual(self.mock_cache.invalidate_fn.call_count, 2)
+
+    @mock.patch("provisioner_shared.components.runtime.utils.package_loader.importlib.import_module")
+    def test_deferred_modules_are_imported_only_by_loader(self, mock_import_module):
+        loaders = {}
+
+        def defer(package, loader):
+            loaders[package] = loader
+            return package == "provisioner_examples_plugin"
+
+        callback = mock.MagicMock()
+        self.loader._import_modules(
+            ["provisioner_examples_plugin", "provisioner_installers_plugin"], "main", callback, defer
+        )
+        mock_import_module.assert_called_once_with("provisioner_installers_plugin.main")
+
+        loaders["provisioner_examples_plugin"]()
+        mock_import_module.assert_called_with("provisioner_examples_plugin.main")
+        self.assertEqual(callback.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+import atexit
+import builtins
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Iterator, List, Optional
+
+ENV_PROFILE_STARTUP = "PROVISIONER_PROFILE_STARTUP"
+CLI_ARG_PROFILE_STARTUP = "--profile-startup"
+PROFILE_STARTUP_TRUTHY_VALUES = ("1", "true", "yes")
+PROFILE_STARTUP_FALSY_VALUES = ("", "0", "false", "no")
+
+
+class StartupPhase:
+    """
+    Timing of a single startup phase.
+      - wall_ms: wall-clock duration of the phase (includes nested phases)
+      - import_ms: time spent importing modules during the phase (outermost import statements only)
+      - modules: number of modules newly loaded into sys.modules during the phase
+    """
+
+    def __init__(self, name: str, wall_ms: float, import_ms: float, modules: int) -> None:
+        self.name = name
+        self.wall_ms = wall_ms
+        self.import_ms = import_ms
+        self.modules = modules
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "wall_ms": round(self.wall_ms, 3),
+            "import_ms": round(self.import_ms, 3),
+            "modules": self.modules,
+        }
+
+
+class StartupProfiler:
+    """
+    Opt-in profiler of the CLI bootstrap, enabled by either:
+      - PROVISIONER_PROFILE_STARTUP=1 (prints a table to stderr)
+      - PROVISIONER_PROFILE_STARTUP=/path/to/profile.json (writes a JSON report)
+      - --profile-startup CLI argument (prints a table to stderr)
+
+    The report is emitted on interpreter exit so lazily imported plugins are accounted for as well.
+    When disabled, every phase is a no-op context manager.
+    """
+
+    _instance: "StartupProfiler" = None
+
+    def __init__(self) -> None:
+        self._enabled: bool = False
+        self._output_path: Optional[str] = None
+        self._started_at: float = 0.0
+        self._phases: List[StartupPhase] = []
+        self._import_ms: float = 0.0
+        self._import_depth: int = 0
+        self._original_import = None
+
+    @staticmethod
+    def instance() -> "StartupProfiler":
+        if StartupProfiler._instance is None:
+            StartupProfiler._instance = StartupProfiler()
+        return StartupProfiler._instance
+
+    def _enable_if_requested(self) -> bool:
+        """
+        Enable profiling according to the environment variable or CLI argument.
+        The CLI argument is consumed from sys.argv since it is not a Click option.
+        """
+        requested_by_arg = CLI_ARG_PROFILE_STARTUP in sys.argv
+        if requested_by_arg:
+            sys.argv.remove(CLI_ARG_PROFILE_STARTUP)
+
+        env_value = os.environ.get(ENV_PROFILE_STARTUP, "").strip()
+        requested_by_env = env_value.lower() not in PROFILE_STARTUP_FALSY_VALUES
+        # Any value other than a boolean flag is treated as a JSON report output path
+        output_path = env_value if requested_by_env and env_value.lower() not in PROFILE_STARTUP_TRUTHY_VALUES else None
+
+        if requested_by_arg or requested_by_env:
+            self._enable(output_path)
+        return self._enabled
+
+    def _enable(self, output_path: Optional[str] = None) -> None:
+        if self._enabled:
+            return
+        self._enabled = True
+        self._output_path = output_path
+        self._started_at = time.perf_counter()
+        self._install_import_hook()
+        atexit.register(self._report)
+
+    def _is_enabled(self) -> bool:
+        return self._enabled
+
+    def _install_import_hook(self) -> None:
+        self._original_import = builtins.__import__
+        original_import = self._original_import
+
+        def timed_import(*args, **kwargs):
+            if self._import_depth > 0:
+                return original_import(*args, **kwargs)
+            self._import_depth += 1
+            start = time.perf_counter()
+            try:
+                return original_import(*args, **kwargs)
+            finally:
+                self._import_ms += (time.perf_counter() - start) * 1000
+                self._import_depth -= 1
+
+        builtins.__import__ = timed_import
+
+    def _uninstall_import_hook(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextlib.contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        if not self._enabled:
+            yield
+            return
+
+        wall_start = time.perf_counter()
+        import_start = self._import_ms
+        modules_start = len(sys.modules)
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            import_ms = self._import_ms - import_start
+            self._phases.append(StartupPhase(name, wall_ms, import_ms, len(sys.modules) - modules_start))
+
+    @contextlib.contextmanager
+    def _import_phase(self, name: str) -> Iterator[None]:
+        """
+        Phase wrapping an explicit module import i.e. importlib.import_module() which bypasses
+        the import hook, its whole duration is accounted as import time.
+        """
+        if not self._enabled:
+            yield
+            return
+
+        with self._phase(name):
+            depth = self._import_depth
+            start = time.perf_counter()
+            self._import_depth += 1
+            try:
+                yield
+            finally:
+                self._import_depth = depth
+                self._import_ms += (time.perf_counter() - start) * 1000
+
+    def _get_phases(self) -> List[StartupPhase]:
+        return list(self._phases)
+
+    def _total_ms(self) -> float:
+        return (time.perf_counter() - self._started_at) * 1000 if self._started_at else 0.0
+
+    def _format_table(self) -> str:
+        phases = sorted(self._phases, key=lambda phase: phase.wall_ms, reverse=True)
+        name_width = max([len("Phase")] + [len(phase.name) for phase in phases])
+        lines = [
+            "",
+            "=== Provisioner Startup Profile ===",
+            f"{'Phase'.ljust(name_width)}  {'Wall (ms)':>10}  {'Import (ms)':>11}  {'Modules':>7}",
+        ]
+        for phase in phases:
+            lines.append(
+                f"{phase.name.ljust(name_width)}  {phase.wall_ms:>10.1f}  {phase.import_ms:>11.1f}  {phase.modules:>7}"
+            )
+        lines.append(f"Total: {self._total_ms():.1f} ms, modules loaded: {len(sys.modules)}")
+        return "\n".join(lines) + "\n"
+
+    def _to_dict(self) -> dict:
+        return {
+            "total_ms": round(self._total_ms(), 3),
+            "modules": len(sys.modules),
+            "phases": [phase.to_dict() for phase in self._phases],
+        }
+
+    def _report(self) -> None:
+        if not self._enabled:
+            return
+        self._uninstall_import_hook()
+        self._enabled = False
+        try:
+            if self._output_path:
+                with open(self._output_path, "w") as f:
+                    json.dump(self._to_dict(), f, indent=2)
+                sys.stderr.write(f"Startup profile written to {self._output_path}\n")
+            else:
+                sys.stderr.write(self._format_table())
+        except Exception as ex:
+            sys.stderr.write(f"Failed to report startup profile. ex: {ex}\n")
+
+    enable_if_requested_fn = _enable_if_requested
+    enable_fn = _enable
+    is_enabled_fn = _is_enabled
+    phase_fn = _phase
+    import_phase_fn = _import_phase
+    get_phases_fn = _get_phases
+    report_fn = _report
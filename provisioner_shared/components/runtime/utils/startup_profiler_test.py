@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.utils.startup_profiler import (
+    CLI_ARG_PROFILE_STARTUP,
+    ENV_PROFILE_STARTUP,
+    StartupProfiler,
+)
+
+
+#
+# To run these directly from the terminal use:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/utils/startup_profiler_test.py
+#
+@mock.patch("provisioner_shared.components.runtime.utils.startup_profiler.atexit.register")
+class StartupProfilerTestShould(unittest.TestCase):
+    def setUp(self):
+        self.profiler = StartupProfiler()
+
+    def tearDown(self):
+        self.profiler._uninstall_import_hook()
+
+    def test_disabled_profiler_records_nothing(self, _):
+        with self.profiler.phase_fn("noop"):
+            pass
+        self.assertEqual(self.profiler.get_phases_fn(), [])
+
+    @mock.patch.dict(os.environ, {ENV_PROFILE_STARTUP: "0"})
+    @mock.patch("provisioner_shared.components.runtime.utils.startup_profiler.sys.argv", ["provisioner"])
+    def test_not_enabled_when_not_requested(self, mock_atexit_register):
+        self.assertFalse(self.profiler.enable_if_requested_fn())
+        mock_atexit_register.assert_not_called()
+
+    @mock.patch.dict(os.environ, {ENV_PROFILE_STARTUP: ""})
+    def test_cli_argument_enables_and_is_consumed(self, mock_atexit_register):
+        argv = ["provisioner", CLI_ARG_PROFILE_STARTUP, "version"]
+        with mock.patch("provisioner_shared.components.runtime.utils.startup_profiler.sys.argv", argv):
+            self.assertTrue(self.profiler.enable_if_requested_fn())
+        self.assertEqual(argv, ["provisioner", "version"])
+        mock_atexit_register.assert_called_once()
+
+    def test_record_phase_and_import_times(self, _):
+        self.profiler.enable_fn()
+        with self.profiler.phase_fn("plugins"):
+            with self.profiler.import_phase_fn("plugin dummy: import"):
+                time.sleep(0.01)
+        phases = {phase.name: phase for phase in self.profiler.get_phases_fn()}
+        self.assertGreaterEqual(phases["plugin dummy: import"].import_ms, 10)
+        self.assertGreaterEqual(phases["plugins"].wall_ms, phases["plugin dummy: import"].wall_ms)
+        self.assertGreaterEqual(phases["plugins"].import_ms, phases["plugin dummy: import"].import_ms)
+
+    def test_report_writes_json_to_output_path(self, _):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "profile.json")
+            with mock.patch.dict(os.environ, {ENV_PROFILE_STARTUP: output_path}):
+                self.profiler.enable_if_requested_fn()
+            with self.profiler.phase_fn("config manager load"):
+                pass
+            with mock.patch("provisioner_shared.components.runtime.utils.startup_profiler.sys.stderr"):
+                self.profiler.report_fn()
+
+            with open(output_path, "r") as f:
+                report = json.load(f)
+            self.assertEqual([phase["name"] for phase in report["phases"]], ["config manager load"])
+            self.assertIn("total_ms", report)
+            self.assertFalse(self.profiler.is_enabled_fn())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,33 @@
 #!/usr/bin/env python3
 
 import json
+import operator
+import os
 import re
 import subprocess
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from provisioner_shared.components.runtime.utils.plugin_discovery import (
+    PLUGIN_MANIFEST_RELATIVE_PATH,
+    get_plugin_package_path,
+)
+
+VERSION_PATTERN = re.compile(r"^(\d+)\.(\d+)\.(\d+)(?:[-+].*)?$")
+
+# A compiled version range is a list of (operator, version tuple) conditions that must all hold
+CompiledVersionRange = List[Tuple[str, Tuple[int, int, int]]]
+
+COMPILED_RANGE_OPERATORS: Dict[str, Callable[[Tuple[int, int, int], Tuple[int, int, int]], bool]] = {
+    "==": operator.eq,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
 
 class VersionCompatibility:
     """
@@ -33,7 +53,7 @@ class VersionCompatibility:
         clean_version = version.strip().lstrip("v")
 
         # Match semantic version pattern
-        match = re.match(r"^(\d+)\.(\d+)\.(\d+)(?:[-+].*)?$", clean_version)
+        match = VERSION_PATTERN.match(clean_version)
         if not match:
             raise ValueError(f"Invalid version format: {version}")
 
@@ -60,57 +80,92 @@ class VersionCompatibility:
         """
         try:
             version_tuple = VersionCompatibility.parse_version(version)
+        except ValueError as e:
+            logger.warning(f"Error parsing version compatibility: {e}")
+            return False
+
+        compiled_range = VersionCompatibility.compile_range(version_range)
+        if compiled_range is None:
+            return False
+
+        return VersionCompatibility.satisfies_compiled_range(version_tuple, compiled_range)
+
+    @staticmethod
+    def compile_range(version_range: str) -> Optional[CompiledVersionRange]:
+        """
+        Compile a version range specification into comparable (operator, version tuple) conditions,
+        so checking a version against it is a series of tuple comparisons.
+
+        Args:
+            version_range: Range specification, see version_satisfies_range for supported formats
 
+        Returns:
+            List of conditions that must all hold, None if the range is invalid
+        """
+        try:
             # Handle exact version
             if not any(op in version_range for op in [">=", "<=", ">", "<", "~", "^", ","]):
                 try:
-                    range_tuple = VersionCompatibility.parse_version(version_range)
-                    return version_tuple == range_tuple
+                    return [("==", VersionCompatibility.parse_version(version_range))]
                 except ValueError:
                     logger.warning(f"Invalid exact version range: {version_range}")
-                    return False
+                    return None
 
             # Handle caret range (^1.2.0 = >=1.2.0,<2.0.0)
             # Special case for 0.x versions: ^0.y.z = >=0.y.z,<0.(y+1).0
             if version_range.startswith("^"):
-                base_version = version_range[1:]
-                base_tuple = VersionCompatibility.parse_version(base_version)
+                base_tuple = VersionCompatibility.parse_version(version_range[1:])
                 major, minor, patch = base_tuple
 
                 if major == 0:
                     if minor == 0:
                         # For 0.0.x versions, only allow exact match
-                        return version_tuple == base_tuple
+                        return [("==", base_tuple)]
                     else:
                         # For 0.x versions (where x > 0), only allow patch updates within the same minor version
-                        return version_tuple >= base_tuple and version_tuple < (major, minor + 1, 0)
+                        return [(">=", base_tuple), ("<", (major, minor + 1, 0))]
                 else:
                     # For 1.x+ versions, allow minor and patch updates within the same major version
-                    return version_tuple >= base_tuple and version_tuple < (major + 1, 0, 0)
+                    return [(">=", base_tuple), ("<", (major + 1, 0, 0))]
 
             # Handle tilde range (~1.2.0 = >=1.2.0,<1.3.0)
             if version_range.startswith("~"):
-                base_version = version_range[1:]
-                base_tuple = VersionCompatibility.parse_version(base_version)
+                base_tuple = VersionCompatibility.parse_version(version_range[1:])
                 major, minor, patch = base_tuple
+                return [(">=", base_tuple), ("<", (major, minor + 1, 0))]
 
-                return version_tuple >= base_tuple and version_tuple < (major, minor + 1, 0)
-
-            # Handle compound ranges (>=1.0.0,<2.0.0)
-            if "," in version_range:
-                conditions = [cond.strip() for cond in version_range.split(",")]
-                return all(VersionCompatibility._check_single_condition(version_tuple, cond) for cond in conditions)
-
-            # Handle single condition
-            return VersionCompatibility._check_single_condition(version_tuple, version_range)
+            # Handle compound ranges (>=1.0.0,<2.0.0) and single conditions
+            compiled: CompiledVersionRange = []
+            for condition in version_range.split(","):
+                compiled_condition = VersionCompatibility._compile_single_condition(condition)
+                if compiled_condition is None:
+                    return None
+                compiled.append(compiled_condition)
+            return compiled
 
         except ValueError as e:
             logger.warning(f"Error parsing version compatibility: {e}")
-            return False
+            return None
+
+    @staticmethod
+    def satisfies_compiled_range(version_tuple: Tuple[int, int, int], compiled_range: CompiledVersionRange) -> bool:
+        """Check a parsed version against a range compiled by compile_range"""
+        for op, op_tuple in compiled_range:
+            if not COMPILED_RANGE_OPERATORS[op](version_tuple, tuple(op_tuple)):
+                return False
+        return True
 
     @staticmethod
     def _check_single_condition(version_tuple: Tuple[int, int, int], condition: str) -> bool:
         """Check a single version condition like '>=1.0.0' or '<2.0.0'"""
+        compiled_condition = VersionCompatibility._compile_single_condition(condition)
+        if compiled_condition is None:
+            return False
+        return VersionCompatibility.satisfies_compiled_range(version_tuple, [compiled_condition])
+
+    @staticmethod
+    def _compile_single_condition(condition: str) -> Optional[Tuple[str, Tuple[int, int, int]]]:
+        """Compile a single version condition like '>=1.0.0' or '<2.0.0'"""
         condition = condition.strip()
 
         # Extract operator and version
@@ -119,27 +174,13 @@ class VersionCompatibility:
                 op_version = condition[len(op) :].strip()
                 try:
                     op_tuple = VersionCompatibility.parse_version(op_version)
-
-                    if op == ">=":
-                        return version_tuple >= op_tuple
-                    elif op == "<=":
-                        return version_tuple <= op_tuple
-                    elif op == ">":
-                        return version_tuple > op_tuple
-                    elif op == "<":
-                        return version_tuple < op_tuple
-                    elif op == "=":
-                        return version_tuple == op_tuple
-
+                    return ("==" if op == "=" else op, op_tuple)
                 except ValueError:
                     logger.warning(f"Invalid version in condition: {op_version}")
-                    return False
-                break
-        else:
-            logger.warning(f"Unknown condition format: {condition}")
-            return False
+                    return None
 
-        return False
+        logger.warning(f"Unknown condition format: {condition}")
+        return None
 
     @staticmethod
     def read_plugin_compatibility(plugin_package_path: str) -> Optional[str]:
@@ -263,13 +304,92 @@ class VersionCompatibility:
             return True  # Assume compatible on error
 
     @staticmethod
-    def filter_compatible_plugins(plugin_packages: List[str], runtime_version: str) -> List[str]:
+    def build_compatibility_index(plugin_packages: List[str], existing_index: Optional[dict] = None) -> dict:
+        """
+        Build a compatibility index of plugin name -> manifest path, manifest mtime and compiled range.
+        Entries of an existing index are reused as long as their manifest file was not modified.
+
+        Args:
+            plugin_packages: List of plugin package names
+            existing_index: Previously built index (i.e. loaded from the plugin discovery cache)
+
+        Returns:
+            JSON serializable compatibility index
+        """
+        existing_index = existing_index if existing_index else {}
+        index = {}
+        for plugin_package in plugin_packages:
+            entry = existing_index.get(plugin_package)
+            if entry is not None and VersionCompatibility._is_index_entry_fresh(entry):
+                index[plugin_package] = entry
+                continue
+            index[plugin_package] = VersionCompatibility._create_index_entry(plugin_package)
+        return index
+
+    @staticmethod
+    def _is_index_entry_fresh(entry: dict) -> bool:
+        manifest_path = entry.get("manifest_path")
+        if manifest_path is None:
+            # Package or manifest were not found, re-checked only when site-packages change
+            return True
+        try:
+            return os.stat(manifest_path).st_mtime_ns == entry.get("manifest_mtime")
+        except OSError:
+            return False
+
+    @staticmethod
+    def _create_index_entry(plugin_package: str) -> dict:
+        entry = {"manifest_path": None, "manifest_mtime": None, "range": None, "compiled_range": None}
+        try:
+            plugin_path = get_plugin_package_path(plugin_package)
+            if plugin_path is None:
+                logger.debug(f"Could not find plugin package: {plugin_package}")
+                return entry
+
+            manifest_path = os.path.join(plugin_path, PLUGIN_MANIFEST_RELATIVE_PATH)
+            if not os.path.exists(manifest_path):
+                return entry
+
+            entry["manifest_path"] = manifest_path
+            entry["manifest_mtime"] = os.stat(manifest_path).st_mtime_ns
+            version_range = VersionCompatibility.read_plugin_compatibility(plugin_path)
+            if version_range is not None:
+                entry["range"] = version_range
+                compiled_range = VersionCompatibility.compile_range(version_range)
+                entry["compiled_range"] = (
+                    [[op, list(op_tuple)] for op, op_tuple in compiled_range] if compiled_range else None
+                )
+
+        except Exception as e:
+            logger.warning(f"Error indexing plugin compatibility for {plugin_package}: {e}")
+        return entry
+
+    @staticmethod
+    def is_index_entry_compatible(entry: Optional[dict], version_tuple: Optional[Tuple[int, int, int]]) -> bool:
+        """
+        Check a compatibility index entry, missing entries or ranges are assumed compatible
+        while an invalid range is incompatible.
+        An unparsable runtime version (None) satisfies no range, same as version_satisfies_range.
+        """
+        if entry is None or entry.get("range") is None:
+            return True
+        compiled_range = entry.get("compiled_range")
+        if compiled_range is None or version_tuple is None:
+            return False
+        return VersionCompatibility.satisfies_compiled_range(version_tuple, compiled_range)
+
+    @staticmethod
+    def filter_compatible_plugins(
+        plugin_packages: List[str], runtime_version: str, index: Optional[dict] = None
+    ) -> List[str]:
         """
         Filter a list of plugin packages to only include those compatible with the runtime version.
 
         Args:
             plugin_packages: List of plugin package names
             runtime_version: Current runtime version
+            index: Optional compatibility index (see build_compatibility_index), checks are
+                   done in a single pass of tuple comparisons without reading manifests
 
         Returns:
             Filtered list of compatible plugin packages
@@ -278,6 +398,20 @@ class VersionCompatibility:
             logger.warning("No runtime version provided, returning all plugins")
             return plugin_packages
 
+        if index is not None:
+            version_tuple = None
+            try:
+                version_tuple = VersionCompatibility.parse_version(runtime_version)
+            except ValueError as e:
+                logger.warning(f"Error parsing runtime version, skipping plugins declaring a version range: {e}")
+            compatible_plugins = [
+                plugin_package
+                for plugin_package in plugin_packages
+                if VersionCompatibility.is_index_entry_compatible(index.get(plugin_package), version_tuple)
+            ]
+            logger.debug(f"Skipping incompatible plugins: {sorted(set(plugin_packages) - set(compatible_plugins))}")
+            return compatible_plugins
+
         compatible_plugins = []
 
         for plugin_package in plugin_packages:
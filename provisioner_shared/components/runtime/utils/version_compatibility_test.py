@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
@@ -313,6 +314,103 @@ class VersionCompatibilityTest(unittest.TestCase):
             self.assertFalse(result)
             mock_logger.warning.assert_called()
 
+    def test_compile_range(self):
+        """Test compiling version ranges into comparable conditions"""
+        test_cases = [
+            ("1.2.3", [("==", (1, 2, 3))]),
+            ("^1.2.0", [(">=", (1, 2, 0)), ("<", (2, 0, 0))]),
+            ("^0.1.0", [(">=", (0, 1, 0)), ("<", (0, 2, 0))]),
+            ("^0.0.3", [("==", (0, 0, 3))]),
+            ("~1.2.0", [(">=", (1, 2, 0)), ("<", (1, 3, 0))]),
+            (">=0.1.0,<0.2.0", [(">=", (0, 1, 0)), ("<", (0, 2, 0))]),
+        ]
+        for version_range, expected in test_cases:
+            with self.subTest(version_range=version_range):
+                self.assertEqual(VersionCompatibility.compile_range(version_range), expected)
+
+    def test_compile_range_invalid(self):
+        """Test compiling invalid version ranges"""
+        with mock.patch("provisioner_shared.components.runtime.utils.version_compatibility.logger"):
+            self.assertIsNone(VersionCompatibility.compile_range("invalid_range"))
+            self.assertIsNone(VersionCompatibility.compile_range(">=1.0,<2.0.0"))
+
+    def _create_plugin_with_manifest(self, temp_dir: str, compatibility: dict) -> str:
+        plugin_path = Path(temp_dir) / "plugin"
+        (plugin_path / "resources").mkdir(parents=True)
+        with open(plugin_path / "resources" / "manifest.json", "w") as f:
+            json.dump(compatibility, f)
+        return str(plugin_path)
+
+    def test_build_compatibility_index_and_filter(self):
+        """Test filtering plugins through a compatibility index without reading manifests"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            plugin_path = self._create_plugin_with_manifest(
+                temp_dir, {"plugin_version": "0.1.0", "runtime_version_range": ">=0.2.0,<0.3.0"}
+            )
+            with mock.patch(
+                "provisioner_shared.components.runtime.utils.version_compatibility.get_plugin_package_path",
+                side_effect=lambda name: plugin_path if name == "plugin1" else None,
+            ):
+                index = VersionCompatibility.build_compatibility_index(["plugin1", "plugin2"])
+
+            self.assertEqual(index["plugin1"]["range"], ">=0.2.0,<0.3.0")
+            self.assertIsNone(index["plugin2"]["manifest_path"])
+            # Index must survive a JSON round trip as it is persisted on the discovery cache
+            index = json.loads(json.dumps(index))
+
+            with mock.patch.object(VersionCompatibility, "is_plugin_compatible") as mock_is_compatible:
+                self.assertEqual(
+                    VersionCompatibility.filter_compatible_plugins(["plugin1", "plugin2"], "0.1.15", index=index),
+                    ["plugin2"],
+                )
+                self.assertEqual(
+                    VersionCompatibility.filter_compatible_plugins(["plugin1", "plugin2"], "0.2.5", index=index),
+                    ["plugin1", "plugin2"],
+                )
+                mock_is_compatible.assert_not_called()
+
+    def test_filter_with_index_skips_ranged_plugins_on_invalid_runtime_version(self):
+        """Test that an unparsable runtime version excludes plugins declaring a range, same as without an index"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            plugin_path = self._create_plugin_with_manifest(temp_dir, {"runtime_version_range": ">=0.1.0"})
+            with mock.patch(
+                "provisioner_shared.components.runtime.utils.version_compatibility.get_plugin_package_path",
+                side_effect=lambda name: plugin_path if name == "plugin1" else None,
+            ):
+                index = VersionCompatibility.build_compatibility_index(["plugin1", "plugin2"])
+
+            plugin_spec = mock.MagicMock(origin=str(Path(plugin_path) / "__init__.py"))
+            with mock.patch(
+                "importlib.util.find_spec", side_effect=lambda name: plugin_spec if name == "plugin1" else None
+            ):
+                self.assertEqual(
+                    VersionCompatibility.filter_compatible_plugins(["plugin1", "plugin2"], "invalid"),
+                    ["plugin2"],
+                )
+            self.assertEqual(
+                VersionCompatibility.filter_compatible_plugins(["plugin1", "plugin2"], "invalid", index=index),
+                ["plugin2"],
+            )
+
+    def test_build_compatibility_index_reuses_fresh_entries(self):
+        """Test that only plugins with a modified manifest are re-indexed"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            plugin_path = self._create_plugin_with_manifest(temp_dir, {"runtime_version_range": "^0.1.0"})
+            get_path_patch = mock.patch(
+                "provisioner_shared.components.runtime.utils.version_compatibility.get_plugin_package_path",
+                return_value=plugin_path,
+            )
+            with get_path_patch as mock_get_path:
+                index = VersionCompatibility.build_compatibility_index(["plugin1"])
+                VersionCompatibility.build_compatibility_index(["plugin1"], existing_index=index)
+                self.assertEqual(mock_get_path.call_count, 1)
+
+                manifest_path = index["plugin1"]["manifest_path"]
+                stat = Path(manifest_path).stat()
+                os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                VersionCompatibility.build_compatibility_index(["plugin1"], existing_index=index)
+                self.assertEqual(mock_get_path.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
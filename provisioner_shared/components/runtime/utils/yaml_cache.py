@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import atexit
+import marshal
+import os
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from loguru import logger
+
+PARSED_YAML_CACHE_PATH = os.path.expanduser("~/.config/provisioner/cache/parsed_yaml.marshal")
+PARSED_YAML_CACHE_VERSION = 1
+
+# Files modified this close to the time they are cached might be modified again without a visible
+# mtime change on filesystems with a coarse timestamp granularity, those are not cached
+RACY_FILE_WINDOW_NS = 2_000_000_000
+
+
+class ParsedYamlCache:
+    """
+    Persistent cache of parsed YAML files, allows repeated CLI invocations to skip YAML parsing.
+
+    Entries are keyed on the file real path and validated against the file mtime and size.
+    The cached content is the raw parsed YAML, prior to environment variables expansion,
+    so expanded values always reflect the current environment.
+    The cache is serialized with marshal which is fast to load and cannot execute code,
+    files with values marshal cannot serialize (i.e. YAML timestamps) are never cached.
+    New entries are written once per process, on exit, entries of files that no longer exist are dropped.
+    """
+
+    _cache_path: str
+    _entries: Optional[dict]
+    _dirty: bool
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        self._cache_path = cache_path if cache_path else PARSED_YAML_CACHE_PATH
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create(cache_path: Optional[str] = None) -> "ParsedYamlCache":
+        logger.debug("Creating parsed YAML cache...")
+        cache = ParsedYamlCache(cache_path)
+        atexit.register(cache.flush_fn)
+        return cache
+
+    def _get_entries(self) -> dict:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(self._cache_path, "rb") as f:
+                content = marshal.load(f)
+            if (
+                isinstance(content, dict)
+                and content.get("version") == PARSED_YAML_CACHE_VERSION
+                and content.get("python") == list(sys.version_info[:2])
+            ):
+                entries = content.get("entries", {})
+                # Files deleted or moved since they were cached
+                self._entries = {path: entry for path, entry in entries.items() if os.path.exists(path)}
+                self._dirty = len(self._entries) != len(entries)
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            logger.debug(f"Failed to read parsed YAML cache, ignoring. path: {self._cache_path}, ex: {ex}")
+        return self._entries
+
+    def _write_entries(self, entries: dict) -> None:
+        content = {"version": PARSED_YAML_CACHE_VERSION, "python": list(sys.version_info[:2]), "entries": entries}
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(content, f)
+            # Atomic replace to prevent concurrent CLI invocations from reading a partial file
+            os.replace(tmp_path, self._cache_path)
+        except Exception as ex:
+            logger.debug(f"Failed to write parsed YAML cache. path: {self._cache_path}, ex: {ex}")
+
+    def _get(self, file_path: str) -> Optional[Any]:
+        """
+        Return the parsed content of a file, None if it is not cached or was modified since.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._get_entries().get(os.path.realpath(file_path))
+        if entry is None or entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+            return None
+        logger.debug(f"Parsed YAML cache hit. path: {file_path}")
+        return entry.get("data")
+
+    def _put(self, file_path: str, data: Any) -> None:
+        try:
+            stat = os.stat(file_path)
+            # Verify marshal can serialize the content before persisting it
+            marshal.dumps(data)
+        except (OSError, ValueError) as ex:
+            logger.debug(f"Skipping parsed YAML cache. path: {file_path}, ex: {ex}")
+            return
+        if time.time_ns() - stat.st_mtime_ns < RACY_FILE_WINDOW_NS:
+            logger.debug(f"Skipping parsed YAML cache of a recently modified file. path: {file_path}")
+            return
+        with self._lock:
+            entries = self._get_entries()
+            entries[os.path.realpath(file_path)] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "data": data}
+            self._dirty = True
+
+    def _flush(self) -> None:
+        """
+        Persist the entries added or dropped by this process, if any.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            self._write_entries(self._entries)
+            self._dirty = False
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._dirty = False
+            try:
+                os.remove(self._cache_path)
+            except FileNotFoundError:
+                pass
+            except Exception as ex:
+                logger.debug(f"Failed to invalidate parsed YAML cache. path: {self._cache_path}, ex: {ex}")
+
+    get_fn = _get
+    put_fn = _put
+    flush_fn = _flush
+    invalidate_fn = _invalidate
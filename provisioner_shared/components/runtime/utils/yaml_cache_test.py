@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from provisioner_shared.components.runtime.infra.context import Context
+from provisioner_shared.components.runtime.utils.io_utils import IOUtils
+from provisioner_shared.components.runtime.utils.yaml_cache import ParsedYamlCache
+from provisioner_shared.components.runtime.utils.yaml_util import YamlUtil
+
+YAML_UTIL_PKG_PATH = "provisioner_shared.components.runtime.utils.yaml_util"
+
+
+# To run as a single test target:
+#  poetry run coverage run -m pytest provisioner_shared/components/runtime/utils/yaml_cache_test.py
+#
+class ParsedYamlCacheTestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache", "parsed_yaml.marshal")
+        self.config_path = os.path.join(self.temp_dir.name, "config.yaml")
+        ctx = Context.create()
+        self.parsed_cache = ParsedYamlCache.create(self.cache_path)
+        self.yaml_util = YamlUtil.create(ctx, IOUtils.create(ctx), self.parsed_cache)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_config(self, content: str, seconds_ago: int = 60) -> None:
+        with open(self.config_path, "w") as f:
+            f.write(content)
+        mtime = time.time() - seconds_ago
+        os.utime(self.config_path, (mtime, mtime))
+
+    def _read_config(self) -> dict:
+        # Entries are persisted once the process exits
+        result = self.yaml_util.read_file_as_json_dict_fn(file_path=self.config_path)
+        self.parsed_cache.flush_fn()
+        return result
+
+    def _read_config_in_new_process(self) -> dict:
+        # A new cache instance simulates a subsequent CLI invocation
+        ctx = Context.create()
+        parsed_cache = ParsedYamlCache.create(self.cache_path)
+        yaml_util = YamlUtil.create(ctx, IOUtils.create(ctx), parsed_cache)
+        result = yaml_util.read_file_as_json_dict_fn(file_path=self.config_path)
+        parsed_cache.flush_fn()
+        return result
+
+    def test_cached_file_skips_yaml_parsing(self):
+        self._write_config("remote:\n  host: 192.168.1.100\n")
+        self.assertEqual(self._read_config()["remote"]["host"], "192.168.1.100")
+        with mock.patch(f"{YAML_UTIL_PKG_PATH}.yaml.load") as mock_yaml_load:
+            self.assertEqual(self._read_config_in_new_process(), {"remote": {"host": "192.168.1.100"}})
+            mock_yaml_load.assert_not_called()
+
+    def test_edited_file_is_parsed_again(self):
+        self._write_config("remote:\n  host: 192.168.1.100\n", seconds_ago=60)
+        self._read_config()
+        # Same size content, i.e. a single character edit via `provisioner config edit`
+        self._write_config("remote:\n  host: 192.168.1.200\n", seconds_ago=30)
+        self.assertEqual(self._read_config_in_new_process(), {"remote": {"host": "192.168.1.200"}})
+
+    def test_env_vars_are_expanded_after_cache_lookup(self):
+        self._write_config("remote:\n  host: $TEST_YAML_CACHE_HOST\n")
+        with mock.patch.dict(os.environ, {"TEST_YAML_CACHE_HOST": "first"}):
+            self.assertEqual(self._read_config_in_new_process(), {"remote": {"host": "first"}})
+        with mock.patch.dict(os.environ, {"TEST_YAML_CACHE_HOST": "second"}):
+            self.assertEqual(self._read_config_in_new_process(), {"remote": {"host": "second"}})
+
+    def test_recently_modified_file_is_not_cached(self):
+        self._write_config("remote:\n  host: 192.168.1.100\n", seconds_ago=0)
+        self._read_config()
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_non_marshallable_content_is_not_cached(self):
+        # YAML timestamps are parsed into datetime objects
+        self._write_config("created: 2024-01-01 10:00:00\n")
+        self._read_config()
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_corrupted_cache_is_ignored(self):
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, "wb") as f:
+            f.write(b"not-a-marshal-file")
+        self._write_config("remote:\n  host: 192.168.1.100\n")
+        self.assertEqual(self._read_config_in_new_process(), {"remote": {"host": "192.168.1.100"}})
+
+    def test_write_cache_once_per_process(self):
+        other_config_path = os.path.join(self.temp_dir.name, "other.yaml")
+        self._write_config("remote:\n  host: 192.168.1.100\n")
+        with open(other_config_path, "w") as f:
+            f.write("plugins: {}\n")
+        os.utime(other_config_path, (time.time() - 60, time.time() - 60))
+
+        with mock.patch.object(self.parsed_cache, "_write_entries") as mock_write_entries:
+            self.yaml_util.read_file_as_json_dict_fn(file_path=self.config_path)
+            self.yaml_util.read_file_as_json_dict_fn(file_path=other_config_path)
+            mock_write_entries.assert_not_called()
+            self.parsed_cache.flush_fn()
+            self.parsed_cache.flush_fn()
+            mock_write_entries.assert_called_once()
+
+    def test_drop_entries_of_deleted_files(self):
+        self._write_config("remote:\n  host: 192.168.1.100\n")
+        self._read_config()
+        os.remove(self.config_path)
+
+        parsed_cache = ParsedYamlCache.create(self.cache_path)
+        self.assertIsNone(parsed_cache.get_fn(self.config_path))
+        parsed_cache.flush_fn()
+        self.assertEqual(ParsedYamlCache.create(self.cache_path)._get_entries(), {})
+
+    def test_invalidate_drops_all_entries(self):
+        self._write_config("remote:\n  host: 192.168.1.100\n")
+        self._read_config()
+        self.yaml_util.invalidate_parsed_cache_fn()
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.assertIsNone(ParsedYamlCache.create(self.cache_path).get_fn(self.config_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
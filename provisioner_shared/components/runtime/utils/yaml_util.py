@@ -3,6 +3,7 @@
 import io
 import json
 from os.path import expandvars
+from typing import Any, Optional
 
 import yaml
 from loguru import logger
@@ -10,22 +11,33 @@ from loguru import logger
 from provisioner_shared.components.runtime.domain.serialize import SerializationBase
 from provisioner_shared.components.runtime.infra.context import Context
 from provisioner_shared.components.runtime.utils.io_utils import IOUtils
+from provisioner_shared.components.runtime.utils.yaml_cache import ParsedYamlCache
+
+# Prefer the libyaml C bindings when PyYAML was built with them, same semantics as the pure Python classes
+try:
+    from yaml import CDumper as YamlDumper
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import Dumper as YamlDumper
+    from yaml import SafeLoader as YamlSafeLoader
 
 
 class YamlUtil:
 
     _verbose: bool
     io_utils: IOUtils
+    _parsed_cache: ParsedYamlCache
 
-    def __init__(self, io_utils: IOUtils, verbose: bool) -> None:
+    def __init__(self, io_utils: IOUtils, verbose: bool, parsed_cache: Optional[ParsedYamlCache] = None) -> None:
         self.io_utils = io_utils
         self._verbose = verbose
+        self._parsed_cache = parsed_cache
 
     @staticmethod
-    def create(ctx: Context, io_utils: IOUtils) -> "YamlUtil":
+    def create(ctx: Context, io_utils: IOUtils, parsed_cache: Optional[ParsedYamlCache] = None) -> "YamlUtil":
         logger.debug("Creating YAML util...")
         verbose = ctx.is_verbose()
-        reader = YamlUtil(io_utils, verbose)
+        reader = YamlUtil(io_utils, verbose, parsed_cache)
         return reader
 
     def _validate_yaml_file_path(self, file_path: str):
@@ -46,7 +58,7 @@ class YamlUtil:
 
     def _read_string(self, yaml_str: str, cls: SerializationBase) -> SerializationBase:
         yaml_str_expanded = expandvars(yaml_str)
-        json_data_list_of_dicts = yaml.safe_load(yaml_str_expanded)
+        json_data_list_of_dicts = yaml.load(yaml_str_expanded, Loader=YamlSafeLoader)
         if self._verbose:
             json_data_str = json.dumps(json_data_list_of_dicts, indent=2)
             logger.debug(json_data_str)
@@ -54,14 +66,25 @@ class YamlUtil:
 
     def _read_file_as_json_dict(self, file_path: str) -> dict:
         self._validate_yaml_file_path(file_path)
-        with io.open(file_path, "r") as stream:
-            json_data = yaml.safe_load(stream)
-            json_data_str = json.dumps(json_data, indent=2)
-            if self._verbose:
-                logger.debug(json_data_str)
-            json_data_expanded = expandvars(json_data_str)
-            json_dict_expanded = json.loads(json_data_expanded)
-            return json_dict_expanded
+        json_data = self._parsed_cache.get_fn(file_path) if self._parsed_cache else None
+        if json_data is None:
+            with io.open(file_path, "r") as stream:
+                json_data = yaml.load(stream, Loader=YamlSafeLoader)
+            if self._parsed_cache:
+                self._parsed_cache.put_fn(file_path, json_data)
+        if self._verbose:
+            logger.debug(json.dumps(json_data, indent=2))
+        # Expand environment variables on the parsed values instead of a JSON text round trip
+        return self._expand_env_vars(json_data)
+
+    def _expand_env_vars(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return expandvars(value) if "$" in value else value
+        if isinstance(value, dict):
+            return {self._expand_env_vars(key): self._expand_env_vars(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._expand_env_vars(item) for item in value]
+        return value
 
     def _read_file(self, file_path: str, cls: SerializationBase) -> SerializationBase:
         json_data_str = self._read_file_as_json_dict(file_path=file_path)
@@ -74,13 +97,18 @@ class YamlUtil:
             logger.error(msg)
         return None
 
+    def _invalidate_parsed_cache(self) -> None:
+        if self._parsed_cache:
+            self._parsed_cache.invalidate_fn()
+
     def _json_to_yaml(self, json_str: str) -> str:
         # Convert JSON string to dictionary
         dict_obj = json.loads(json_str)
         # Convert dictionary to YAML string
-        return yaml.dump(dict_obj)
+        return yaml.dump(dict_obj, Dumper=YamlDumper)
 
     read_file_as_json_dict_fn = _read_file_as_json_dict
     read_file_fn = _read_file
     read_string_fn = _read_string
     json_to_yaml_fn = _json_to_yaml
+    invalidate_parsed_cache_fn = _invalidate_parsed_cache
@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 
+import os
+import tempfile
 import unittest
 from typing import List
+from unittest import mock
+
+import yaml
 
 from provisioner_shared.components.runtime.domain.serialize import SerializationBase
 from provisioner_shared.components.runtime.infra.context import Context
 from provisioner_shared.components.runtime.utils.io_utils import IOUtils
 from provisioner_shared.components.runtime.utils.yaml_util import YamlUtil
 
+YAML_UTIL_PKG_PATH = "provisioner_shared.components.runtime.utils.yaml_util"
+
 YAML_TEST_DATA_FILE_PATH = "provisioner_shared/test_data/internal_config.yaml"
 
 
@@ -51,6 +58,14 @@ class FakeDomainObj(SerializationBase):
             self.supported_os_arch = test_data["supported_os_arch"]
 
 
+class FakeRemoteObj(SerializationBase):
+    def __init__(self, dict_obj: dict) -> None:
+        super().__init__(dict_obj)
+
+    def _try_parse_config(self, dict_obj: dict):
+        pass
+
+
 class YamlUtilTestShould(unittest.TestCase):
     def test_read_yaml_file_successfully(self):
         ctx = Context.create()
@@ -70,3 +85,45 @@ class YamlUtilTestShould(unittest.TestCase):
         reader = YamlUtil.create(ctx=ctx, io_utils=IOUtils.create(ctx))
         with self.assertRaises(FileNotFoundError):
             reader.read_file_fn(file_path="/path/to/unknown", cls=FakeDomainObj)
+
+    @mock.patch.dict(os.environ, {"TEST_YAML_UTIL_HOST": "192.168.1.100", "TEST_YAML_UTIL_PORT": "2222"})
+    def test_read_yaml_file_expands_env_vars(self):
+        ctx = Context.create()
+        reader = YamlUtil.create(ctx=ctx, io_utils=IOUtils.create(ctx))
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as f:
+            f.write(
+                'remote:\n  host: $TEST_YAML_UTIL_HOST\n  address: "${TEST_YAML_UTIL_HOST}:${TEST_YAML_UTIL_PORT}"\n'
+            )
+            f.write("  port: 22\n  tags:\n    - $TEST_YAML_UTIL_PORT\n  quoted: 'say \"hi\"'\n")
+        try:
+            output = reader.read_file_as_json_dict_fn(file_path=f.name)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(
+            output,
+            {
+                "remote": {
+                    "host": "192.168.1.100",
+                    "address": "192.168.1.100:2222",
+                    "port": 22,
+                    "tags": ["2222"],
+                    "quoted": 'say "hi"',
+                }
+            },
+        )
+
+    @mock.patch.dict(os.environ, {"TEST_YAML_UTIL_HOST": "192.168.1.100"})
+    def test_pure_python_fallback_is_identical(self):
+        ctx = Context.create()
+        reader = YamlUtil.create(ctx=ctx, io_utils=IOUtils.create(ctx))
+        yaml_str = "remote:\n  hosts:\n    - name: node\n      address: $TEST_YAML_UTIL_HOST\n      port: 22\n"
+        native_dict = reader.read_file_as_json_dict_fn(file_path=YAML_TEST_DATA_FILE_PATH)
+        native_obj = reader.read_string_fn(yaml_str=yaml_str, cls=FakeRemoteObj)
+        native_yaml = reader.json_to_yaml_fn(json_str='{"b": [1, "two"], "a": {"c": null}}')
+        with mock.patch(f"{YAML_UTIL_PKG_PATH}.YamlSafeLoader", yaml.SafeLoader), mock.patch(
+            f"{YAML_UTIL_PKG_PATH}.YamlDumper", yaml.Dumper
+        ):
+            self.assertEqual(reader.read_file_as_json_dict_fn(file_path=YAML_TEST_DATA_FILE_PATH), native_dict)
+            self.assertEqual(reader.read_string_fn(yaml_str=yaml_str, cls=FakeRemoteObj).dict_obj, native_obj.dict_obj)
+            self.assertEqual(reader.json_to_yaml_fn(json_str='{"b": [1, "two"], "a": {"c": null}}'), native_yaml)
+        self.assertEqual(native_obj.dict_obj["remote"]["hosts"][0]["address"], "192.168.1.100")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from provisioner_shared.components.runtime.runner.ansible.ansible_output import AnsibleOutputParser
+
+# The regular expressions the line oriented parser replaced, kept for comparison
+LEGACY_MSG_PATTERN = (
+    r"(?:^|\n)\s*msg: (?:\|-|\|2-)?\s*\n(.*?)(?=\n\s*(?:TASK|PLAY|RUNNING|ok:|changed:|fatal:|skipped:|failed:)|\Z)"
+)
+LEGACY_STDERR_PATTERN = r"stderr: \|-\s+(.*?)\s+stderr_lines:"
+
+
+def generate_playbook_output(size_mb: int) -> str:
+    """Generate a verbose multi host playbook output of roughly the requested size"""
+    chunks = []
+    size = 0
+    index = 0
+    while size < size_mb * 1024 * 1024:
+        chunk = (
+            f"TASK [k3s : Install step {index}] " + "*" * 60 + "\n"
+            f"ok: [node-{index % 50}] =>\n"
+            "  msg: |-\n" + "".join(f"    output line {line} of step {index}\n" for line in range(20))
+        )
+        if index % 100 == 0:
+            chunk += (
+                f"fatal: [node-{index % 50}]: FAILED! =>\n  rc: 1\n  stderr: |-\n    step {index} failed\n"
+                "  stderr_lines: <omitted>\n"
+            )
+        chunks.append(chunk)
+        size += len(chunk)
+        index += 1
+    return "".join(chunks)
+
+
+def legacy_extract(output: str) -> int:
+    messages = [m.group(1) for m in re.finditer(LEGACY_MSG_PATTERN, output, re.DOTALL | re.MULTILINE)]
+    re.search(LEGACY_STDERR_PATTERN, output, re.DOTALL)
+    return len(messages)
+
+
+def parser_extract(output: str) -> int:
+    return len(AnsibleOutputParser.create().feed_fn(output).flush_fn().get_messages_fn())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Ansible output msg/stderr extraction")
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 5, 10], help="Synthetic output sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions, the best one is reported")
+    args = parser.parse_args()
+
+    print(f"{'Size (MB)':>9}  {'Regex (ms)':>10}  {'Parser (ms)':>11}  {'Parser ms/MB':>12}")
+    for size_mb in args.sizes_mb:
+        output = generate_playbook_output(size_mb)
+        # Both implementations must find the same msg blocks
+        assert legacy_extract(output) == parser_extract(output)
+        regex_secs = min(timeit.repeat(lambda: legacy_extract(output), number=1, repeat=args.repeat))
+        parser_secs = min(timeit.repeat(lambda: parser_extract(output), number=1, repeat=args.repeat))
+        print(
+            f"{size_mb:>9}  {regex_secs * 1000:>10.1f}  {parser_secs * 1000:>11.1f}  "
+            f"{parser_secs * 1000 / size_mb:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import sys
+import timeit
+from pathlib import Path
+
+import yaml
+
+# Add the project root to the path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from provisioner_shared.components.runtime.utils.yaml_util import YamlDumper, YamlSafeLoader
+
+
+def generate_user_config(hosts_count: int) -> str:
+    """Generate a user config YAML with many remote.hosts entries"""
+    lines = ["remote:", "  hosts:"]
+    for i in range(hosts_count):
+        lines.extend(
+            [
+                f"    - name: node-{i}",
+                f"      address: 10.0.{i // 250}.{i % 250 + 1}",
+                "      port: 22",
+                "      auth:",
+                "        username: $USER",
+                f"        ssh_private_key_file_path: /home/pi/.ssh/node_{i}_rsa",
+            ]
+        )
+    lines.extend(["  lan_scan:", "    ip_discovery_range: 10.0.0.1/16", "    dns_server: 10.0.0.1"])
+    return "\n".join(lines) + "\n"
+
+
+def benchmark(yaml_text: str, loader: type, dumper: type, repeat: int) -> tuple[float, float]:
+    data = yaml.load(io.StringIO(yaml_text), Loader=loader)
+    load_secs = min(timeit.repeat(lambda: yaml.load(io.StringIO(yaml_text), Loader=loader), number=1, repeat=repeat))
+    dump_secs = min(timeit.repeat(lambda: yaml.dump(data, Dumper=dumper), number=1, repeat=repeat))
+    return load_secs, dump_secs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the YAML loader/dumper used by YamlUtil")
+    parser.add_argument("--hosts", type=int, nargs="+", default=[10, 500, 5000], help="remote.hosts entries count")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions, the best one is reported")
+    args = parser.parse_args()
+
+    if YamlSafeLoader is yaml.SafeLoader:
+        print("PyYAML was built without libyaml, YamlUtil is using the pure Python loader")
+        return
+
+    print(f"{'Hosts':>6}  {'Pure load (ms)':>14}  {'C load (ms)':>11}  {'Pure dump (ms)':>14}  {'C dump (ms)':>11}")
+    for hosts_count in args.hosts:
+        yaml_text = generate_user_config(hosts_count)
+        # Both implementations must produce the same content
+        pure_data = yaml.load(io.StringIO(yaml_text), Loader=yaml.SafeLoader)
+        assert pure_data == yaml.load(io.StringIO(yaml_text), Loader=YamlSafeLoader)
+        assert yaml.dump(pure_data, Dumper=yaml.Dumper) == yaml.dump(pure_data, Dumper=YamlDumper)
+
+        pure_load, pure_dump = benchmark(yaml_text, yaml.SafeLoader, yaml.Dumper, args.repeat)
+        c_load, c_dump = benchmark(yaml_text, YamlSafeLoader, YamlDumper, args.repeat)
+        print(
+            f"{hosts_count:>6}  {pure_load * 1000:>14.1f}  {c_load * 1000:>11.1f}  "
+            f"{pure_dump * 1000:>14.1f}  {c_dump * 1000:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()